@@ -0,0 +1,284 @@
+import os
+import json
+import threading
+import pandas as pd
+import numpy as np
+from datetime import datetime
+from typing import Dict, List, Optional
+import streamlit as st
+
+from market_store import MarketDataStore, get_market_store
+from screener import IndicatorSnapshot, get_indicator_snapshot
+from utils import format_currency, format_number, format_percentage
+
+# Kural tipi -> (açıklama, uyarı seviyesi); seviyeler create_alert_system ile aynıdır
+ALERT_TYPES = {
+    'price_above': ("Fiyat seviyenin üstüne çıktı", "warning"),
+    'price_below': ("Fiyat seviyenin altına indi", "danger"),
+    'volume_multiple': ("Hacim ortalamanın katını aştı", "info"),
+    'volatility_above': ("Günlük volatilite eşiği aştı", "warning"),
+    'cross_above': ("İndikatör yukarı kesti", "info"),
+    'cross_below': ("İndikatör aşağı kesti", "info"),
+}
+
+RULE_COLUMNS = ['Symbol', 'Type', 'Field', 'Other', 'Value', 'Active', 'Last_State', 'Last_Fired', 'Created']
+
+
+class AlertOutbox:
+    """Tetiklenen uyarıların yazıldığı yerel kutu (satır başına bir JSON kaydı)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def append(self, alerts: List[Dict]):
+        if not alerts:
+            return
+        with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+            for alert in alerts:
+                f.write(json.dumps(alert, ensure_ascii=False, default=str) + "\n")
+
+    def read(self, limit: int = 100) -> pd.DataFrame:
+        """Son 'limit' uyarıyı en yeniden eskiye döndürür"""
+        if not os.path.exists(self.path):
+            return pd.DataFrame()
+        with self._lock, open(self.path, encoding='utf-8') as f:
+            lines = f.readlines()[-limit:]
+        return pd.DataFrame([json.loads(line) for line in reversed(lines)])
+
+
+class AlertEngine:
+    """Kalıcı uyarı kurallarını snapshot tablosuna karşı toplu değerlendiren sınıf
+
+    Kurallar diskte tek tabloda tutulur ve tipe göre gruplanmış konum
+    indeksleriyle değerlendirilir; her tip için sembol ve alan değerleri
+    snapshot matrisinden tek seferde çekilir. Uyarılar kenar tetiklemelidir:
+    koşul yalnızca yanlıştan doğruya geçtiğinde uyarı üretir.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.path = os.path.join(cache_dir, "alert_rules.pkl")
+        self.outbox = AlertOutbox(os.path.join(cache_dir, "alerts_outbox.jsonl"))
+        self.rules = pd.read_pickle(self.path) if os.path.exists(self.path) else \
+            pd.DataFrame(columns=RULE_COLUMNS).rename_axis('Rule_ID')
+        self._lock = threading.RLock()
+        self._type_index = None
+
+    # --- Kural yönetimi ---
+
+    def _save(self):
+        temp_path = self.path + ".tmp"
+        self.rules.to_pickle(temp_path)
+        os.replace(temp_path, self.path)
+        self._type_index = None
+
+    def add_rule(self, symbol: str, rule_type: str, value: Optional[float] = None,
+                 field: str = 'Close', other: Optional[str] = None) -> int:
+        """Yeni kural ekler ve kural numarasını döndürür
+
+        price_above/price_below: value fiyat seviyesi; volume_multiple: value
+        hacim ortalaması katı; volatility_above: value yüzde günlük volatilite;
+        cross_above/cross_below: field, other sütununu ya da value seviyesini keser.
+        """
+        if rule_type not in ALERT_TYPES:
+            raise ValueError(f"Bilinmeyen uyarı tipi: {rule_type}")
+
+        with self._lock:
+            rule_id = int(self.rules.index.max()) + 1 if not self.rules.empty else 1
+            self.rules.loc[rule_id] = {
+                'Symbol': symbol, 'Type': rule_type, 'Field': field, 'Other': other,
+                'Value': np.nan if value is None else float(value), 'Active': True,
+                'Last_State': np.nan, 'Last_Fired': pd.NaT, 'Created': pd.Timestamp.now(),
+            }
+            self._save()
+        return rule_id
+
+    def remove_rule(self, rule_id: int):
+        with self._lock:
+            self.rules = self.rules.drop(index=rule_id, errors='ignore')
+            self._save()
+
+    def rules_for(self, symbol: str) -> pd.DataFrame:
+        return self.rules[self.rules['Symbol'] == symbol]
+
+    def _positions_by_type(self) -> Dict[str, np.ndarray]:
+        """Aktif kuralların tip bazında konum indeksleri (kural tablosu değişince yenilenir)"""
+        if self._type_index is None:
+            active = self.rules['Active'].to_numpy(dtype=bool)
+            types = self.rules['Type'].to_numpy()
+            self._type_index = {t: np.flatnonzero(active & (types == t)) for t in ALERT_TYPES}
+        return self._type_index
+
+    # --- Değerlendirme ---
+
+    @staticmethod
+    def _lookup(matrix: np.ndarray, row_positions: np.ndarray, columns: pd.Index,
+                fields: np.ndarray) -> np.ndarray:
+        """(sembol, alan) çiftleri için snapshot değerlerini vektörel okur"""
+        col_positions = columns.get_indexer(fields)
+        found = (row_positions >= 0) & (col_positions >= 0)
+        values = np.full(len(fields), np.nan)
+        values[found] = matrix[row_positions[found], col_positions[found]]
+        return values
+
+    def _conditions(self, snapshot: pd.DataFrame) -> np.ndarray:
+        """Her kural için güncel koşul durumunu (1, 0 ya da veri yoksa NaN) hesaplar"""
+        numeric = snapshot.select_dtypes(include=[np.number])
+        matrix = numeric.to_numpy(dtype=np.float64)
+        columns = numeric.columns
+        rows = snapshot.index.get_indexer(self.rules['Symbol'])
+
+        def lookup(positions: np.ndarray, fields) -> np.ndarray:
+            fields = np.broadcast_to(np.asarray(fields, dtype=object), positions.shape)
+            return self._lookup(matrix, rows[positions], columns, fields)
+
+        state = np.full(len(self.rules), np.nan)
+        value = self.rules['Value'].to_numpy(dtype=np.float64)
+        field = self.rules['Field'].to_numpy(dtype=object)
+        other = self.rules['Other'].to_numpy(dtype=object)
+
+        for rule_type, positions in self._positions_by_type().items():
+            if len(positions) == 0:
+                continue
+
+            if rule_type in ('price_above', 'price_below'):
+                left, right = lookup(positions, 'Close'), value[positions]
+            elif rule_type == 'volume_multiple':
+                left = lookup(positions, 'Volume')
+                right = lookup(positions, 'Volume_MA') * value[positions]
+            elif rule_type == 'volatility_above':
+                left, right = lookup(positions, 'Volatility'), value[positions]
+            else:
+                left = lookup(positions, field[positions])
+                has_other = pd.notna(other[positions])
+                right = np.where(has_other, lookup(positions, np.where(has_other, other[positions], '')),
+                                 value[positions])
+
+            known = ~np.isnan(left) & ~np.isnan(right)
+            met = left < right if rule_type in ('price_below', 'cross_below') else left > right
+            state[positions] = np.where(known, met, np.nan)
+
+        return state
+
+    def evaluate(self, snapshot: pd.DataFrame, raise_errors: bool = False) -> List[Dict]:
+        """Tüm aktif kuralları değerlendirir, tetiklenenleri kutuya yazar ve döndürür
+
+        raise_errors=True iken hata st.error yerine çağırana iletilir (arka plan iş parçacıkları için).
+        """
+        try:
+            with self._lock:
+                if self.rules.empty or snapshot.empty:
+                    return []
+
+                state = self._conditions(snapshot)
+                previous = self.rules['Last_State'].to_numpy(dtype=np.float64)
+                is_cross = self.rules['Type'].isin(['cross_above', 'cross_below']).to_numpy()
+
+                # Kesişimler bilinen bir önceki durum ister; seviye kuralları ilk değerlendirmede de tetiklenir
+                fired = (state == 1) & np.where(is_cross, previous == 0, previous != 1)
+                self.rules['Last_State'] = np.where(np.isnan(state), previous, state)
+
+                alerts = [self._format(rule_id, snapshot) for rule_id in self.rules.index[fired]]
+                if alerts:
+                    self.rules.loc[self.rules.index[fired], 'Last_Fired'] = pd.Timestamp.now()
+                self._save()
+
+            self.outbox.append(alerts)
+            return alerts
+
+        except Exception as e:
+            if raise_errors:
+                raise
+            st.error(f"Uyarı değerlendirme hatası: {str(e)}")
+            return []
+
+    def _format(self, rule_id: int, snapshot: pd.DataFrame) -> Dict:
+        """Tetiklenen kural için create_alert_system biçiminde uyarı kaydı üretir"""
+        rule = self.rules.loc[rule_id]
+        row = snapshot.loc[rule['Symbol']]
+        description, level = ALERT_TYPES[rule['Type']]
+
+        if rule['Type'] in ('price_above', 'price_below'):
+            detail = f"{format_currency(row['Close'])} (seviye {format_currency(rule['Value'])})"
+        elif rule['Type'] == 'volume_multiple':
+            detail = f"{format_number(row['Volume'])} (ortalamanın {rule['Value']:g} katı)"
+        elif rule['Type'] == 'volatility_above':
+            detail = f"{format_percentage(row['Volatility'])} (eşik {format_percentage(rule['Value'])})"
+        else:
+            target = rule['Other'] if pd.notna(rule['Other']) else f"{rule['Value']:g}"
+            detail = f"{rule['Field']} / {target}"
+
+        return {
+            "rule_id": int(rule_id),
+            "symbol": rule['Symbol'],
+            "date": str(row.get('Date', '')),
+            "type": level,
+            "message": f"{rule['Symbol']}: {description}: {detail}",
+            "created": datetime.now().isoformat(timespec='seconds'),
+        }
+
+
+class AlertScheduler:
+    """Veri yenilemesinden sonra kuralları arka planda değerlendiren zamanlayıcı
+
+    Streamlit betiği dışında çalıştığından hataları st.error ile göstermez;
+    son hata last_error içinde tutulur ve sayfa tarafından okunur.
+    """
+
+    def __init__(self, store: MarketDataStore, engine: AlertEngine, interval: int = 900,
+                 refresh_data: bool = True, snapshot: Optional[IndicatorSnapshot] = None):
+        self.store = store
+        self.snapshot = snapshot or IndicatorSnapshot(store)
+        self.engine = engine
+        self.interval = interval
+        self.refresh_data = refresh_data
+        self.last_run = None
+        self.last_error = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def run_once(self) -> List[Dict]:
+        """Veriyi ve snapshot'ı yeniler; değişen sembol varsa kuralları değerlendirir"""
+        if self.refresh_data:
+            self.store.refresh(raise_errors=True)
+        updated = self.snapshot.refresh(raise_errors=True)
+        first_run = self.last_run is None
+        self.last_run = datetime.now()
+        return self.engine.evaluate(self.snapshot.table, raise_errors=True) if updated or first_run else []
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+            self._stop.wait(self.interval)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="alert-scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+
+@st.cache_resource
+def get_alert_engine() -> AlertEngine:
+    """Oturumlar arasında paylaşılan uyarı motoru"""
+    return AlertEngine(get_market_store().cache_dir)
+
+
+@st.cache_resource
+def get_alert_scheduler(interval: int = 900) -> AlertScheduler:
+    """Sunucu başına tek arka plan zamanlayıcısı başlatır"""
+    scheduler = AlertScheduler(get_market_store(), get_alert_engine(), interval=interval,
+                               snapshot=get_indicator_snapshot())
+    scheduler.start()
+    return scheduler
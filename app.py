@@ -8,8 +8,10 @@ from data_fetcher import DataFetcher
 from technical_analysis import TechnicalAnalysis
 from fundamental_analysis import FundamentalAnalysis
 from chart_generator import ChartGenerator
+from fundamentals_table import get_fundamentals_table, get_peer_matrix
 from utils import format_currency, format_percentage, get_turkish_date
 from technical_analysis_page import show_technical_analysis_page
+from screener_page import show_screener_page
 
 # Sayfa yapılandırması
 st.set_page_config(
@@ -25,7 +27,7 @@ st.title("📈 BIST 100 Hisse Senedi Analizi")
 # Navigasyon menüsü
 page = st.selectbox(
     "Sayfa Seçin:",
-    ["Ana Sayfa", "Detaylı Teknik Analiz", "Temel Analiz", "Piyasa Özeti"],
+    ["Ana Sayfa", "Detaylı Teknik Analiz", "Hisse Tarayıcı", "Temel Analiz", "Piyasa Özeti"],
     index=0
 )
 
@@ -33,6 +35,10 @@ if page == "Detaylı Teknik Analiz":
     show_technical_analysis_page()
     st.stop()
 
+if page == "Hisse Tarayıcı":
+    show_screener_page()
+    st.stop()
+
 st.markdown("---")
 
 # Veri çekici sınıfını başlat
@@ -145,7 +151,8 @@ with col1:
 
         # Teknik analiz hesapla
         tech_analysis = TechnicalAnalysis(stock_data)
-        tech_indicators = tech_analysis.calculate_all_indicators()
+        tech_indicators = tech_analysis.calculate_all_indicators(as_frame=True)
+        latest_indicators = tech_analysis.get_latest_values()
         
         # Grafik oluştur
         chart_gen = ChartGenerator(stock_data, tech_indicators)
@@ -198,7 +205,7 @@ with col1:
             
             # RSI detayları
             if 'RSI' in tech_indicators:
-                current_rsi = tech_indicators['RSI'].iloc[-1]
+                current_rsi = latest_indicators['RSI']
                 st.write(f"**RSI (14 dönem):** {current_rsi:.2f}")
                 if current_rsi < 30:
                     st.success("🟢 RSI aşırı satım bölgesinde - Al sinyali")
@@ -209,8 +216,8 @@ with col1:
             
             # MACD detayları
             if 'MACD' in tech_indicators and 'Signal' in tech_indicators:
-                current_macd = tech_indicators['MACD'].iloc[-1]
-                current_signal = tech_indicators['Signal'].iloc[-1]
+                current_macd = latest_indicators['MACD']
+                current_signal = latest_indicators['Signal']
                 st.write(f"**MACD:** {current_macd:.4f}")
                 st.write(f"**MACD Signal:** {current_signal:.4f}")
                 if current_macd > current_signal:
@@ -221,9 +228,9 @@ with col1:
             # Bollinger Bands
             if 'BB_Upper' in tech_indicators and 'BB_Lower' in tech_indicators:
                 current_price = stock_data['Close'].iloc[-1]
-                bb_upper = tech_indicators['BB_Upper'].iloc[-1]
-                bb_lower = tech_indicators['BB_Lower'].iloc[-1]
-                bb_middle = tech_indicators['BB_Middle'].iloc[-1]
+                bb_upper = latest_indicators['BB_Upper']
+                bb_lower = latest_indicators['BB_Lower']
+                bb_middle = latest_indicators['BB_Middle']
                 
                 st.write(f"**Bollinger Bantları:**")
                 st.write(f"- Üst Band: {bb_upper:.2f} ₺")
@@ -239,7 +246,7 @@ with col1:
             
             # Williams %R
             if 'Williams_R' in tech_indicators:
-                williams_r = tech_indicators['Williams_R'].iloc[-1]
+                williams_r = latest_indicators['Williams_R']
                 st.write(f"**Williams %R:** {williams_r:.2f}")
                 if williams_r < -80:
                     st.success("🟢 Aşırı satım bölgesi")
@@ -258,18 +265,18 @@ with col2:
     # Kompakt teknik indikatörler özeti
     st.subheader("🔧 Teknik İndikatörler")
     
-    if tech_indicators:
-        if 'RSI' in tech_indicators and not tech_indicators['RSI'].empty:
-            rsi_value = tech_indicators['RSI'].iloc[-1]
+    if latest_indicators:
+        if 'RSI' in latest_indicators:
+            rsi_value = latest_indicators['RSI']
             color = "🟢" if 30 <= rsi_value <= 70 else "🔴"
             st.metric(f"{color} RSI", f"{rsi_value:.1f}")
         
-        if 'MACD' in tech_indicators and not tech_indicators['MACD'].empty:
-            macd_value = tech_indicators['MACD'].iloc[-1]
+        if 'MACD' in latest_indicators:
+            macd_value = latest_indicators['MACD']
             st.metric("📈 MACD", f"{macd_value:.4f}")
             
-        if 'MA20' in tech_indicators and not tech_indicators['MA20'].empty:
-            ma20_value = tech_indicators['MA20'].iloc[-1]
+        if 'MA20' in latest_indicators:
+            ma20_value = latest_indicators['MA20']
             st.metric("📊 MA20", format_currency(float(ma20_value)))
     else:
         st.info("Hesaplanıyor...")
@@ -351,13 +358,42 @@ if stock_data is not None and not stock_data.empty:
         
         with val_col2:
             intrinsic_value = valuation_summary.get("İçsel Değer Tahmini")
-            if intrinsic_value:
+            if intrinsic_value is not None:
                 st.metric("İçsel Değer", f"{intrinsic_value:.2f} ₺")
+            else:
+                st.metric("İçsel Değer", "—")
+                st.caption("Serbest nakit akışı negatif ya da eksik; DCF uygulanamaz.")
         
         with val_col3:
             valuation_status = valuation_summary.get("Değerleme", "Bilinmiyor")
             color = "🟢" if valuation_status == "Düşük Değerli" else "🔴" if valuation_status == "Yüksek Değerli" else "🟡"
             st.metric(f"{color} Değerleme", valuation_status)
+    
+    # Sektör karşılaştırması (diskteki temel veri tablosundan, ağ çağrısız)
+    company_sector = selected_company.get('sector')
+    if company_sector:
+        st.subheader(f"🏭 Sektör Karşılaştırması - {company_sector}")
+        fundamentals_table = get_fundamentals_table()
+        
+        info_col, button_col = st.columns([3, 1])
+        with button_col:
+            if st.button("🔄 Temel Verileri Güncelle"):
+                with st.spinner("Temel veriler güncelleniyor..."):
+                    updated = fundamentals_table.refresh()
+                st.success(f"{len(updated)} hisse güncellendi")
+        with info_col:
+            st.caption(f"Son güncelleme: {fundamentals_table.last_updated or 'Hiç'}")
+        
+        peer_matrix = get_peer_matrix(fundamentals_table.last_updated)
+        sector_peers = peer_matrix[peer_matrix['Sektör'] == company_sector]
+        if len(sector_peers) > 1:
+            fig = chart_gen.create_sector_analysis_chart(sector_peers)
+            st.plotly_chart(fig, use_container_width=True)
+            st.dataframe(sector_peers.round(2), use_container_width=True)
+        elif peer_matrix.empty:
+            st.info("Temel veri tablosu henüz oluşturulmadı. Güncellemek için butonu kullanın.")
+        else:
+            st.info("Bu sektör için karşılaştırılacak yeterli şirket bulunamadı")
 
 # Alt kısım - BIST 100 özeti
 st.markdown("---")
@@ -0,0 +1,229 @@
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional, Union
+import streamlit as st
+
+from indicator_sweep import IndicatorSweep
+from signal_events import panel_macd
+
+RULES = ['RSI', 'MACD', 'MA']
+TRADING_DAYS = 252
+
+
+def forward_fill(values: np.ndarray, fill_value: float = 0.0) -> np.ndarray:
+    """NaN değerleri sütun bazında son geçerli değerle doldurur (tarih × sembol)"""
+    valid = ~np.isnan(values)
+    last_index = np.where(valid, np.arange(len(values))[:, None], 0)
+    np.maximum.accumulate(last_index, axis=0, out=last_index)
+    filled = np.take_along_axis(values, last_index, axis=0)
+    # İlk geçerli değerden önceki satırlar
+    seen = np.maximum.accumulate(valid, axis=0)
+    return np.where(seen, filled, fill_value)
+
+
+class SignalBacktester:
+    """get_trading_signals kurallarını tüm geçmiş ve evren üzerinde vektörel test eden sınıf
+
+    Kurallar: RSI (eşik altı Al / üstü Sat), MACD (sinyal üstü Al / altı Sat),
+    MA (MA20 > MA50 Al / değilse Sat) ve bunların çoğunluk oyu (Overall).
+    Sinyal bar kapanışında oluşur, pozisyon bir sonraki bardan itibaren taşınır.
+    """
+
+    def __init__(self, close: Union[pd.Series, pd.DataFrame], commission: float = 0.001,
+                 slippage: float = 0.0005, long_only: bool = True):
+        if isinstance(close, pd.Series):
+            close = close.to_frame(name=close.name or "Close")
+
+        self.close = close
+        self.commission = commission
+        self.slippage = slippage
+        self.long_only = long_only
+
+        self._close_values = close.to_numpy(dtype=np.float64)
+        self._sweep = IndicatorSweep(close)
+        self._cache = {}
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = np.empty_like(self._close_values)
+            returns[0] = np.nan
+            returns[1:] = self._close_values[1:] / self._close_values[:-1] - 1
+        self._returns = returns
+
+    # --- İndikatör ara sonuçları (parametre kombinasyonları arasında paylaşılır) ---
+
+    def _indicator(self, name: str, *params) -> Union[np.ndarray, Dict[str, np.ndarray]]:
+        key = (name,) + params
+        if key not in self._cache:
+            if name == 'RSI':
+                self._cache[key] = self._sweep.rsi(params).values[:, 0, :]
+            elif name == 'MA':
+                self._cache[key] = self._sweep.moving_averages(params).values[:, 0, :]
+            elif name == 'MACD':
+                self._cache[key] = panel_macd(self.close, *params)
+            else:
+                raise KeyError(name)
+
+        return self._cache[key]
+
+    def rule_states(self, rsi_period: int = 14, rsi_levels: tuple = (30, 70),
+                    ma_pair: tuple = (20, 50), macd: tuple = (12, 26, 9)) -> Dict[str, np.ndarray]:
+        """Her kural için bar bazında +1 (Al), -1 (Sat), 0 (Nötr) dizileri üretir"""
+        oversold, overbought = rsi_levels
+        rsi = self._indicator('RSI', rsi_period)
+        rsi_state = np.select([rsi < oversold, rsi > overbought], [1.0, -1.0], 0.0)
+
+        macd_values = self._indicator('MACD', *macd)
+        macd_valid = ~np.isnan(macd_values['MACD']) & ~np.isnan(macd_values['Signal'])
+        macd_state = np.where(macd_valid, np.where(macd_values['MACD'] > macd_values['Signal'], 1.0, -1.0), 0.0)
+
+        short_ma = self._indicator('MA', ma_pair[0])
+        long_ma = self._indicator('MA', ma_pair[1])
+        ma_valid = ~np.isnan(short_ma) & ~np.isnan(long_ma)
+        ma_state = np.where(ma_valid, np.where(short_ma > long_ma, 1.0, -1.0), 0.0)
+
+        return {'RSI': rsi_state, 'MACD': macd_state, 'MA': ma_state}
+
+    @staticmethod
+    def combine(states: Dict[str, np.ndarray], rules: Optional[List[str]] = None) -> np.ndarray:
+        """Kural durumlarını çoğunluk oyu ile birleştirir (Overall_Signal)"""
+        rules = rules or RULES
+        buy_votes = sum((states[rule] > 0).astype(np.int8) for rule in rules)
+        sell_votes = sum((states[rule] < 0).astype(np.int8) for rule in rules)
+        return np.sign(buy_votes - sell_votes).astype(np.float64)
+
+    # --- Pozisyon ve getiri ---
+
+    def positions(self, signal: np.ndarray) -> np.ndarray:
+        """Sinyali taşınan pozisyona çevirir (Nötr önceki pozisyonu korur, bir bar gecikmeli)"""
+        if self.long_only:
+            target = np.where(signal > 0, 1.0, np.where(signal < 0, 0.0, np.nan))
+        else:
+            target = np.where(signal != 0, signal, np.nan)
+
+        target = forward_fill(target, fill_value=0.0)
+
+        held = np.zeros_like(target)
+        held[1:] = target[:-1]
+        # İşlem görmeyen barlarda pozisyon tutulmaz
+        held[np.isnan(self._close_values)] = 0.0
+        return held
+
+    def strategy_returns(self, held: np.ndarray) -> np.ndarray:
+        """Pozisyon dizisinden maliyet sonrası günlük strateji getirilerini hesaplar"""
+        turnover = np.abs(np.diff(held, axis=0, prepend=0.0))
+        gross = held * np.nan_to_num(self._returns, nan=0.0)
+        return gross - turnover * (self.commission + self.slippage)
+
+    def extract_trades(self, held: np.ndarray) -> pd.DataFrame:
+        """Sabit pozisyonlu kesintisiz bölümleri işlem tablosuna çevirir"""
+        columns = ['Symbol', 'Direction', 'Entry_Date', 'Exit_Date', 'Entry_Price',
+                   'Exit_Price', 'Bars', 'Return', 'Open']
+        if held.size == 0:
+            return pd.DataFrame(columns=columns)
+
+        previous = np.vstack([np.zeros((1, held.shape[1])), held[:-1]])
+        following = np.vstack([held[1:], np.zeros((1, held.shape[1]))])
+        is_start = (held != 0) & (held != previous)
+        is_end = (held != 0) & (held != following)
+
+        # Sütun öncelikli sıralama ile başlangıç ve bitişler birebir eşleşir
+        start_cols, start_rows = np.nonzero(is_start.T)
+        end_cols, end_rows = np.nonzero(is_end.T)
+        if len(start_rows) == 0:
+            return pd.DataFrame(columns=columns)
+
+        direction = held[start_rows, start_cols]
+        # Giriş fiyatı sinyal barının kapanışıdır
+        entry_price = self._close_values[np.maximum(start_rows - 1, 0), start_cols]
+        exit_price = self._close_values[end_rows, end_cols]
+        cost = 2 * (self.commission + self.slippage)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            trade_return = direction * (exit_price / entry_price - 1) - cost
+
+        return pd.DataFrame({
+            'Symbol': np.asarray(self.close.columns, dtype=object)[start_cols],
+            'Direction': np.where(direction > 0, 'Uzun', 'Kısa'),
+            'Entry_Date': self.close.index[start_rows],
+            'Exit_Date': self.close.index[end_rows],
+            'Entry_Price': entry_price,
+            'Exit_Price': exit_price,
+            'Bars': end_rows - start_rows + 1,
+            'Return': trade_return,
+            'Open': end_rows == len(held) - 1
+        })
+
+    def summarize(self, strategy_returns: np.ndarray, held: np.ndarray,
+                  trades: pd.DataFrame) -> pd.DataFrame:
+        """Sembol bazında performans özeti üretir"""
+        listed = ~np.isnan(self._close_values)
+        days = np.maximum(listed.sum(axis=0), 1)
+
+        equity = np.cumprod(1 + strategy_returns, axis=0)
+        total_return = equity[-1] - 1
+        annual_return = np.power(np.maximum(equity[-1], 1e-12), TRADING_DAYS / days) - 1
+
+        # Volatilite yalnızca işlem gören günler üzerinden
+        masked = np.where(listed, strategy_returns, np.nan)
+        volatility = np.nanstd(masked, axis=0, ddof=1) * np.sqrt(TRADING_DAYS)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sharpe = np.where(volatility > 0, annual_return / volatility, 0.0)
+
+        drawdown = equity / np.maximum.accumulate(equity, axis=0) - 1
+        buy_hold = forward_fill(self._close_values, np.nan)
+        first_valid = np.argmax(listed, axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            buy_hold_return = buy_hold[-1] / self._close_values[first_valid, np.arange(listed.shape[1])] - 1
+
+        summary = pd.DataFrame({
+            'Toplam Getiri': total_return * 100,
+            'Yıllık Getiri': annual_return * 100,
+            'Yıllık Volatilite': volatility * 100,
+            'Sharpe Oranı': sharpe,
+            'Maksimum Düşüş': drawdown.min(axis=0) * 100,
+            'Piyasada Kalma': (np.abs(held) > 0).sum(axis=0) / days * 100,
+            'Al-Tut Getirisi': buy_hold_return * 100,
+        }, index=self.close.columns)
+
+        if not trades.empty:
+            closed = trades[~trades['Open']]
+            win_rate = closed['Return'].gt(0).groupby(closed['Symbol']).mean()
+            summary['İşlem Sayısı'] = trades.groupby('Symbol').size().reindex(summary.index, fill_value=0)
+            summary['Kazanma Oranı'] = (win_rate * 100).reindex(summary.index)
+        else:
+            summary['İşlem Sayısı'] = 0
+            summary['Kazanma Oranı'] = np.nan
+
+        return summary
+
+    def run(self, rule: str = 'Overall', rules: Optional[List[str]] = None, **params) -> Dict:
+        """Seçilen kural için backtest çalıştırır
+
+        rule: 'RSI', 'MACD', 'MA' ya da çoğunluk oyu için 'Overall'.
+        params: rule_states parametreleri (rsi_period, rsi_levels, ma_pair, macd).
+        """
+        try:
+            states = self.rule_states(**params)
+            signal = self.combine(states, rules) if rule == 'Overall' else states[rule]
+
+            held = self.positions(signal)
+            strategy_returns = self.strategy_returns(held)
+            trades = self.extract_trades(held)
+
+            index, columns = self.close.index, self.close.columns
+            listed = ~np.isnan(self._close_values)
+            # Eşit ağırlıklı evren portföyü: o gün işlem gören semboller arasında ortalama
+            active = np.maximum(listed.sum(axis=1), 1)
+            portfolio_returns = np.where(listed, strategy_returns, 0.0).sum(axis=1) / active
+
+            return {
+                'positions': pd.DataFrame(held, index=index, columns=columns),
+                'returns': pd.DataFrame(strategy_returns, index=index, columns=columns),
+                'equity': pd.DataFrame(np.cumprod(1 + strategy_returns, axis=0), index=index, columns=columns),
+                'trades': trades,
+                'summary': self.summarize(strategy_returns, held, trades),
+                'portfolio_equity': pd.Series(np.cumprod(1 + portfolio_returns), index=index)
+            }
+
+        except Exception as e:
+            st.error(f"Backtest hatası: {str(e)}")
+            return {}
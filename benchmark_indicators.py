@@ -0,0 +1,106 @@
+"""Teknik indikatör hesaplama sürelerini 10 yıllık sentetik veri üzerinde ölçer
+
+Kullanım: python benchmark_indicators.py [--bars 2520] [--repeat 7] [--budget-ms 5] [--median-multiple 5]
+
+Yeni indikatörlerden biri bütçeyi aşarsa çıkış kodu 1'dir. Bütçe
+--budget-ms verilirse sabit, verilmezse mevcut indikatörlerin medyan
+süresinin --median-multiple katıdır.
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from technical_analysis import TechnicalAnalysis
+
+
+def make_ohlcv(bars: int, seed: int = 42) -> pd.DataFrame:
+    """Rastgele yürüyüşle gerçekçi OHLCV verisi üretir"""
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range("2015-01-01", periods=bars)
+
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, bars)))
+    open_ = close * (1 + rng.normal(0, 0.005, bars))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.01, bars)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.01, bars)))
+    volume = rng.integers(100_000, 10_000_000, bars).astype(float)
+
+    return pd.DataFrame(
+        {"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume},
+        index=index,
+    )
+
+
+def time_call(func, repeat: int) -> float:
+    """Fonksiyonun medyan çalışma süresini milisaniye olarak döndürür"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bars", type=int, default=2520, help="Bar sayısı (10 yıl ≈ 2520)")
+    parser.add_argument("--repeat", type=int, default=7, help="Tekrar sayısı")
+    parser.add_argument("--budget-ms", type=float, default=None, help="İndikatör başına sabit bütçe (ms)")
+    parser.add_argument("--median-multiple", type=float, default=5.0,
+                        help="Sabit bütçe yoksa mevcut indikatör medyanının katı")
+    args = parser.parse_args()
+
+    analysis = TechnicalAnalysis(make_ohlcv(args.bars))
+
+    existing = {
+        "Hareketli Ortalamalar": analysis.calculate_moving_averages,
+        "RSI": analysis.calculate_rsi,
+        "MACD": analysis.calculate_macd,
+        "Bollinger": analysis.calculate_bollinger_bands,
+        "Stochastic": analysis.calculate_stochastic,
+        "Williams %R": analysis.calculate_williams_r,
+        "CCI": analysis.calculate_cci,
+        "ATR": analysis.calculate_atr,
+        "Hacim (OBV)": analysis.calculate_volume_indicators,
+    }
+    added = {
+        "ADX / DMI": analysis.calculate_adx,
+        "Parabolic SAR": analysis.calculate_parabolic_sar,
+        "SuperTrend": analysis.calculate_supertrend,
+        "Ichimoku": analysis.calculate_ichimoku,
+    }
+
+    print(f"{args.bars} bar, {args.repeat} tekrar (medyan)")
+    print(f"{'İndikatör':<24}{'Süre (ms)':>12}")
+
+    existing_times = {}
+    for name, func in existing.items():
+        existing_times[name] = time_call(func, args.repeat)
+        print(f"{name:<24}{existing_times[name]:>12.2f}")
+
+    print("-" * 36)
+    if args.budget_ms is not None:
+        budget = args.budget_ms
+        budget_label = "sabit"
+    else:
+        budget = args.median_multiple * float(np.median(list(existing_times.values())))
+        budget_label = f"mevcut indikatör medyanının {args.median_multiple:g} katı"
+
+    exceeded = []
+    for name, func in added.items():
+        elapsed = time_call(func, args.repeat)
+        status = "OK" if elapsed <= budget else "BÜTÇE AŞILDI"
+        if elapsed > budget:
+            exceeded.append(name)
+        print(f"{name:<24}{elapsed:>12.2f}  {status}")
+
+    print(f"Bütçe ({budget_label}): {budget:.2f} ms")
+    if exceeded:
+        print(f"Bütçeyi aşan indikatörler: {', '.join(exceeded)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional
+import streamlit as st
+
+# Formasyon kodu -> (Türkçe ad, sinyal yönü)
+PATTERNS = {
+    'Doji': ("Doji", "Nötr"),
+    'Hammer': ("Çekiç", "Al"),
+    'Shooting_Star': ("Kayan Yıldız", "Sat"),
+    'Bullish_Engulfing': ("Yutan Boğa", "Al"),
+    'Bearish_Engulfing': ("Yutan Ayı", "Sat"),
+    'Morning_Star': ("Sabah Yıldızı", "Al"),
+    'Evening_Star': ("Akşam Yıldızı", "Sat"),
+    'Inside_Bar': ("İçeride Mum", "Nötr"),
+    'Three_White_Soldiers': ("Üç Beyaz Asker", "Al"),
+    'Three_Black_Crows': ("Üç Kara Karga", "Sat"),
+}
+
+
+def _shift(values: np.ndarray, periods: int) -> np.ndarray:
+    """Satırları 'periods' bar aşağı kaydırır (ilk satırlar NaN)"""
+    shifted = np.full_like(values, np.nan)
+    shifted[periods:] = values[:-periods]
+    return shifted
+
+
+def _shift_mask(mask: np.ndarray, periods: int) -> np.ndarray:
+    """Boolean maskeyi 'periods' bar aşağı kaydırır (ilk satırlar yanlış)"""
+    shifted = np.zeros_like(mask)
+    shifted[periods:] = mask[:-periods]
+    return shifted
+
+
+def detect_patterns(open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                    trend_period: int = 5) -> Dict[str, np.ndarray]:
+    """OHLC dizilerinden (tarih × sembol) her formasyon için boolean maske üretir
+
+    Tüm kurallar dizi ifadeleridir; NaN içeren karşılaştırmalar yanlış sayılır.
+    Dönüş formasyonları (çekiç, kayan yıldız) için önceki trend, kapanışın
+    trend_period bar önceki kapanışa göre konumuyla belirlenir.
+    """
+    with np.errstate(invalid='ignore'):
+        body = np.abs(close - open_)
+        candle_range = high - low
+        upper_shadow = high - np.maximum(open_, close)
+        lower_shadow = np.minimum(open_, close) - low
+        bullish = close > open_
+        bearish = close < open_
+
+        prev_open, prev_close = _shift(open_, 1), _shift(close, 1)
+        prev_high, prev_low = _shift(high, 1), _shift(low, 1)
+        prev_body = np.abs(prev_close - prev_open)
+        prev_bullish, prev_bearish = prev_close > prev_open, prev_close < prev_open
+
+        # Ortalama gövde: son 10 barın gövde ortalaması (uzun mum tanımı için)
+        average_body = pd.DataFrame(body).rolling(10, min_periods=5).mean().to_numpy()
+        long_body = body > average_body
+        small_body = body <= 0.3 * average_body
+
+        downtrend = close < _shift(close, trend_period)
+        uptrend = close > _shift(close, trend_period)
+
+        patterns = {}
+        patterns['Doji'] = (candle_range > 0) & (body <= 0.1 * candle_range)
+        patterns['Hammer'] = ~patterns['Doji'] & (lower_shadow >= 2 * body) & \
+            (upper_shadow <= body) & _shift_mask(downtrend, 1)
+        patterns['Shooting_Star'] = ~patterns['Doji'] & (upper_shadow >= 2 * body) & \
+            (lower_shadow <= body) & _shift_mask(uptrend, 1)
+
+        patterns['Bullish_Engulfing'] = prev_bearish & bullish & (open_ <= prev_close) & \
+            (close >= prev_open) & (body > prev_body)
+        patterns['Bearish_Engulfing'] = prev_bullish & bearish & (open_ >= prev_close) & \
+            (close <= prev_open) & (body > prev_body)
+
+        # Üç mumlu yıldızlar: uzun mum, küçük gövdeli yıldız, ters yönde uzun mum
+        first_open, first_close = _shift(open_, 2), _shift(close, 2)
+        first_long = _shift_mask(long_body, 2)
+        star_small = _shift_mask(small_body, 1)
+        first_mid = (first_open + first_close) / 2
+        patterns['Morning_Star'] = first_long & (first_close < first_open) & star_small & \
+            (np.maximum(prev_open, prev_close) < first_close) & bullish & (close > first_mid)
+        patterns['Evening_Star'] = first_long & (first_close > first_open) & star_small & \
+            (np.minimum(prev_open, prev_close) > first_close) & bearish & (close < first_mid)
+
+        patterns['Inside_Bar'] = (high < prev_high) & (low > prev_low)
+
+        # Ardışık üç yükselen / düşen mum, her kapanış bir öncekinden yüksek / düşük
+        rising = bullish & (close > prev_close) & (open_ > prev_open) & (open_ < prev_close)
+        falling = bearish & (close < prev_close) & (open_ < prev_open) & (open_ > prev_close)
+        patterns['Three_White_Soldiers'] = rising & _shift_mask(rising, 1) & _shift_mask(rising, 2)
+        patterns['Three_Black_Crows'] = falling & _shift_mask(falling, 1) & _shift_mask(falling, 2)
+
+    return patterns
+
+
+class CandlestickScanner:
+    """OHLC panelleri üzerinde tüm evren için formasyon taraması yapan sınıf"""
+
+    def __init__(self, open_: pd.DataFrame, high: pd.DataFrame, low: pd.DataFrame,
+                 close: pd.DataFrame, trend_period: int = 5):
+        self.close = close
+        self.frames = [frame.reindex(index=close.index, columns=close.columns).to_numpy(dtype=np.float64)
+                       for frame in (open_, high, low, close)]
+        self.trend_period = trend_period
+        self._masks = None
+
+    @classmethod
+    def from_store(cls, store, symbols: Optional[List[str]] = None, lookback: int = 30) -> 'CandlestickScanner':
+        """MarketDataStore panellerinin son 'lookback' barından tarayıcı oluşturur"""
+        panels = [store.get_panel(field, symbols).tail(lookback) for field in ('Open', 'High', 'Low', 'Close')]
+        return cls(*panels)
+
+    def masks(self) -> Dict[str, np.ndarray]:
+        if self._masks is None:
+            self._masks = detect_patterns(*self.frames, trend_period=self.trend_period)
+        return self._masks
+
+    def latest(self) -> pd.DataFrame:
+        """Her sembolün son geçerli barındaki formasyonlar (sembol × formasyon) ve özet sütunu"""
+        columns = [f"Pattern_{code}" for code in PATTERNS] + ['Patterns']
+        try:
+            valid = ~np.isnan(self.frames[3])
+            last_pos = len(valid) - 1 - np.argmax(valid[::-1], axis=0)
+            symbols = np.arange(valid.shape[1])
+
+            table = pd.DataFrame({
+                f"Pattern_{code}": mask[last_pos, symbols] & valid.any(axis=0)
+                for code, mask in self.masks().items()
+            }, index=self.close.columns)
+
+            names = np.array([PATTERNS[code][0] for code in PATTERNS], dtype=object)
+            flags = table.to_numpy(dtype=bool)
+            table['Patterns'] = [", ".join(names[row]) for row in flags]
+            return table
+
+        except Exception as e:
+            st.error(f"Formasyon tarama hatası: {str(e)}")
+            return pd.DataFrame(columns=columns)
+
+    def events(self, start: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        """Formasyon olay tablosu (Date, Symbol, Pattern, Signal, Close)"""
+        columns = ['Date', 'Symbol', 'Pattern', 'Signal', 'Close']
+        frames = []
+        symbols = np.asarray(self.close.columns, dtype=object)
+
+        for code, mask in self.masks().items():
+            rows, cols = np.nonzero(mask)
+            if len(rows) == 0:
+                continue
+            frames.append(pd.DataFrame({
+                'Date': self.close.index[rows],
+                'Symbol': symbols[cols],
+                'Pattern': PATTERNS[code][0],
+                'Signal': PATTERNS[code][1],
+                'Close': self.frames[3][rows, cols],
+            }))
+
+        if not frames:
+            return pd.DataFrame(columns=columns)
+
+        events = pd.concat(frames, ignore_index=True)
+        if start is not None:
+            events = events[events['Date'] >= start]
+        return events.sort_values(['Date', 'Symbol'], ignore_index=True)
@@ -1,17 +1,52 @@
+import re
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
 import pandas as pd
-from typing import Dict, Optional
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Union
 import streamlit as st
 
+from downsampling import DEFAULT_POINT_BUDGET, downsample_ohlc, downsample_bars, downsample_line, downsample_band
+
+# Panel anahtarı -> (alt grafik başlığı, y ekseni başlığı, y aralığı, katmanlar)
+# Katmanlar ChartGenerator._add_<katman> metotlarıdır; paneller create_panel_chart ile birleştirilir
+CHART_PANELS = {
+    'price': ('Fiyat ve Hareketli Ortalamalar', "Fiyat (₺)", None, ['candles', 'moving_averages']),
+    'price_bands': ('Fiyat, Hareketli Ortalamalar ve Bollinger Bantları', "Fiyat (₺)", None,
+                    ['candles', 'moving_averages', 'bollinger']),
+    'candles': ('Fiyat', "Fiyat (₺)", None, ['candles']),
+    'rsi': ('RSI', "RSI", [0, 100], ['rsi']),
+    'macd': ('MACD', "MACD", None, ['macd']),
+    'stochastic': ('Stochastic', "Stochastic", [0, 100], ['stochastic']),
+    'volume': ('Hacim Analizi', "Hacim", None, ['volume', 'volume_ma']),
+    'volume_williams': ('Hacim ve Williams %R', "Hacim", None, ['volume', 'williams']),
+}
+
+# İkinci y ekseni gerektiren paneller
+SECONDARY_AXIS_PANELS = {'volume_williams'}
+
+# Yalnızca MA<periyot> sütunları (MACD hariç)
+MA_PATTERN = re.compile(r"MA(\d+)")
+
+
 class ChartGenerator:
-    """Grafik oluşturma sınıfı"""
+    """Grafik oluşturma sınıfı
+
+    Tüm fiyat / indikatör grafikleri aynı panel katmanlarından kurulur; iz
+    girdileri (hacim renkleri, histogram işaretleri, bant noktaları) dizi
+    işlemleriyle hazırlanır.
+    """
     
-    def __init__(self, stock_data: pd.DataFrame, technical_indicators: Dict):
+    def __init__(self, stock_data: pd.DataFrame, technical_indicators: Union[Dict, pd.DataFrame],
+                 max_points: Optional[int] = DEFAULT_POINT_BUDGET):
         self.stock_data = stock_data
         self.technical_indicators = technical_indicators
         
+        # İz başına nokta bütçesi: mumlar kovalara toplanır, çizgiler LTTB ile seyreltilir (None: kapalı)
+        self.max_points = max_points
+        self.plot_data = downsample_ohlc(stock_data, max_points)
+        
         # Türkçe tema ayarları
         self.theme_colors = {
             'background': '#FFFFFF',
@@ -24,217 +59,213 @@ class ChartGenerator:
             'indicator_colors': ['#3F51B5', '#E91E63', '#00BCD4', '#4CAF50', '#FF9800']
         }
     
-    def create_price_chart(self, title: str) -> go.Figure:
-        """Fiyat grafiği oluşturur"""
-        fig = go.Figure()
-        
-        # Mum grafiği
-        fig.add_trace(go.Candlestick(
-            x=self.stock_data.index,
-            open=self.stock_data['Open'],
-            high=self.stock_data['High'],
-            low=self.stock_data['Low'],
-            close=self.stock_data['Close'],
-            name="Fiyat",
-            increasing_line_color=self.theme_colors['up_color'],
-            decreasing_line_color=self.theme_colors['down_color']
-        ))
-        
-        # Hareketli ortalamalar ekle
-        ma_colors = self.theme_colors['ma_colors']
-        color_idx = 0
-        
-        for indicator, data in self.technical_indicators.items():
-            if indicator.startswith('MA') and not data.empty:
-                period = indicator.replace('MA', '')
-                fig.add_trace(go.Scatter(
-                    x=data.index,
-                    y=data.values,
-                    mode='lines',
-                    name=f"{period} Günlük Ortalama",
-                    line=dict(color=ma_colors[color_idx % len(ma_colors)], width=2),
-                    opacity=0.8
-                ))
-                color_idx += 1
-        
-        # Bollinger Bands
-        if 'BB_Upper' in self.technical_indicators and 'BB_Lower' in self.technical_indicators:
-            upper_band = self.technical_indicators['BB_Upper']
-            lower_band = self.technical_indicators['BB_Lower']
-            middle_band = self.technical_indicators.get('BB_Middle')
-            
-            # Alt band
-            fig.add_trace(go.Scatter(
-                x=lower_band.index,
-                y=lower_band.values,
-                mode='lines',
-                name='Bollinger Alt',
-                line=dict(color='rgba(128, 128, 128, 0.3)', width=1),
-                showlegend=False
-            ))
-            
-            # Üst band ve aradaki alan
-            fig.add_trace(go.Scatter(
-                x=upper_band.index,
-                y=upper_band.values,
-                mode='lines',
-                name='Bollinger Bantları',
-                line=dict(color='rgba(128, 128, 128, 0.3)', width=1),
-                fill='tonexty',
-                fillcolor='rgba(128, 128, 128, 0.1)'
-            ))
-            
-            # Orta band
-            if middle_band is not None:
-                fig.add_trace(go.Scatter(
-                    x=middle_band.index,
-                    y=middle_band.values,
-                    mode='lines',
-                    name='Bollinger Orta',
-                    line=dict(color='rgba(128, 128, 128, 0.5)', width=1, dash='dash')
-                ))
-        
-        # Grafik düzeni
-        fig.update_layout(
-            title=f"📈 {title} - Fiyat Grafiği",
-            xaxis_title="Tarih",
-            yaxis_title="Fiyat (₺)",
-            template="plotly_white",
-            height=600,
-            showlegend=True,
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1
-            ),
-            xaxis=dict(
-                rangeslider=dict(visible=False),
-                type="date"
-            )
-        )
-        
-        return fig
+    # --- İz girdileri ---
     
-    def create_technical_chart(self, title: str) -> go.Figure:
-        """Teknik indikatör grafiği oluşturur"""
-        # Alt grafikli yapı oluştur
-        fig = make_subplots(
-            rows=4, cols=1,
-            shared_xaxes=True,
-            vertical_spacing=0.05,
-            subplot_titles=('Fiyat ve Hareketli Ortalamalar', 'RSI', 'MACD', 'Stochastic'),
-            row_heights=[0.5, 0.2, 0.2, 0.1]
-        )
-        
-        # 1. Alt grafik: Fiyat ve MA
-        fig.add_trace(go.Candlestick(
-            x=self.stock_data.index,
-            open=self.stock_data['Open'],
-            high=self.stock_data['High'],
-            low=self.stock_data['Low'],
-            close=self.stock_data['Close'],
+    def _indicator(self, name: str) -> Optional[pd.Series]:
+        """İndikatör serisi (yoksa ya da boşsa None)"""
+        if name not in self.technical_indicators:
+            return None
+        data = self.technical_indicators[name]
+        return data if len(data) > 0 else None
+    
+    def _line(self, name: str) -> Optional[pd.Series]:
+        data = self._indicator(name)
+        return None if data is None else downsample_line(data, self.max_points)
+    
+    def moving_averages(self) -> List[tuple]:
+        """(periyot, seri) çiftleri; yalnızca MA<periyot> adlı indikatörler"""
+        averages = []
+        for indicator in self.technical_indicators.keys():
+            match = MA_PATTERN.fullmatch(str(indicator))
+            data = self._indicator(indicator) if match else None
+            if data is not None:
+                averages.append((match.group(1), downsample_line(data, self.max_points)))
+        return averages
+    
+    def volume_colors(self) -> np.ndarray:
+        """Hacim çubuk renkleri: kapanış bir öncekine göre yükseldiyse yukarı, düştüyse aşağı rengi"""
+        close = self.plot_data['Close'].to_numpy(dtype=np.float64)
+        colors = np.where(close >= np.roll(close, 1), self.theme_colors['up_color'],
+                          self.theme_colors['down_color']).astype(object)
+        if len(colors) > 0:
+            colors[0] = self.theme_colors['volume_color']
+        return colors
+    
+    @staticmethod
+    def _add(fig: go.Figure, trace, row: Optional[int], secondary_y: bool = False):
+        """İzi tek panelli figüre ya da verilen satıra ekler"""
+        if row is None:
+            fig.add_trace(trace)
+        elif secondary_y:
+            fig.add_trace(trace, row=row, col=1, secondary_y=True)
+        else:
+            fig.add_trace(trace, row=row, col=1)
+    
+    @staticmethod
+    def _add_levels(fig: go.Figure, levels: Sequence[tuple], row: Optional[int]):
+        """Yatay seviye çizgileri: (değer, renk, çizgi tipi, saydamlık)"""
+        for y, color, dash, opacity in levels:
+            if row is None:
+                fig.add_hline(y=y, line_dash=dash, line_color=color, opacity=opacity)
+            else:
+                fig.add_hline(y=y, line_dash=dash, line_color=color, opacity=opacity, row=row, col=1)
+    
+    # --- Panel katmanları ---
+    
+    def _add_candles(self, fig: go.Figure, row: Optional[int]):
+        self._add(fig, go.Candlestick(
+            x=self.plot_data.index,
+            open=self.plot_data['Open'],
+            high=self.plot_data['High'],
+            low=self.plot_data['Low'],
+            close=self.plot_data['Close'],
             name="Fiyat",
             increasing_line_color=self.theme_colors['up_color'],
             decreasing_line_color=self.theme_colors['down_color']
-        ), row=1, col=1)
-        
-        # Hareketli ortalamalar
+        ), row)
+    
+    def _add_moving_averages(self, fig: go.Figure, row: Optional[int]):
         ma_colors = self.theme_colors['ma_colors']
-        color_idx = 0
-        
-        for indicator, data in self.technical_indicators.items():
-            if indicator.startswith('MA') and len(data) > 0:
-                period = indicator.replace('MA', '')
-                fig.add_trace(go.Scatter(
-                    x=data.index,
-                    y=data.values,
-                    mode='lines',
-                    name=f"MA{period}",
-                    line=dict(color=ma_colors[color_idx % len(ma_colors)], width=2)
-                ), row=1, col=1)
-                color_idx += 1
-        
-        # 2. Alt grafik: RSI
-        if 'RSI' in self.technical_indicators:
-            rsi_data = self.technical_indicators['RSI']
-            fig.add_trace(go.Scatter(
-                x=rsi_data.index,
-                y=rsi_data.values,
+        for color_idx, (period, data) in enumerate(self.moving_averages()):
+            self._add(fig, go.Scatter(
+                x=data.index,
+                y=data.values,
                 mode='lines',
-                name='RSI',
-                line=dict(color=self.theme_colors['indicator_colors'][0], width=2)
-            ), row=2, col=1)
-            
-            # RSI seviye çizgileri
-            fig.add_hline(y=70, line_dash="dash", line_color="red", opacity=0.5, row=2, col=1)
-            fig.add_hline(y=30, line_dash="dash", line_color="green", opacity=0.5, row=2, col=1)
-            fig.add_hline(y=50, line_dash="dot", line_color="gray", opacity=0.3, row=2, col=1)
-        
-        # 3. Alt grafik: MACD
-        if 'MACD' in self.technical_indicators and 'Signal' in self.technical_indicators:
-            macd_data = self.technical_indicators['MACD']
-            signal_data = self.technical_indicators['Signal']
-            
-            fig.add_trace(go.Scatter(
-                x=macd_data.index,
-                y=macd_data.values,
-                mode='lines',
-                name='MACD',
-                line=dict(color=self.theme_colors['indicator_colors'][1], width=2)
-            ), row=3, col=1)
-            
-            fig.add_trace(go.Scatter(
-                x=signal_data.index,
-                y=signal_data.values,
+                name=f"MA{period}",
+                line=dict(color=ma_colors[color_idx % len(ma_colors)], width=2),
+                opacity=0.8
+            ), row)
+    
+    def _add_bollinger(self, fig: go.Figure, row: Optional[int]):
+        upper_band, lower_band = self._indicator('BB_Upper'), self._indicator('BB_Lower')
+        if upper_band is None or lower_band is None:
+            return
+        middle_band = self._indicator('BB_Middle')
+        
+        # Bantlar ortak noktalarda örneklenir (dolgu kaymasın diye)
+        upper_band, lower_band = downsample_band(upper_band, upper_band, lower_band, max_points=self.max_points)
+        
+        # Alt band, ardından üst band ve aradaki alan
+        self._add(fig, go.Scatter(
+            x=lower_band.index,
+            y=lower_band.values,
+            mode='lines',
+            name='Bollinger Alt',
+            line=dict(color='rgba(128, 128, 128, 0.3)', width=1),
+            showlegend=False
+        ), row)
+        self._add(fig, go.Scatter(
+            x=upper_band.index,
+            y=upper_band.values,
+            mode='lines',
+            name='Bollinger Bantları',
+            line=dict(color='rgba(128, 128, 128, 0.3)', width=1),
+            fill='tonexty',
+            fillcolor='rgba(128, 128, 128, 0.1)'
+        ), row)
+        
+        if middle_band is not None:
+            middle_band = middle_band.reindex(upper_band.index)
+            self._add(fig, go.Scatter(
+                x=middle_band.index,
+                y=middle_band.values,
                 mode='lines',
-                name='Signal',
-                line=dict(color=self.theme_colors['indicator_colors'][2], width=2)
-            ), row=3, col=1)
-            
-            # MACD Histogram
-            if 'Histogram' in self.technical_indicators:
-                histogram_data = self.technical_indicators['Histogram']
-                colors = ['green' if val >= 0 else 'red' for val in histogram_data.values]
-                
-                fig.add_trace(go.Bar(
-                    x=histogram_data.index,
-                    y=histogram_data.values,
-                    name='MACD Histogram',
-                    marker_color=colors,
-                    opacity=0.6
-                ), row=3, col=1)
-        
-        # 4. Alt grafik: Stochastic
-        if 'Stoch_K' in self.technical_indicators and 'Stoch_D' in self.technical_indicators:
-            stoch_k = self.technical_indicators['Stoch_K']
-            stoch_d = self.technical_indicators['Stoch_D']
-            
-            fig.add_trace(go.Scatter(
-                x=stoch_k.index,
-                y=stoch_k.values,
+                name='Bollinger Orta',
+                line=dict(color='rgba(128, 128, 128, 0.5)', width=1, dash='dash')
+            ), row)
+    
+    def _add_rsi(self, fig: go.Figure, row: Optional[int]):
+        rsi_data = self._line('RSI')
+        if rsi_data is None:
+            return
+        self._add(fig, go.Scatter(
+            x=rsi_data.index,
+            y=rsi_data.values,
+            mode='lines',
+            name='RSI',
+            line=dict(color=self.theme_colors['indicator_colors'][0], width=2)
+        ), row)
+        self._add_levels(fig, [(70, "red", "dash", 0.5), (30, "green", "dash", 0.5), (50, "gray", "dot", 0.3)], row)
+    
+    def _add_macd(self, fig: go.Figure, row: Optional[int]):
+        macd_data, signal_data = self._line('MACD'), self._line('Signal')
+        if macd_data is None or signal_data is None:
+            return
+        for data, name, color in ((macd_data, 'MACD', 1), (signal_data, 'Signal', 2)):
+            self._add(fig, go.Scatter(
+                x=data.index,
+                y=data.values,
                 mode='lines',
-                name='Stoch %K',
-                line=dict(color=self.theme_colors['indicator_colors'][3], width=2)
-            ), row=4, col=1)
-            
-            fig.add_trace(go.Scatter(
-                x=stoch_d.index,
-                y=stoch_d.values,
+                name=name,
+                line=dict(color=self.theme_colors['indicator_colors'][color], width=2)
+            ), row)
+        
+        histogram_data = self._indicator('Histogram')
+        if histogram_data is not None:
+            histogram_data = downsample_bars(histogram_data, self.max_points)
+            self._add(fig, go.Bar(
+                x=histogram_data.index,
+                y=histogram_data.values,
+                name='MACD Histogram',
+                marker_color=np.where(histogram_data.to_numpy() >= 0, 'green', 'red'),
+                opacity=0.6
+            ), row)
+    
+    def _add_stochastic(self, fig: go.Figure, row: Optional[int]):
+        stoch_k, stoch_d = self._line('Stoch_K'), self._line('Stoch_D')
+        if stoch_k is None or stoch_d is None:
+            return
+        for data, name, color in ((stoch_k, 'Stoch %K', 3), (stoch_d, 'Stoch %D', 4)):
+            self._add(fig, go.Scatter(
+                x=data.index,
+                y=data.values,
                 mode='lines',
-                name='Stoch %D',
-                line=dict(color=self.theme_colors['indicator_colors'][4], width=2)
-            ), row=4, col=1)
-            
-            # Stochastic seviye çizgileri
-            fig.add_hline(y=80, line_dash="dash", line_color="red", opacity=0.5, row=4, col=1)
-            fig.add_hline(y=20, line_dash="dash", line_color="green", opacity=0.5, row=4, col=1)
-        
-        # Grafik düzeni
+                name=name,
+                line=dict(color=self.theme_colors['indicator_colors'][color], width=2)
+            ), row)
+        self._add_levels(fig, [(80, "red", "dash", 0.5), (20, "green", "dash", 0.5)], row)
+    
+    def _add_volume(self, fig: go.Figure, row: Optional[int]):
+        self._add(fig, go.Bar(
+            x=self.plot_data.index,
+            y=self.plot_data['Volume'],
+            name='Hacim',
+            marker_color=self.volume_colors(),
+            opacity=0.7
+        ), row)
+    
+    def _add_volume_ma(self, fig: go.Figure, row: Optional[int]):
+        volume_ma = self._line('Volume_MA')
+        if volume_ma is None:
+            return
+        self._add(fig, go.Scatter(
+            x=volume_ma.index,
+            y=volume_ma.values,
+            mode='lines',
+            name='Hacim MA(20)',
+            line=dict(color='orange', width=2)
+        ), row)
+    
+    def _add_williams(self, fig: go.Figure, row: Optional[int]):
+        williams_r = self._line('Williams_R')
+        if williams_r is None:
+            return
+        self._add(fig, go.Scatter(
+            x=williams_r.index,
+            y=williams_r.values,
+            mode='lines',
+            name='Williams %R',
+            line=dict(color='purple', width=2)
+        ), row, secondary_y=row is not None)
+        if row is not None:
+            fig.update_yaxes(title_text="Williams %R", range=[-100, 0], row=row, col=1, secondary_y=True)
+    
+    # --- Figürler ---
+    
+    def _apply_layout(self, fig: go.Figure, title: str, height: int):
         fig.update_layout(
-            title=f"🔧 {title} - Teknik İndikatörler",
-            height=800,
+            title=title,
+            height=height,
             template="plotly_white",
             showlegend=True,
             legend=dict(
@@ -245,93 +276,69 @@ class ChartGenerator:
                 x=1
             )
         )
-        
-        # Y ekseni etiketleri
-        fig.update_yaxes(title_text="Fiyat (₺)", row=1, col=1)
-        fig.update_yaxes(title_text="RSI", row=2, col=1, range=[0, 100])
-        fig.update_yaxes(title_text="MACD", row=3, col=1)
-        fig.update_yaxes(title_text="Stochastic", row=4, col=1, range=[0, 100])
-        fig.update_xaxes(title_text="Tarih", row=4, col=1)
-        
-        return fig
     
-    def create_volume_chart(self, title: str) -> go.Figure:
-        """Hacim analiz grafiği oluşturur"""
+    def create_panel_chart(self, title: str, panels: Sequence[str], row_heights: Optional[Sequence[float]] = None,
+                           height: int = 800, vertical_spacing: float = 0.05) -> go.Figure:
+        """CHART_PANELS anahtarlarından ortak x eksenli alt grafikli figür oluşturur"""
         fig = make_subplots(
-            rows=2, cols=1,
+            rows=len(panels), cols=1,
             shared_xaxes=True,
-            vertical_spacing=0.1,
-            subplot_titles=('Fiyat', 'Hacim Analizi'),
-            row_heights=[0.7, 0.3]
+            vertical_spacing=vertical_spacing,
+            subplot_titles=[CHART_PANELS[panel][0] for panel in panels],
+            row_heights=list(row_heights) if row_heights is not None else None,
+            specs=[[{"secondary_y": panel in SECONDARY_AXIS_PANELS}] for panel in panels]
         )
         
-        # Fiyat grafiği
-        fig.add_trace(go.Candlestick(
-            x=self.stock_data.index,
-            open=self.stock_data['Open'],
-            high=self.stock_data['High'],
-            low=self.stock_data['Low'],
-            close=self.stock_data['Close'],
-            name="Fiyat",
-            increasing_line_color=self.theme_colors['up_color'],
-            decreasing_line_color=self.theme_colors['down_color']
-        ), row=1, col=1)
-        
-        # Hacim çubuk grafiği
-        colors = []
-        for i in range(len(self.stock_data)):
-            if i == 0:
-                colors.append(self.theme_colors['volume_color'])
+        for row, panel in enumerate(panels, start=1):
+            _, axis_title, axis_range, layers = CHART_PANELS[panel]
+            for layer in layers:
+                getattr(self, f"_add_{layer}")(fig, row)
+            if axis_range is not None:
+                fig.update_yaxes(title_text=axis_title, range=axis_range, row=row, col=1, secondary_y=False)
             else:
-                if self.stock_data['Close'].iloc[i] >= self.stock_data['Close'].iloc[i-1]:
-                    colors.append(self.theme_colors['up_color'])
-                else:
-                    colors.append(self.theme_colors['down_color'])
-        
-        fig.add_trace(go.Bar(
-            x=self.stock_data.index,
-            y=self.stock_data['Volume'],
-            name='Hacim',
-            marker_color=colors,
-            opacity=0.7
-        ), row=2, col=1)
+                fig.update_yaxes(title_text=axis_title, row=row, col=1, secondary_y=False)
         
-        # Hacim hareketli ortalaması
-        if 'Volume_MA' in self.technical_indicators:
-            volume_ma = self.technical_indicators['Volume_MA']
-            fig.add_trace(go.Scatter(
-                x=volume_ma.index,
-                y=volume_ma.values,
-                mode='lines',
-                name='Hacim MA(20)',
-                line=dict(color='orange', width=2)
-            ), row=2, col=1)
-        
-        # OBV indikatörü varsa ekle
-        if 'OBV' in self.technical_indicators:
-            # OBV için üçüncü bir alt grafik oluşturabiliriz
-            pass
+        self._apply_layout(fig, title, height)
+        fig.update_xaxes(rangeslider=dict(visible=False))
+        fig.update_xaxes(title_text="Tarih", row=len(panels), col=1)
+        return fig
+    
+    def create_price_chart(self, title: str) -> go.Figure:
+        """Fiyat grafiği oluşturur"""
+        fig = go.Figure()
+        for layer in CHART_PANELS['price_bands'][3]:
+            getattr(self, f"_add_{layer}")(fig, None)
         
+        self._apply_layout(fig, f"📈 {title} - Fiyat Grafiği", 600)
         fig.update_layout(
-            title=f"📊 {title} - Hacim Analizi",
-            height=600,
-            template="plotly_white",
-            showlegend=True,
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1
+            xaxis_title="Tarih",
+            yaxis_title="Fiyat (₺)",
+            xaxis=dict(
+                rangeslider=dict(visible=False),
+                type="date"
             )
         )
         
-        fig.update_yaxes(title_text="Fiyat (₺)", row=1, col=1)
-        fig.update_yaxes(title_text="Hacim", row=2, col=1)
-        fig.update_xaxes(title_text="Tarih", row=2, col=1)
-        
         return fig
     
+    def create_technical_chart(self, title: str) -> go.Figure:
+        """Teknik indikatör grafiği oluşturur"""
+        return self.create_panel_chart(f"🔧 {title} - Teknik İndikatörler",
+                                       ['price', 'rsi', 'macd', 'stochastic'],
+                                       row_heights=[0.5, 0.2, 0.2, 0.1], height=800)
+    
+    def create_volume_chart(self, title: str) -> go.Figure:
+        """Hacim analiz grafiği oluşturur"""
+        return self.create_panel_chart(f"📊 {title} - Hacim Analizi", ['candles', 'volume'],
+                                       row_heights=[0.7, 0.3], height=600, vertical_spacing=0.1)
+    
+    def create_comprehensive_chart(self, title: str) -> go.Figure:
+        """Fiyat, RSI, MACD, Stochastic ve hacim / Williams %R panelli kapsamlı grafik"""
+        return self.create_panel_chart(f"🔧 {title} - Kapsamlı Teknik Analiz",
+                                       ['price_bands', 'rsi', 'macd', 'stochastic', 'volume_williams'],
+                                       row_heights=[0.4, 0.15, 0.15, 0.15, 0.15], height=1000,
+                                       vertical_spacing=0.03)
+    
     def create_comparison_chart(self, comparison_data: Dict[str, pd.DataFrame], title: str) -> go.Figure:
         """Karşılaştırma grafiği oluşturur"""
         fig = go.Figure()
@@ -372,34 +379,53 @@ class ChartGenerator:
         
         return fig
     
-    def create_sector_analysis_chart(self, sector_data: Dict) -> go.Figure:
-        """Sektör analizi grafiği oluşturur"""
-        if not sector_data:
+    def create_sector_analysis_chart(self, sector_data: Union[Dict, pd.DataFrame]) -> go.Figure:
+        """Sektör analizi grafiği oluşturur
+
+        sector_data, get_peer_comparison sözlüğü ya da peer_matrix tablosu
+        olabilir (sembol indeksli, 'P/E', 'ROE', 'Piyasa Değeri' sütunları).
+        """
+        if sector_data is None or len(sector_data) == 0:
+            return go.Figure()
+        
+        peers = sector_data if isinstance(sector_data, pd.DataFrame) \
+            else pd.DataFrame.from_dict(sector_data, orient='index')
+        peers = peers.reindex(columns=['P/E', 'ROE', 'Piyasa Değeri']).apply(pd.to_numeric, errors='coerce')
+        peers = peers.dropna(subset=['P/E', 'ROE'])
+        if peers.empty:
             return go.Figure()
         
-        symbols = list(sector_data.keys())
-        pe_ratios = [data.get('P/E', 0) for data in sector_data.values()]
-        market_caps = [data.get('Piyasa Değeri', 0) for data in sector_data.values()]
+        # Piyasa değerine göre boyut (milyar ₺); eksik değerler sabit boyutta
+        sizes = (peers['Piyasa Değeri'] / 1e9).fillna(5.0).to_numpy()
         
-        # Bubble chart oluştur
         fig = go.Figure(data=go.Scatter(
-            x=pe_ratios,
-            y=[data.get('ROE', 0) for data in sector_data.values()],
+            x=peers['P/E'].to_numpy(),
+            y=peers['ROE'].to_numpy(),
             mode='markers+text',
-            text=[symbol.replace('.IS', '') for symbol in symbols],
+            text=peers.index.str.replace('.IS', '', regex=False),
             textposition="top center",
             marker=dict(
-                size=[cap/1e9 if cap else 5 for cap in market_caps],  # Piyasa değerine göre boyut
-                color=pe_ratios,
+                size=sizes,
+                color=peers['P/E'].to_numpy(),
                 colorscale='Viridis',
                 showscale=True,
                 colorbar=dict(title="P/E Oranı"),
                 sizemode='diameter',
-                sizeref=2.*max([cap/1e9 if cap else 1 for cap in market_caps])/(40.**2),
+                sizeref=2. * max(sizes.max(), 1.0) / (40. ** 2),
                 sizemin=4
             )
         ))
         
+        # Sektör medyanları (peer_matrix tek sektör içinse)
+        if isinstance(sector_data, pd.DataFrame) and 'Sektör Medyan P/E' in sector_data.columns:
+            median_pe = sector_data['Sektör Medyan P/E'].iloc[0]
+            median_roe = sector_data['Sektör Medyan ROE'].iloc[0]
+            if sector_data['Sektör'].nunique() == 1 and pd.notna(median_pe) and pd.notna(median_roe):
+                fig.add_vline(x=median_pe, line_dash="dash", line_color="gray",
+                              annotation_text="Medyan P/E")
+                fig.add_hline(y=median_roe, line_dash="dash", line_color="gray",
+                              annotation_text="Medyan ROE")
+        
         fig.update_layout(
             title="🏭 Sektör Analizi - P/E vs ROE",
             xaxis_title="P/E Oranı",
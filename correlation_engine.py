@@ -0,0 +1,172 @@
+import pandas as pd
+import numpy as np
+from typing import Dict, Iterator, List, Optional, Tuple
+import streamlit as st
+
+from market_store import BENCHMARK_SYMBOL
+
+
+class CorrelationEngine:
+    """Getiri paneli üzerinden kayan beta ve korelasyon matrisi hesaplayan sınıf
+
+    Eksik veriler çift bazında dışlanır (pairwise-complete): her sembol
+    çifti için yalnızca ikisinin de geçerli olduğu günler kullanılır.
+    """
+
+    def __init__(self, returns: pd.DataFrame, benchmark: str = BENCHMARK_SYMBOL):
+        self.returns = returns
+        self.benchmark = benchmark
+        self.symbols = [s for s in returns.columns if s != benchmark]
+
+    # --- Beta ---
+
+    def rolling_beta(self, window: int = 252, min_periods: Optional[int] = None) -> pd.DataFrame:
+        """Tüm semboller için endekse karşı kayan betayı hesaplar (tarih × sembol)"""
+        if self.benchmark not in self.returns.columns:
+            st.error(f"Beta için endeks verisi yok: {self.benchmark}")
+            return pd.DataFrame()
+
+        min_periods = min_periods or max(window // 2, 2)
+
+        x = self.returns[self.symbols].to_numpy(dtype=np.float64)
+        y = self.returns[self.benchmark].to_numpy(dtype=np.float64)[:, None]
+        valid = ~np.isnan(x) & ~np.isnan(y)
+
+        x0 = np.where(valid, x, 0.0)
+        y0 = np.where(valid, y, 0.0)
+
+        # Kayan toplamlar kümülatif toplam farkıyla O(T·N) güncellenir
+        n = self._window_sum(valid.astype(np.float64), window)
+        sum_x = self._window_sum(x0, window)
+        sum_y = self._window_sum(y0, window)
+        sum_xy = self._window_sum(x0 * y0, window)
+        sum_yy = self._window_sum(y0 * y0, window)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            covariance = sum_xy - sum_x * sum_y / n
+            variance = sum_yy - sum_y * sum_y / n
+            beta = covariance / variance
+
+        beta[(n < min_periods) | (variance <= 0)] = np.nan
+
+        return pd.DataFrame(beta, index=self.returns.index, columns=self.symbols)
+
+    @staticmethod
+    def _window_sum(values: np.ndarray, window: int) -> np.ndarray:
+        """Kümülatif toplam farkıyla kayan pencere toplamı hesaplar"""
+        cumulative = np.cumsum(values, axis=0)
+        result = cumulative.copy()
+        result[window:] -= cumulative[:-window]
+        return result
+
+    def latest_beta(self, window: int = 252) -> pd.Series:
+        """Son gün itibarıyla beta değerlerini döndürür"""
+        beta = self.rolling_beta(window)
+        return beta.iloc[-1] if not beta.empty else pd.Series(dtype=float)
+
+    # --- Korelasyon matrisi ---
+
+    def _prepare(self, symbols: Optional[List[str]]) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        symbols = symbols or list(self.returns.columns)
+        values = self.returns[symbols].to_numpy(dtype=np.float64)
+        mask = (~np.isnan(values)).astype(np.float64)
+        return np.where(mask > 0, values, 0.0), mask, symbols
+
+    @staticmethod
+    def _moments(x: np.ndarray, m: np.ndarray, block_size: int) -> Dict[str, np.ndarray]:
+        """Çift bazlı moment matrislerini blok matris çarpımlarıyla hesaplar"""
+        k = x.shape[1]
+        moments = {name: np.empty((k, k)) for name in ('n', 'sx', 'sxx', 'sxy')}
+        x2 = x * x
+
+        for start in range(0, k, block_size):
+            block = slice(start, start + block_size)
+            # Satır i, sütun j: j'nin de geçerli olduğu günlerde i'nin toplamları
+            moments['n'][block] = m[:, block].T @ m
+            moments['sx'][block] = x[:, block].T @ m
+            moments['sxx'][block] = x2[:, block].T @ m
+            moments['sxy'][block] = x[:, block].T @ x
+
+        return moments
+
+    @staticmethod
+    def _corr_from_moments(moments: Dict[str, np.ndarray], min_periods: int) -> np.ndarray:
+        n, sx, sxx, sxy = moments['n'], moments['sx'], moments['sxx'], moments['sxy']
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # sx[i, j] i'nin, sx[j, i] j'nin ortak günlerdeki toplamı
+            covariance = sxy - sx * sx.T / n
+            var_i = sxx - sx * sx / n
+            var_j = var_i.T
+            corr = covariance / np.sqrt(var_i * var_j)
+
+        corr[(n < min_periods) | (var_i <= 0) | (var_j <= 0)] = np.nan
+        np.clip(corr, -1.0, 1.0, out=corr)
+        np.fill_diagonal(corr, np.where(np.diag(n) >= min_periods, 1.0, np.nan))
+        return corr
+
+    def correlation_matrix(self, window: int = 252, end: Optional[pd.Timestamp] = None,
+                           symbols: Optional[List[str]] = None, min_periods: Optional[int] = None,
+                           block_size: int = 64) -> pd.DataFrame:
+        """Belirli bir tarihte biten pencere için korelasyon matrisini hesaplar"""
+        x, m, symbols = self._prepare(symbols)
+        min_periods = min_periods or max(window // 2, 2)
+
+        stop = len(self.returns) if end is None else self.returns.index.searchsorted(end, side='right')
+        rows = slice(max(stop - window, 0), stop)
+
+        moments = self._moments(x[rows], m[rows], block_size)
+        corr = self._corr_from_moments(moments, min_periods)
+
+        return pd.DataFrame(corr, index=symbols, columns=symbols)
+
+    def rolling_correlation_matrices(self, window: int = 252, step: int = 21,
+                                     symbols: Optional[List[str]] = None,
+                                     min_periods: Optional[int] = None, block_size: int = 64,
+                                     recompute_every: int = 250) -> Iterator[Tuple[pd.Timestamp, pd.DataFrame]]:
+        """Kayan korelasyon matrislerini artımlı güncellemeyle üretir
+
+        Her adımda pencereye giren ve çıkan satırlar blok halinde eklenip
+        çıkarılır; biriken yuvarlama hatası recompute_every satırda bir tam
+        hesaplamayla sıfırlanır. Matrisler tek tek üretildiği için bellekte
+        aynı anda yalnızca bir pencere tutulur.
+        """
+        x, m, symbols = self._prepare(symbols)
+        min_periods = min_periods or max(window // 2, 2)
+        total = len(x)
+        if total < window:
+            return
+
+        end = window
+        moments = self._moments(x[:window], m[:window], block_size)
+        since_recompute = 0
+
+        while True:
+            corr = self._corr_from_moments(moments, min_periods)
+            yield self.returns.index[end - 1], pd.DataFrame(corr, index=symbols, columns=symbols)
+
+            new_end = min(end + step, total)
+            if new_end == end:
+                break
+
+            since_recompute += new_end - end
+            if since_recompute >= recompute_every:
+                moments = self._moments(x[new_end - window:new_end], m[new_end - window:new_end], block_size)
+                since_recompute = 0
+            else:
+                added = self._moments(x[end:new_end], m[end:new_end], block_size)
+                removed = self._moments(x[end - window:new_end - window], m[end - window:new_end - window], block_size)
+                for name in moments:
+                    moments[name] += added[name] - removed[name]
+
+            end = new_end
+
+    def average_correlation(self, window: int = 63, step: int = 5) -> pd.Series:
+        """Evrenin ortalama çift korelasyonunu zaman serisi olarak döndürür"""
+        values = {}
+        for date, corr in self.rolling_correlation_matrices(window=window, step=step, symbols=self.symbols):
+            matrix = corr.to_numpy()
+            upper = matrix[np.triu_indices_from(matrix, k=1)]
+            values[date] = np.nanmean(upper) if np.isfinite(upper).any() else np.nan
+
+        return pd.Series(values, dtype=float)
@@ -186,6 +186,37 @@ class DataFetcher:
             st.error(f"Veri çekme hatası ({symbol}): {str(e)}")
             return None
     
+    def download_price_panel(self, symbols: List[str], period: str = "1y",
+                             start: Optional[str] = None) -> Optional[Dict[str, pd.DataFrame]]:
+        """Tek toplu istekle OHLCV panellerini indirir (önbelleksiz)"""
+        symbols = list(dict.fromkeys(symbols))  # Tekrarlanan sembolleri at
+        if not symbols:
+            return None
+        
+        if start is not None:
+            raw = yf.download(symbols, start=start, group_by='column', auto_adjust=True,
+                              progress=False, threads=True)
+        else:
+            raw = yf.download(symbols, period=period, group_by='column', auto_adjust=True,
+                              progress=False, threads=True)
+        
+        if raw is None or raw.empty:
+            return None
+        
+        panel = {}
+        for field in ['Open', 'High', 'Low', 'Close', 'Volume']:
+            if field not in raw.columns.get_level_values(0):
+                continue
+            
+            frame = raw[field]
+            if isinstance(frame, pd.Series):
+                frame = frame.to_frame(name=symbols[0])
+            
+            # Kolon sırasını istenen sembol sırasına sabitle
+            panel[field] = frame.reindex(columns=symbols).astype(float)
+        
+        return panel
+    
     @st.cache_data(ttl=600)  # 10 dakika cache
     def get_market_summary(_self) -> Optional[Dict]:
         """Piyasa özetini getirir"""
@@ -0,0 +1,114 @@
+import pandas as pd
+import numpy as np
+from typing import Dict, Optional, Sequence
+import streamlit as st
+
+# Varsayılan duyarlılık ızgaraları; calculate_intrinsic_value varsayımları (%5 / %10 / %3) dahildir
+DEFAULT_GROWTH_RATES = np.round(np.arange(0.0, 0.301, 0.025), 4)
+DEFAULT_DISCOUNT_RATES = np.round(np.arange(0.10, 0.401, 0.025), 4)
+DEFAULT_TERMINAL_RATES = np.array([0.02, 0.03, 0.04])
+
+
+def dcf_values(free_cashflow: np.ndarray, shares: np.ndarray, growth: Sequence[float],
+               discount: Sequence[float], terminal: Sequence[float], years: int = 5,
+               net_debt: Optional[np.ndarray] = None) -> np.ndarray:
+    """Hisse başı DCF değerlerini (sembol × büyüme × iskonto × terminal) tek yayınlamayla hesaplar
+
+    Her senaryo için 'years' yıllık projeksiyonun bugünkü değeri ile Gordon
+    terminal değeri toplanır. İskonto oranı terminal büyümeden büyük olmayan
+    senaryolar ve geçersiz nakit akışı / hisse adedi NaN döner.
+    """
+    growth = np.asarray(growth, dtype=np.float64)[:, None, None]
+    discount = np.asarray(discount, dtype=np.float64)[None, :, None]
+    terminal = np.asarray(terminal, dtype=np.float64)[None, None, :]
+    year = np.arange(1, years + 1, dtype=np.float64)
+
+    # Projeksiyon dönemi çarpanı: Σ ((1+g)/(1+d))^y  -> (büyüme × iskonto × 1)
+    ratio = (1 + growth) / (1 + discount)
+    projection = (ratio[..., None] ** year).sum(axis=-1)
+
+    # Terminal değer çarpanı: FCF_n (1+tg) / (d - tg) / (1+d)^n
+    with np.errstate(divide='ignore', invalid='ignore'):
+        terminal_factor = ratio ** years * (1 + terminal) / (discount - terminal)
+    factor = np.where(discount > terminal, projection + terminal_factor, np.nan)
+
+    free_cashflow = np.asarray(free_cashflow, dtype=np.float64)
+    shares = np.asarray(shares, dtype=np.float64)
+    enterprise = free_cashflow[:, None, None, None] * factor[None]
+    if net_debt is not None:
+        enterprise = enterprise - np.nan_to_num(np.asarray(net_debt, dtype=np.float64))[:, None, None, None]
+
+    valid = (free_cashflow > 0) & (shares > 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        per_share = enterprise / shares[:, None, None, None]
+    per_share[~valid] = np.nan
+    return per_share
+
+
+class DCFEngine:
+    """Temel veri tablosu üzerinden tüm evren için DCF duyarlılık yüzeyleri üreten sınıf"""
+
+    def __init__(self, fundamentals: pd.DataFrame, growth: Optional[Sequence[float]] = None,
+                 discount: Optional[Sequence[float]] = None, terminal: Optional[Sequence[float]] = None,
+                 years: int = 5, subtract_net_debt: bool = False):
+        self.fundamentals = fundamentals
+        self.growth = np.asarray(growth if growth is not None else DEFAULT_GROWTH_RATES, dtype=np.float64)
+        self.discount = np.asarray(discount if discount is not None else DEFAULT_DISCOUNT_RATES, dtype=np.float64)
+        self.terminal = np.asarray(terminal if terminal is not None else DEFAULT_TERMINAL_RATES, dtype=np.float64)
+        self.years = years
+        self.subtract_net_debt = subtract_net_debt
+        self._values = None
+
+    @property
+    def values(self) -> np.ndarray:
+        """Sembol × büyüme × iskonto × terminal değer küpü"""
+        if self._values is None:
+            table = self.fundamentals
+            net_debt = None
+            if self.subtract_net_debt:
+                net_debt = table['Total_Debt'].fillna(0.0) - table['Total_Cash'].fillna(0.0)
+            self._values = dcf_values(table['Free_Cashflow'].to_numpy(), table['Shares_Outstanding'].to_numpy(),
+                                      self.growth, self.discount, self.terminal, self.years, net_debt)
+        return self._values
+
+    def surface(self, symbol: str, terminal: Optional[float] = None) -> pd.DataFrame:
+        """Tek sembol için büyüme × iskonto duyarlılık tablosu (verilen terminal oranında)"""
+        terminal = self.terminal[len(self.terminal) // 2] if terminal is None else terminal
+        t_index = int(np.argmin(np.abs(self.terminal - terminal)))
+        s_index = self.fundamentals.index.get_loc(symbol)
+
+        return pd.DataFrame(self.values[s_index, :, :, t_index],
+                            index=pd.Index(self.growth * 100, name="Büyüme (%)"),
+                            columns=pd.Index(self.discount * 100, name="İskonto (%)"))
+
+    def _nearest(self, grid: np.ndarray, value: float) -> int:
+        return int(np.argmin(np.abs(grid - value)))
+
+    def summary(self, growth: float = 0.05, discount: float = 0.10, terminal: float = 0.03) -> pd.DataFrame:
+        """Sembol bazında baz senaryo değeri, ızgara aralığı ve fiyata göre konum"""
+        try:
+            values = self.values
+            base = values[:, self._nearest(self.growth, growth), self._nearest(self.discount, discount),
+                          self._nearest(self.terminal, terminal)]
+            flat = values.reshape(len(values), -1)
+            scenarios = (~np.isnan(flat)).sum(axis=1)
+            price = self.fundamentals['Price'].to_numpy(dtype=np.float64) \
+                if 'Price' in self.fundamentals.columns else np.full(len(values), np.nan)
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                summary = pd.DataFrame({
+                    'Mevcut Fiyat': price,
+                    'İçsel Değer (Baz)': base,
+                    'Potansiyel (%)': (base / price - 1) * 100,
+                    'En Düşük Değer': np.fmin.reduce(flat, axis=1),
+                    'Medyan Değer': np.nanmedian(np.where(scenarios[:, None] > 0, flat, 0.0), axis=1),
+                    'En Yüksek Değer': np.fmax.reduce(flat, axis=1),
+                    'Fiyat Üstü Senaryo (%)': (flat > price[:, None]).sum(axis=1) / scenarios * 100,
+                }, index=self.fundamentals.index)
+
+            summary.loc[scenarios == 0, 'Medyan Değer'] = np.nan
+            return summary
+
+        except Exception as e:
+            st.error(f"DCF hesaplama hatası: {str(e)}")
+            return pd.DataFrame()
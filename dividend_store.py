@@ -0,0 +1,214 @@
+import os
+import pandas as pd
+import numpy as np
+import yfinance as yf
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import streamlit as st
+
+from data_fetcher import DataFetcher
+from market_store import CACHE_DIR, BENCHMARK_SYMBOL, refresh_stale, save_pickle
+
+DIVIDEND_COLUMNS = ['Symbol', 'Date', 'Dividend']
+
+
+def fetch_dividends(symbol: str, start: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+    """Bir sembolün temettü ödemelerini (Symbol, Date, Dividend) çeker; 'start' verilirse yalnızca sonrası"""
+    ticker = yf.Ticker(symbol)
+    if start is None:
+        dividends = ticker.dividends
+    else:
+        history = ticker.history(start=start.strftime("%Y-%m-%d"), actions=True, auto_adjust=False)
+        dividends = history['Dividends'] if 'Dividends' in history.columns else pd.Series(dtype=np.float64)
+
+    dividends = dividends[dividends > 0]
+    if dividends.empty:
+        return pd.DataFrame(columns=DIVIDEND_COLUMNS)
+
+    index = pd.DatetimeIndex(dividends.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return pd.DataFrame({'Symbol': symbol, 'Date': index.normalize(),
+                         'Dividend': dividends.to_numpy(dtype=np.float64)})
+
+
+class DividendStore:
+    """Temettü geçmişlerini yerel olarak saklayan ve artımlı güncelleyen sınıf
+
+    Bilinen semboller için yalnızca son çekimden sonraki ödemeler indirilir.
+    Verim, düzenlilik ve büyüme metrikleri tüm semboller için fiyat paneli
+    üzerinde tek geçişte hesaplanır.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, data_fetcher: Optional[DataFetcher] = None):
+        self.data_fetcher = data_fetcher or DataFetcher()
+        self.path = os.path.join(cache_dir or CACHE_DIR, "dividends.pkl")
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        state = pd.read_pickle(self.path) if os.path.exists(self.path) else {}
+        self.dividends = state.get('dividends', pd.DataFrame(columns=DIVIDEND_COLUMNS))
+        self.fetched = state.get('fetched', {})
+
+    def refresh(self, symbols: Optional[List[str]] = None, max_workers: int = 8,
+                max_age_days: float = 1, overlap_days: int = 30, force: bool = False) -> List[str]:
+        """Süresi dolan sembollerin temettülerini eşzamanlı günceller; güncellenenleri döndürür"""
+        # Daha önce çekilmiş semboller son çekimden (örtüşmeli) itibaren güncellenir
+        starts = {s: pd.Timestamp(stamp) - timedelta(days=overlap_days) for s, stamp in self.fetched.items()}
+        if force:
+            starts = {}
+
+        def fetch(symbol: str) -> pd.DataFrame:
+            return fetch_dividends(symbol, starts.get(symbol))
+
+        return refresh_stale("Temettü deposu", fetch, lambda fetched: self._merge(fetched, starts), self.fetched,
+                             self.data_fetcher, symbols, timedelta(days=max_age_days), force, max_workers)
+
+    def _merge(self, fetched: Dict[str, pd.DataFrame], starts: Dict[str, pd.Timestamp]):
+        """Tam geçmiş çekilen sembollerin eski kayıtları silinir; artımlı çekimlerde yeni kayıt önceliklidir"""
+        full = [s for s in fetched if s not in starts]
+        kept = self.dividends[~self.dividends['Symbol'].isin(full)]
+        dividends = pd.concat([kept] + [frame for frame in fetched.values() if not frame.empty],
+                              ignore_index=True)
+        dividends = dividends.drop_duplicates(['Symbol', 'Date'], keep='last')
+        dividends['Date'] = pd.to_datetime(dividends['Date'])
+        self.dividends = dividends.astype({'Dividend': np.float64}).sort_values(
+            ['Symbol', 'Date'], ignore_index=True)
+
+        now = datetime.now()
+        self.fetched.update({symbol: now for symbol in fetched})
+        save_pickle({'dividends': self.dividends, 'fetched': self.fetched}, self.path)
+
+    def dividend_panel(self, index: pd.DatetimeIndex, symbols: List[str]) -> pd.DataFrame:
+        """Ödemeleri işlem günlerine hizalanmış (tarih × sembol) panel olarak döndürür
+
+        Tatile denk gelen hak kullanım tarihleri bir sonraki işlem gününe kaydırılır.
+        """
+        dividends = self.dividends[self.dividends['Symbol'].isin(symbols)]
+        positions = index.searchsorted(pd.DatetimeIndex(dividends['Date']))
+        inside = positions < len(index)
+        aligned = pd.DataFrame({'Date': index[positions[inside]],
+                                'Symbol': dividends['Symbol'].to_numpy()[inside],
+                                'Dividend': dividends['Dividend'].to_numpy()[inside]})
+        panel = aligned.pivot_table(index='Date', columns='Symbol', values='Dividend', aggfunc='sum')
+        return panel.reindex(index=index, columns=symbols).fillna(0.0)
+
+    def trailing_yield(self, close: pd.DataFrame, days: int = 365) -> pd.DataFrame:
+        """Günlük son 12 ay temettü verimi paneli (%)
+
+        Fiyat paneli temettüye göre düzeltilmiş olduğundan geçmiş verimler hafifçe
+        yüksek çıkar; son gün için düzeltme katsayısı 1'dir.
+        """
+        paid = self.dividend_panel(close.index, list(close.columns))
+        trailing = paid.rolling(f"{days}D").sum()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return trailing / close * 100
+
+    def annual_totals(self, symbols: Optional[List[str]] = None) -> pd.DataFrame:
+        """Sembol × yıl toplam temettü tablosu (ödeme yapılmayan yıllar 0)"""
+        dividends = self.dividends
+        if symbols is not None:
+            dividends = dividends[dividends['Symbol'].isin(symbols)]
+        if dividends.empty:
+            return pd.DataFrame()
+
+        totals = dividends.assign(Year=pd.DatetimeIndex(dividends['Date']).year).pivot_table(
+            index='Symbol', columns='Year', values='Dividend', aggfunc='sum', fill_value=0.0)
+        years = range(totals.columns.min(), totals.columns.max() + 1)
+        return totals.reindex(columns=years, fill_value=0.0)
+
+    def analytics(self, close: pd.DataFrame, years: int = 5,
+                  as_of: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        """Tüm semboller için temettü özeti (sembol × metrik)
+
+        Düzenlilik ve büyüme son 'years' tamamlanmış takvim yılı üzerinden
+        hesaplanır; sonraki hak kullanım tarihi son ödeme ile ödemeler arası
+        medyan aralıktan tahmin edilir. Tek yıllık pencerede büyüme NaN'dır.
+        """
+        if years < 1:
+            raise ValueError(f"years en az 1 olmalıdır: {years}")
+
+        try:
+            close = close.drop(columns=[BENCHMARK_SYMBOL], errors='ignore')
+            symbols = list(close.columns)
+            as_of = pd.Timestamp(as_of) if as_of is not None else close.index[-1]
+
+            # Son 12 ay verimi: son geçerli kapanışa göre
+            yields = self.trailing_yield(close.loc[:as_of]).ffill()
+            latest_yield = yields.iloc[-1] if not yields.empty else pd.Series(np.nan, index=symbols)
+
+            # Son 'years' tamamlanmış yıl: düzenlilik, ardışık ödeme ve bileşik büyüme
+            window = list(range(as_of.year - years, as_of.year))
+            annual = self.annual_totals(symbols).reindex(index=symbols, columns=window, fill_value=0.0)
+            annual = annual.fillna(0.0).to_numpy(dtype=np.float64)
+            paid_years = (annual > 0).sum(axis=1)
+            streak = np.argmin(np.hstack([annual[:, ::-1] > 0, np.zeros((len(symbols), 1), dtype=bool)]), axis=1)
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                if years > 1:
+                    cagr = np.where((annual[:, 0] > 0) & (annual[:, -1] > 0),
+                                    ((annual[:, -1] / annual[:, 0]) ** (1 / (years - 1)) - 1) * 100, np.nan)
+                else:
+                    cagr = np.full(len(symbols), np.nan)
+                growth_years = (np.diff(annual, axis=1) > 0).sum(axis=1)
+
+            # Son ödeme ve ödeme aralıkları (sembol içinde ardışık farklar)
+            dividends = self.dividends[self.dividends['Symbol'].isin(symbols) &
+                                       (self.dividends['Date'] <= as_of)]
+            grouped = dividends.groupby('Symbol')
+            last_date = grouped['Date'].max()
+            last_amount = grouped['Dividend'].last()
+            gap = dividends['Date'].diff().where(dividends['Symbol'].eq(dividends['Symbol'].shift()))
+            median_gap = gap.groupby(dividends['Symbol']).median()
+            next_date = (last_date + median_gap.where(median_gap >= pd.Timedelta(days=60))).dt.normalize()
+
+            table = pd.DataFrame({
+                'Temettü Verimi (%)': latest_yield.reindex(symbols).to_numpy(),
+                'Son Temettü': last_amount.reindex(symbols).to_numpy(),
+                'Son Temettü Tarihi': last_date.reindex(symbols).to_numpy(),
+                'Tahmini Sonraki Tarih': next_date.reindex(symbols).to_numpy(),
+                'Ödeme Yılı': paid_years,
+                'Düzenlilik (%)': paid_years / years * 100,
+                'Kesintisiz Ödeme Yılı': streak,
+                'Artış Yılı': growth_years,
+                f'{years} Yıllık Temettü Büyümesi (%)': cagr,
+            }, index=pd.Index(symbols, name='Symbol'))
+            return table
+
+        except Exception as e:
+            st.error(f"Temettü analizi hatası: {str(e)}")
+            return pd.DataFrame()
+
+    def calendar(self, close: pd.DataFrame, start: Optional[pd.Timestamp] = None,
+                 end: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        """Hak kullanım takvimi: tarih aralığındaki ödemeler ve önceki kapanışa göre verim"""
+        columns = ['Date', 'Symbol', 'Dividend', 'Yield']
+        dividends = self.dividends[self.dividends['Symbol'].isin(close.columns)]
+        if start is not None:
+            dividends = dividends[dividends['Date'] >= pd.Timestamp(start)]
+        if end is not None:
+            dividends = dividends[dividends['Date'] <= pd.Timestamp(end)]
+        if dividends.empty:
+            return pd.DataFrame(columns=columns)
+
+        # Hak kullanım tarihinden önceki son kapanış: searchsorted ile tek seferde
+        rows = close.index.searchsorted(pd.DatetimeIndex(dividends['Date'])) - 1
+        cols = close.columns.get_indexer(dividends['Symbol'])
+        values = close.to_numpy(dtype=np.float64)
+        previous_close = np.where(rows >= 0, values[np.maximum(rows, 0), cols], np.nan)
+
+        calendar = dividends.assign(Yield=dividends['Dividend'].to_numpy() / previous_close * 100)
+        return calendar[columns].sort_values(['Date', 'Symbol'], ignore_index=True)
+
+    def screen(self, close: pd.DataFrame, min_yield: float = 4.0, min_consistency: float = 80.0) -> pd.DataFrame:
+        """Verim ve düzenlilik eşiklerini geçen semboller (verime göre sıralı)"""
+        table = self.analytics(close)
+        if table.empty:
+            return table
+        selected = table[(table['Temettü Verimi (%)'] >= min_yield) & (table['Düzenlilik (%)'] >= min_consistency)]
+        return selected.sort_values('Temettü Verimi (%)', ascending=False)
+
+
+@st.cache_resource
+def get_dividend_store() -> DividendStore:
+    """Oturumlar arasında paylaşılan temettü deposu"""
+    return DividendStore()
@@ -0,0 +1,124 @@
+import pandas as pd
+import numpy as np
+from typing import Optional
+
+# İz başına varsayılan nokta bütçesi (grafik genişliğinde piksel başına ~1-2 nokta)
+DEFAULT_POINT_BUDGET = 500
+
+
+def bucket_starts(length: int, max_points: Optional[int]) -> Optional[np.ndarray]:
+    """Eşit boyutlu kovaların başlangıç konumları; bütçe aşılmıyorsa None"""
+    if not max_points or length <= max_points:
+        return None
+    size = -(-length // max_points)  # Yukarı yuvarlanmış kova boyutu
+    return np.arange(0, length, size)
+
+
+def downsample_ohlc(data: pd.DataFrame, max_points: Optional[int] = DEFAULT_POINT_BUDGET) -> pd.DataFrame:
+    """OHLCV verisini kovalara toplar: ilk açılış, en yüksek, en düşük, son kapanış, toplam hacim
+
+    Kova tarihi ilk barın tarihidir. Diğer sütunlar kovanın son değerini alır.
+    """
+    starts = bucket_starts(len(data), max_points)
+    if starts is None:
+        return data
+
+    last = np.append(starts[1:], len(data)) - 1
+    buckets = {}
+    for column in data.columns:
+        values = data[column].to_numpy(dtype=np.float64)
+        if column == 'Open':
+            buckets[column] = values[starts]
+        elif column == 'High':
+            buckets[column] = np.fmax.reduceat(values, starts)
+        elif column == 'Low':
+            buckets[column] = np.fmin.reduceat(values, starts)
+        elif column == 'Volume':
+            buckets[column] = np.add.reduceat(np.nan_to_num(values), starts)
+        else:
+            buckets[column] = values[last]
+
+    return pd.DataFrame(buckets, index=data.index[starts])
+
+
+def downsample_bars(series: pd.Series, max_points: Optional[int] = DEFAULT_POINT_BUDGET,
+                    how: str = 'extreme') -> pd.Series:
+    """Çubuk serisini (histogram, hacim) downsample_ohlc ile aynı kovalara indirger
+
+    how='sum' kova toplamı, how='extreme' mutlak değeri en büyük değeri verir
+    (histogram tepe noktaları korunur).
+    """
+    starts = bucket_starts(len(series), max_points)
+    if starts is None:
+        return series
+
+    values = np.nan_to_num(series.to_numpy(dtype=np.float64))
+    if how == 'sum':
+        reduced = np.add.reduceat(values, starts)
+    else:
+        # Kova içi mutlak en büyük: konumlar kova kimliği ile sıralanıp son eleman alınır
+        bucket = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, len(values))))
+        order = np.lexsort((np.abs(values), bucket))
+        last = np.append(starts[1:], len(values)) - 1
+        reduced = values[order[last]]
+
+    return pd.Series(reduced, index=series.index[starts], name=series.name)
+
+
+def lttb_indices(values: np.ndarray, max_points: Optional[int] = DEFAULT_POINT_BUDGET) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets ile seçilen nokta konumları
+
+    x ekseni olarak bar sırası kullanılır (işlem günleri eşit aralıklı kabul
+    edilir). Sonraki kova ortalamaları kümülatif toplamlardan tek seferde
+    hesaplanır; seçim bir önceki noktaya bağlı olduğundan yalnızca kova
+    döngüsü ardışıktır.
+    """
+    length = len(values)
+    if not max_points or max_points < 3 or length <= max_points:
+        return np.arange(length)
+
+    values = np.asarray(values, dtype=np.float64)
+    positions = np.arange(length, dtype=np.float64)
+
+    # İlk ve son nokta sabit; aradaki noktalar max_points - 2 kovaya bölünür
+    edges = np.linspace(1, length - 1, max_points - 1).astype(np.int64)
+    next_start = edges[1:]
+    next_end = np.append(edges[2:], length)
+
+    cum_x = np.concatenate([[0.0], np.cumsum(positions)])
+    cum_y = np.concatenate([[0.0], np.cumsum(values)])
+    count = next_end - next_start
+    average_x = (cum_x[next_end] - cum_x[next_start]) / count
+    average_y = (cum_y[next_end] - cum_y[next_start]) / count
+
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0], selected[-1] = 0, length - 1
+    previous = 0
+    for bucket in range(max_points - 2):
+        low, high = edges[bucket], edges[bucket + 1]
+        anchor_x, anchor_y = positions[previous], values[previous]
+        area = np.abs((anchor_x - average_x[bucket]) * (values[low:high] - anchor_y) -
+                      (anchor_x - positions[low:high]) * (average_y[bucket] - anchor_y))
+        previous = low + int(np.argmax(area))
+        selected[bucket + 1] = previous
+
+    return selected
+
+
+def downsample_line(series: pd.Series, max_points: Optional[int] = DEFAULT_POINT_BUDGET) -> pd.Series:
+    """Çizgi serisini LTTB ile bütçeye indirger (baştaki NaN ısınma dönemi atlanır)"""
+    if not max_points or len(series) <= max_points:
+        return series
+
+    valid = series.dropna()
+    return valid.iloc[lttb_indices(valid.to_numpy(dtype=np.float64), max_points)]
+
+
+def downsample_band(reference: pd.Series, *bands: pd.Series,
+                    max_points: Optional[int] = DEFAULT_POINT_BUDGET) -> list:
+    """Bant serilerini (Bollinger alt/üst/orta) referans serinin LTTB noktalarında örnekler
+
+    Ortak noktalar, bantlar arasındaki dolgunun kaymamasını sağlar.
+    """
+    selected = downsample_line(reference, max_points)
+    return [band.reindex(selected.index) for band in bands]
@@ -1,8 +1,12 @@
 import yfinance as yf
 import pandas as pd
+import numpy as np
 from typing import Dict, Optional
 import streamlit as st
 
+from dcf_engine import dcf_values
+from fundamentals_table import PEER_FIELDS, get_fundamentals_table, get_peer_matrix
+
 class FundamentalAnalysis:
     """Temel analiz hesaplamaları için sınıf"""
     
@@ -129,32 +133,26 @@ class FundamentalAnalysis:
         return ratios
     
     def get_peer_comparison(self, sector_symbols: list) -> Dict:
-        """Sektör karşılaştırması yapar"""
+        """Sektör karşılaştırması yapar (saklanan akran matrisinden, ROE % cinsinden)"""
         try:
-            comparison_data = {}
-            
-            for symbol in sector_symbols:
-                try:
-                    ticker = yf.Ticker(symbol)
-                    info = ticker.info
-                    
-                    comparison_data[symbol] = {
-                        'P/E': info.get('trailingPE'),
-                        'P/B': info.get('priceToBook'),
-                        'ROE': info.get('returnOnEquity'),
-                        'Piyasa Değeri': info.get('marketCap')
-                    }
-                except:
-                    continue
+            peers = get_peer_matrix(get_fundamentals_table().last_updated)
+            peers = peers.reindex(sector_symbols)[list(PEER_FIELDS)].dropna(how='all')
             
-            return comparison_data
+            return {symbol: {key: (None if pd.isna(value) else float(value)) for key, value in row.items()}
+                    for symbol, row in peers.iterrows()}
             
         except Exception as e:
             st.error(f"Sektör karşılaştırma hatası: {str(e)}")
             return {}
     
-    def calculate_intrinsic_value(self) -> Optional[float]:
-        """İçsel değer tahmini yapar (DCF yöntemi ile basit)"""
+    def calculate_intrinsic_value(self, growth_rate: float = 0.05, discount_rate: float = 0.10,
+                                  terminal_growth: float = 0.03) -> Optional[float]:
+        """İçsel değer tahmini yapar (5 yıllık DCF, dcf_engine ile aynı hesap)
+
+        Serbest nakit akışı ya da hisse adedi eksik veya sıfırdan küçük/eşitse
+        ya da iskonto oranı terminal büyümeyi aşmıyorsa None döner; negatif nakit
+        akışının iskontolanması anlamlı bir hisse başı değer vermez.
+        """
         try:
             info = self.ticker.info
             
@@ -165,28 +163,10 @@ class FundamentalAnalysis:
             if not free_cashflow or not shares_outstanding:
                 return None
             
-            # Basit DCF hesaplaması (varsayımsal büyüme oranları ile)
-            growth_rate = 0.05  # %5 büyüme varsayımı
-            discount_rate = 0.10  # %10 iskonto oranı
-            terminal_growth = 0.03  # %3 terminal büyüme
-            
-            # 5 yıllık projeksiyon
-            projected_fcf = []
-            for year in range(1, 6):
-                fcf = free_cashflow * ((1 + growth_rate) ** year)
-                pv_fcf = fcf / ((1 + discount_rate) ** year)
-                projected_fcf.append(pv_fcf)
-            
-            # Terminal değer
-            terminal_fcf = projected_fcf[-1] * (1 + terminal_growth)
-            terminal_value = terminal_fcf / (discount_rate - terminal_growth)
-            pv_terminal = terminal_value / ((1 + discount_rate) ** 5)
-            
-            # Toplam değer
-            total_value = sum(projected_fcf) + pv_terminal
-            intrinsic_value_per_share = total_value / shares_outstanding
+            value = dcf_values(np.array([free_cashflow]), np.array([shares_outstanding]),
+                               [growth_rate], [discount_rate], [terminal_growth], years=5)[0, 0, 0, 0]
             
-            return intrinsic_value_per_share
+            return None if np.isnan(value) else float(value)
             
         except Exception as e:
             st.error(f"İçsel değer hesaplama hatası: {str(e)}")
@@ -242,8 +222,10 @@ class FundamentalAnalysis:
                 "PEG Oranı": fundamentals.get("PEG Oranı")
             }
             
-            # Değerleme yorumu
-            if current_price and intrinsic_value:
+            # Değerleme yorumu (DCF uygulanamıyorsa yorum yapılmaz)
+            if intrinsic_value is None:
+                valuation["Değerleme"] = "DCF Uygulanamaz"
+            elif current_price:
                 if current_price < intrinsic_value * 0.9:
                     valuation["Değerleme"] = "Düşük Değerli"
                 elif current_price > intrinsic_value * 1.1:
@@ -0,0 +1,161 @@
+import os
+import pandas as pd
+import numpy as np
+import yfinance as yf
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import streamlit as st
+
+from data_fetcher import DataFetcher
+from market_store import CACHE_DIR, refresh_stale, save_pickle
+
+# Sabit şema: sütun anahtarı -> (ticker.info anahtarı, Türkçe etiket)
+# Etiketler FundamentalAnalysis.get_fundamental_metrics ile aynıdır
+FUNDAMENTAL_FIELDS = {
+    'Market_Cap': ("marketCap", "Piyasa Değeri"),
+    'PE': ("trailingPE", "P/E Oranı"),
+    'PB': ("priceToBook", "P/B Oranı"),
+    'Dividend_Yield': ("dividendYield", "Temettü Verimi"),
+    'Beta': ("beta", "Beta"),
+    'ROE': ("returnOnEquity", "ROE (%)"),
+    'ROA': ("returnOnAssets", "ROA (%)"),
+    'Debt_Equity': ("debtToEquity", "Borç/Özkaynak"),
+    'Current_Ratio': ("currentRatio", "Cari Oran"),
+    'Quick_Ratio': ("quickRatio", "Hızlı Oran"),
+    'Gross_Margin': ("grossMargins", "Brüt Kar Marjı (%)"),
+    'EBITDA_Margin': ("ebitdaMargins", "EBITDA Marjı (%)"),
+    'Net_Margin': ("profitMargins", "Net Kar Marjı (%)"),
+    'EPS': ("trailingEps", "Hisse Başı Kazanç"),
+    'Forward_EPS': ("forwardEps", "Gelecek Yıl EPS"),
+    'PEG': ("pegRatio", "PEG Oranı"),
+    'High_52W': ("fiftyTwoWeekHigh", "52 Hafta En Yüksek"),
+    'Low_52W': ("fiftyTwoWeekLow", "52 Hafta En Düşük"),
+    'Avg_Volume': ("averageVolume", "Ortalama Hacim"),
+    'PS': ("priceToSalesTrailing12Months", "Piyasa Değeri/Gelir"),
+    'Enterprise_Value': ("enterpriseValue", "Kurumsal Değer"),
+    'EV_EBITDA': ("enterpriseToEbitda", "KD/EBITDA"),
+    'Total_Cash': ("totalCash", "Nakit ve Nakit Benzerleri"),
+    'Total_Debt': ("totalDebt", "Toplam Borç"),
+    'Free_Cashflow': ("freeCashflow", "Serbest Nakit Akışı"),
+    'Operating_Cashflow': ("operatingCashflow", "Operasyonel Nakit Akışı"),
+    'Shares_Outstanding': ("sharesOutstanding", "Dolaşımdaki Hisse"),
+    'Payout_Ratio': ("payoutRatio", "Temettü Oranı"),
+    'Price': ("currentPrice", "Mevcut Fiyat"),
+}
+
+# Akran matrisi: get_peer_comparison / create_sector_analysis_chart anahtarları -> sütun anahtarı
+PEER_FIELDS = {'P/E': 'PE', 'P/B': 'PB', 'ROE': 'ROE', 'Piyasa Değeri': 'Market_Cap'}
+
+
+def fetch_fundamentals(symbol: str) -> Dict[str, float]:
+    """Tek sembol için sabit şemalı temel veri satırı (eksik ya da sayısal olmayan değerler NaN)"""
+    info = yf.Ticker(symbol).info or {}
+    row = {}
+    for key, (info_key, _) in FUNDAMENTAL_FIELDS.items():
+        value = info.get(info_key)
+        row[key] = float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else np.nan
+    return row
+
+
+class FundamentalsTable:
+    """Evrenin temel verilerini sabit şemalı sütunlu tabloda tutan sınıf
+
+    Veriler sınırlı boyutlu bir iş parçacığı havuzuyla eşzamanlı çekilir
+    (ağ beklemesi baskın olduğu için süreç yerine iş parçacığı). Tablo
+    diskte saklanır; yalnızca süresi dolan semboller yeniden çekilir.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, data_fetcher: Optional[DataFetcher] = None):
+        self.data_fetcher = data_fetcher or DataFetcher()
+        self.path = os.path.join(cache_dir or CACHE_DIR, "fundamentals.pkl")
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.table = pd.read_pickle(self.path) if os.path.exists(self.path) else self._empty()
+
+    @staticmethod
+    def _empty() -> pd.DataFrame:
+        table = pd.DataFrame(columns=list(FUNDAMENTAL_FIELDS) + ['Sector', 'Updated'], dtype=np.float64)
+        return table.astype({'Sector': object, 'Updated': 'datetime64[ns]'}).rename_axis('Symbol')
+
+    def refresh(self, symbols: Optional[List[str]] = None, max_workers: int = 8,
+                max_age_hours: float = 24, force: bool = False) -> List[str]:
+        """Süresi dolan sembollerin temel verilerini eşzamanlı çeker; güncellenenleri döndürür"""
+        return refresh_stale("Temel veri tablosu", fetch_fundamentals, self._merge, self.table['Updated'],
+                             self.data_fetcher, symbols, timedelta(hours=max_age_hours), force, max_workers)
+
+    def _merge(self, rows: Dict[str, Dict[str, float]]):
+        """Çekilen satırlar aynı sembolün eski satırının yerine geçer"""
+        sectors = {c['symbol']: c['sector'] for c in self.data_fetcher.get_bist100_companies()}
+        updates = pd.DataFrame.from_dict(rows, orient='index').reindex(columns=list(FUNDAMENTAL_FIELDS))
+        updates = updates.astype(np.float64)
+        updates['Sector'] = [sectors.get(s, "Diğer") for s in updates.index]
+        updates['Updated'] = pd.Timestamp(datetime.now())
+
+        table = self.table.drop(index=updates.index, errors='ignore')
+        self.table = pd.concat([table, updates]).sort_index().rename_axis('Symbol') if not table.empty \
+            else updates.sort_index().rename_axis('Symbol')
+        save_pickle(self.table, self.path)
+
+    @property
+    def last_updated(self) -> str:
+        """Tablodaki en son güncelleme zamanı (boş tabloda boş metin)"""
+        return "" if self.table.empty else str(self.table['Updated'].max())
+
+    def sector_percentiles(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Sektör içi yüzdelik sıralar (0-100, büyük değer yüksek yüzdelik); '<sütun>_Pct' sütunları"""
+        columns = columns or list(FUNDAMENTAL_FIELDS)
+        if self.table.empty:
+            return pd.DataFrame(columns=[f"{c}_Pct" for c in columns])
+
+        ranks = self.table.groupby('Sector')[columns].rank(pct=True) * 100
+        return ranks.add_suffix('_Pct')
+
+    def with_percentiles(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Ham değerler ve sektör yüzdelikleri birlikte (tarama sorguları için)"""
+        return self.table.join(self.sector_percentiles(columns))
+
+    def screen(self, condition: str) -> pd.DataFrame:
+        """DataFrame.query ile değer taraması, örn. "PE < 8 and ROE_Pct > 75" """
+        try:
+            return self.with_percentiles().query(condition)
+        except Exception as e:
+            st.error(f"Temel veri tarama hatası: {str(e)}")
+            return pd.DataFrame()
+
+    def peer_matrix(self, sector: Optional[str] = None) -> pd.DataFrame:
+        """Sektör akran matrisi: P/E, P/B, ROE (%), piyasa değeri ve sektör medyanları
+
+        Sütunlar get_peer_comparison anahtarlarıyla aynıdır; medyanlar
+        'Sektör Medyan <anahtar>' sütunlarında her satıra yayınlanır.
+        """
+        columns = ['Sektör'] + list(PEER_FIELDS) + [f"Sektör Medyan {key}" for key in PEER_FIELDS]
+        table = self.table if sector is None else self.table[self.table['Sector'] == sector]
+        if table.empty:
+            return pd.DataFrame(columns=columns)
+
+        matrix = table[list(PEER_FIELDS.values())].set_axis(list(PEER_FIELDS), axis=1)
+        matrix['ROE'] = matrix['ROE'] * 100
+        medians = matrix.groupby(table['Sector']).transform('median')
+        matrix = matrix.join(medians.add_prefix("Sektör Medyan "))
+        matrix.insert(0, 'Sektör', table['Sector'])
+        return matrix[columns]
+
+    @staticmethod
+    def to_display(table: pd.DataFrame) -> pd.DataFrame:
+        """Sütun anahtarlarını Türkçe etiketlere çevirir"""
+        return table.rename(columns={key: label for key, (_, label) in FUNDAMENTAL_FIELDS.items()})
+
+
+@st.cache_resource
+def get_fundamentals_table() -> FundamentalsTable:
+    """Oturumlar arasında paylaşılan temel veri tablosu"""
+    return FundamentalsTable()
+
+
+@st.cache_data(show_spinner=False)
+def get_peer_matrix(updated: str) -> pd.DataFrame:
+    """Diskteki temel veri tablosundan akran matrisi; ağ çağrısı yapmaz
+
+    updated yalnızca önbellek anahtarıdır (FundamentalsTable.last_updated);
+    tablo yenilendiğinde anahtar değişir. Yenileme açıkça refresh ile yapılır.
+    """
+    return get_fundamentals_table().peer_matrix()
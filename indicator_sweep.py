@@ -0,0 +1,228 @@
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional, Union
+
+
+class SweepResult:
+    """Parametre taraması sonucu: (tarih × parametre × sembol) küp"""
+
+    def __init__(self, values: np.ndarray, index: pd.Index, params: np.ndarray, symbols: List[str]):
+        self.values = values
+        self.index = index
+        self.params = params
+        self.symbols = symbols
+
+    @property
+    def shape(self) -> tuple:
+        return self.values.shape
+
+    def to_frame(self, param: int) -> pd.DataFrame:
+        """Tek bir parametre değeri için tarih × sembol tablosu döndürür"""
+        positions = np.flatnonzero(self.params == param)
+        if len(positions) == 0:
+            raise KeyError(f"Parametre taramada yok: {param}")
+
+        return pd.DataFrame(self.values[:, positions[0], :], index=self.index, columns=self.symbols)
+
+    def for_symbol(self, symbol: str) -> pd.DataFrame:
+        """Tek bir sembol için tarih × parametre tablosu döndürür"""
+        position = self.symbols.index(symbol)
+        return pd.DataFrame(self.values[:, :, position], index=self.index, columns=self.params)
+
+    def latest(self) -> pd.DataFrame:
+        """Son bar için parametre × sembol tablosu döndürür"""
+        return pd.DataFrame(self.values[-1], index=self.params, columns=self.symbols)
+
+
+class IndicatorSweep:
+    """İndikatörleri bir parametre aralığı için tek geçişte hesaplayan sınıf
+
+    Kümülatif toplamlar bir kez hesaplanır ve tüm pencere uzunlukları için
+    paylaşılır; her periyot için ayrı rolling çağrısı yapılmaz. Sonuçlar
+    TechnicalAnalysis içindeki tek parametreli hesaplamalarla aynı tanımları
+    kullanır (basit ortalamalı RSI, örneklem standart sapmalı Bollinger).
+
+    Periyotlar, (tarih × periyot × sembol) ara küpleri CHUNK_CELLS hücreyi
+    aşmayacak şekilde parçalar halinde hesaplanır; bellekte yalnızca sonuç
+    küpü tam boyutta tutulur. Geniş evren ve uzun periyot aralıklarında
+    dtype=np.float32 sonuç küpünü yarıya indirir.
+    """
+
+    CHUNK_CELLS = 2 ** 22
+
+    def __init__(self, close: Union[pd.Series, pd.DataFrame], dtype=np.float64):
+        if isinstance(close, pd.Series):
+            close = close.to_frame(name=close.name or "Close")
+
+        self.index = close.index
+        self.symbols = [str(column) for column in close.columns]
+        self.dtype = dtype
+        self._close = close.to_numpy(dtype=np.float64, na_value=np.nan)
+        self._cache = {}
+
+    # --- Paylaşılan ara sonuçlar ---
+
+    @staticmethod
+    def _padded_cumsum(values: np.ndarray) -> np.ndarray:
+        """Başına sıfır satırı eklenmiş kümülatif toplam döndürür"""
+        result = np.zeros((values.shape[0] + 1, values.shape[1]), dtype=np.float64)
+        np.cumsum(values, axis=0, out=result[1:])
+        return result
+
+    def _shared(self, name: str) -> np.ndarray:
+        """Kümülatif toplamları bir kez hesaplayıp önbelleğe alır"""
+        if name in self._cache:
+            return self._cache[name]
+
+        close = self._close
+        valid = ~np.isnan(close)
+
+        if name == 'offset':
+            # Sayısal kayıpları azaltmak için her sembol ilk geçerli fiyatına göre ortalanır
+            first_valid = np.where(valid.any(axis=0), np.argmax(valid, axis=0), 0)
+            value = close[first_valid, np.arange(close.shape[1])]
+            value = np.where(np.isnan(value), 0.0, value)
+        elif name == 'count':
+            value = self._padded_cumsum(valid.astype(np.float64))
+        elif name == 'sum':
+            centered = np.where(valid, close - self._shared('offset'), 0.0)
+            value = self._padded_cumsum(centered)
+        elif name == 'sum_sq':
+            centered = np.where(valid, close - self._shared('offset'), 0.0)
+            value = self._padded_cumsum(centered * centered)
+        elif name == 'delta':
+            delta = np.diff(close, axis=0, prepend=np.nan)
+            # TechnicalAnalysis.calculate_rsi ile aynı: eksik fark 0 sayılır
+            value = np.where(np.isnan(delta), 0.0, delta)
+        elif name in ('gain', 'loss'):
+            delta = self._shared('delta')
+            part = np.maximum(delta, 0.0) if name == 'gain' else np.maximum(-delta, 0.0)
+            value = self._padded_cumsum(part)
+        elif name in ('gain_days', 'loss_days'):
+            # Pencerede hiç artış/düşüş yoksa ortalama tam sıfır olmalı (0/0 -> NaN, calculate_rsi gibi)
+            delta = self._shared('delta')
+            moved = delta > 0 if name == 'gain_days' else delta < 0
+            value = self._padded_cumsum(moved.astype(np.float64))
+        else:
+            raise KeyError(name)
+
+        self._cache[name] = value
+        return value
+
+    def _window_bounds(self, periods: np.ndarray) -> tuple:
+        """Her (tarih, periyot) için kümülatif toplam uç indekslerini döndürür"""
+        ends = np.arange(1, len(self.index) + 1)[:, None]
+        starts = ends - periods[None, :]
+        in_range = starts >= 0
+        return ends, np.clip(starts, 0, None), in_range
+
+    def _window_sum(self, name: str, periods: np.ndarray) -> np.ndarray:
+        """Tüm periyotlar için pencere toplamlarını (tarih × periyot × sembol) döndürür"""
+        cumulative = self._shared(name)
+        ends, starts, _ = self._window_bounds(periods)
+        return cumulative[ends[:, 0]][:, None, :] - cumulative[starts]
+
+    def _full_window_mask(self, periods: np.ndarray) -> np.ndarray:
+        """Penceredeki tüm fiyatların geçerli olduğu konumları işaretler"""
+        _, _, in_range = self._window_bounds(periods)
+        counts = self._window_sum('count', periods)
+        return in_range[:, :, None] & (counts >= periods[None, :, None] - 0.5)
+
+    @staticmethod
+    def _as_periods(periods) -> np.ndarray:
+        periods = np.unique(np.asarray(list(periods), dtype=np.int64))
+        if len(periods) == 0 or periods.min() < 1:
+            raise ValueError("Periyotlar pozitif tam sayı olmalıdır")
+        return periods
+
+    def _result(self, values: np.ndarray, periods: np.ndarray) -> SweepResult:
+        return SweepResult(values.astype(self.dtype, copy=False), self.index, periods, self.symbols)
+
+    def _chunked(self, periods: np.ndarray, compute) -> Dict[str, np.ndarray]:
+        """compute(parça) sonuçlarını periyot parçaları üzerinden sonuç küplerine yazar"""
+        step = max(1, self.CHUNK_CELLS // max(len(self.index) * len(self.symbols), 1))
+        outputs = {}
+        for start in range(0, len(periods), step):
+            chunk = periods[start:start + step]
+            for name, values in compute(chunk).items():
+                if name not in outputs:
+                    outputs[name] = np.empty((len(self.index), len(periods), len(self.symbols)), dtype=self.dtype)
+                outputs[name][:, start:start + len(chunk), :] = values
+        return outputs
+
+    # --- İndikatör taramaları ---
+
+    def moving_averages(self, periods=range(5, 251)) -> SweepResult:
+        """Tüm periyotlar için basit hareketli ortalamaları hesaplar"""
+        periods = self._as_periods(periods)
+        return self._result(self._chunked(periods, self._moving_average_chunk)['MA'], periods)
+
+    def _moving_average_chunk(self, periods: np.ndarray) -> Dict[str, np.ndarray]:
+        window_sum = self._window_sum('sum', periods)
+        means = window_sum / periods[None, :, None] + self._shared('offset')[None, None, :]
+        means[~self._full_window_mask(periods)] = np.nan
+        return {'MA': means}
+
+    def rsi(self, periods=range(2, 51)) -> SweepResult:
+        """Tüm periyotlar için RSI hesaplar
+
+        TechnicalAnalysis.calculate_rsi ile aynı NaN yerleşimi: eksik fiyatlar
+        farkı 0 yapar, pencere yalnızca ilk 'periyot' bar boyunca boştur.
+        """
+        periods = self._as_periods(periods)
+        return self._result(self._chunked(periods, self._rsi_chunk)['RSI'], periods)
+
+    def _rsi_chunk(self, periods: np.ndarray) -> Dict[str, np.ndarray]:
+        gain = self._window_sum('gain', periods)
+        loss = self._window_sum('loss', periods)
+        gain[self._window_sum('gain_days', periods) < 0.5] = 0.0
+        loss[self._window_sum('loss_days', periods) < 0.5] = 0.0
+
+        # Ortalamadaki 1/periyot çarpanı oranda sadeleşir
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = 100 - (100 / (1 + gain / loss))
+        _, _, in_range = self._window_bounds(periods)
+        rsi[~np.broadcast_to(in_range[:, :, None], rsi.shape)] = np.nan
+        return {'RSI': rsi}
+
+    def bollinger_bands(self, periods=range(10, 51), std_dev: float = 2) -> Dict[str, SweepResult]:
+        """Tüm periyotlar için Bollinger bantlarını hesaplar"""
+        periods = self._as_periods(periods)
+        bands = self._chunked(periods, lambda chunk: self._bollinger_chunk(chunk, std_dev))
+        return {name: self._result(values, periods) for name, values in bands.items()}
+
+    def _bollinger_chunk(self, periods: np.ndarray, std_dev: float) -> Dict[str, np.ndarray]:
+        window_sum = self._window_sum('sum', periods)
+        window_sum_sq = self._window_sum('sum_sq', periods)
+        n = periods[None, :, None].astype(np.float64)
+
+        centered_mean = window_sum / n
+        with np.errstate(divide='ignore', invalid='ignore'):
+            variance = (window_sum_sq - n * centered_mean * centered_mean) / (n - 1)
+        std = np.sqrt(np.clip(variance, 0.0, None))
+
+        middle = centered_mean + self._shared('offset')[None, None, :]
+        invalid = ~self._full_window_mask(periods) | (n < 2)
+        middle[invalid] = np.nan
+        std[invalid] = np.nan
+
+        return {
+            'BB_Upper': middle + std * std_dev,
+            'BB_Middle': middle,
+            'BB_Lower': middle - std * std_dev
+        }
+
+
+def sweep_indicator(close: Union[pd.Series, pd.DataFrame], indicator: str,
+                    periods, dtype=np.float64, **kwargs) -> Optional[Union[SweepResult, Dict]]:
+    """İsimle verilen indikatör için parametre taraması yapar"""
+    sweep = IndicatorSweep(close, dtype=dtype)
+
+    if indicator == 'MA':
+        return sweep.moving_averages(periods)
+    if indicator == 'RSI':
+        return sweep.rsi(periods)
+    if indicator == 'BB':
+        return sweep.bollinger_bands(periods, **kwargs)
+
+    return None
@@ -0,0 +1,213 @@
+import os
+import json
+import threading
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Mapping, Optional
+import streamlit as st
+
+from data_fetcher import DataFetcher
+
+BENCHMARK_SYMBOL = "XU100.IS"
+CACHE_DIR = os.environ.get("BIST_CACHE_DIR", ".bist_cache")
+PANEL_FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+class MarketDataStore:
+    """Evren OHLCV panellerini diskte saklayan ve artımlı güncelleyen sınıf"""
+
+    def __init__(self, cache_dir: Optional[str] = None, data_fetcher: Optional[DataFetcher] = None):
+        self.cache_dir = cache_dir or CACHE_DIR
+        self.data_fetcher = data_fetcher or DataFetcher()
+        self.panels = {}
+        self.meta = {}
+        # Sayfa ve arka plan zamanlayıcısı aynı depoyu güncelleyebilir; yenilemeler sıralanır
+        self.lock = threading.RLock()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._load()
+
+    # --- Disk işlemleri ---
+
+    def _panel_path(self, field: str) -> str:
+        return os.path.join(self.cache_dir, f"panel_{field.lower()}.pkl")
+
+    def _meta_path(self) -> str:
+        return os.path.join(self.cache_dir, "panel_meta.json")
+
+    def _load(self):
+        """Diskteki panelleri belleğe yükler"""
+        for field in PANEL_FIELDS:
+            path = self._panel_path(field)
+            if os.path.exists(path):
+                self.panels[field] = pd.read_pickle(path)
+
+        if os.path.exists(self._meta_path()):
+            with open(self._meta_path(), encoding='utf-8') as f:
+                self.meta = json.load(f)
+
+    def _save(self):
+        """Panelleri ve meta bilgiyi diske yazar (geçici dosya + os.replace ile atomik)"""
+        for field, panel in self.panels.items():
+            temp_path = self._panel_path(field) + ".tmp"
+            panel.to_pickle(temp_path)
+            os.replace(temp_path, self._panel_path(field))
+
+        temp_path = self._meta_path() + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self._meta_path())
+
+    # --- Güncelleme ---
+
+    @property
+    def symbols(self) -> List[str]:
+        close = self.panels.get('Close')
+        return [] if close is None else list(close.columns)
+
+    @property
+    def last_date(self) -> Optional[pd.Timestamp]:
+        close = self.panels.get('Close')
+        return None if close is None or close.empty else close.index[-1]
+
+    def _merge(self, new_panels: Dict[str, pd.DataFrame]):
+        """Yeni barları mevcut panellerle birleştirir (yeni veri önceliklidir)"""
+        for field, new_panel in new_panels.items():
+            new_panel = new_panel.dropna(how='all')
+            if field not in self.panels:
+                self.panels[field] = new_panel.sort_index()
+                continue
+
+            merged = new_panel.combine_first(self.panels[field])
+            self.panels[field] = merged.sort_index()
+
+    def refresh(self, symbols: Optional[List[str]] = None, period: str = "10y",
+                overlap_days: int = 5, raise_errors: bool = False) -> bool:
+        """Paneli artımlı olarak günceller; yalnızca eksik barlar indirilir
+
+        raise_errors=True iken hata st.error yerine çağırana iletilir (arka plan iş parçacıkları için).
+        """
+        try:
+            with self.lock:
+                return self._refresh(symbols, period, overlap_days)
+
+        except Exception as e:
+            if raise_errors:
+                raise
+            st.error(f"Panel güncelleme hatası: {str(e)}")
+            return False
+
+    def _refresh(self, symbols: Optional[List[str]], period: str, overlap_days: int) -> bool:
+        if symbols is None:
+            symbols = self.data_fetcher.bist100_symbols
+        symbols = list(dict.fromkeys(list(symbols) + [BENCHMARK_SYMBOL]))
+
+        known = [s for s in symbols if s in self.symbols]
+        unknown = [s for s in symbols if s not in self.symbols]
+        updated = False
+
+        # Yeni semboller için tüm geçmiş
+        if unknown:
+            panel = self.data_fetcher.download_price_panel(unknown, period=period)
+            if panel:
+                self._merge(panel)
+                updated = True
+
+        # Bilinen semboller için son tarihten itibaren (düzeltmeler için birkaç gün örtüşmeli)
+        if known and self.last_date is not None:
+            start = (self.last_date - timedelta(days=overlap_days)).strftime("%Y-%m-%d")
+            panel = self.data_fetcher.download_price_panel(known, start=start)
+            if panel:
+                self._merge(panel)
+                updated = True
+
+        if updated:
+            self.meta['last_refresh'] = datetime.now().isoformat(timespec='seconds')
+            self.meta['last_date'] = str(self.last_date.date()) if self.last_date is not None else None
+            self._save()
+
+        return updated
+
+    # --- Okuma ---
+
+    def get_panel(self, field: str = 'Close', symbols: Optional[List[str]] = None) -> pd.DataFrame:
+        """Belirtilen alan için tarih × sembol paneli döndürür"""
+        panel = self.panels.get(field)
+        if panel is None:
+            return pd.DataFrame()
+
+        if symbols is not None:
+            panel = panel.reindex(columns=symbols)
+
+        return panel
+
+    def get_ohlcv(self, symbol: str) -> Optional[pd.DataFrame]:
+        """Tek bir sembol için get_stock_data ile aynı biçimde OHLCV döndürür"""
+        if symbol not in self.symbols:
+            return None
+
+        data = pd.DataFrame({field: self.panels[field][symbol] for field in PANEL_FIELDS if field in self.panels})
+        return data.dropna(subset=['Close'])
+
+    def get_returns(self, symbols: Optional[List[str]] = None) -> pd.DataFrame:
+        """Günlük basit getiri paneli döndürür"""
+        close = self.get_panel('Close', symbols)
+        if close.empty:
+            return close
+
+        return close.pct_change(fill_method=None).iloc[1:]
+
+
+def save_pickle(obj: Any, path: str):
+    """Nesneyi geçici dosya + os.replace ile atomik olarak pickle'lar"""
+    temp_path = path + ".tmp"
+    pd.to_pickle(obj, temp_path)
+    os.replace(temp_path, path)
+
+
+def refresh_stale(label: str, fetch: Callable[[str], Any], merge: Callable[[Dict[str, Any]], None],
+                  fetched_at: Mapping[str, Any], data_fetcher: DataFetcher,
+                  symbols: Optional[List[str]] = None, max_age: timedelta = timedelta(days=1),
+                  force: bool = False, max_workers: int = 8) -> List[str]:
+    """Süresi dolan sembolleri eşzamanlı çekip depoya işler; güncellenenleri döndürür
+
+    Sembol bazlı depoların (temel veri, mali tablo, temettü) ortak güncelleme
+    iskeleti. 'fetched_at' sembol -> son çekim zamanı eşlemesidir; fetch ağ
+    beklemesi baskın olduğu için iş parçacığı havuzunda çağrılır. Hata veren
+    semboller atlanır ve önceki değerlerini korur; merge yalnızca başarılı
+    sonuçlarla çağrılır, birleştirme ve kaydetme deponundur.
+    """
+    try:
+        if symbols is None:
+            symbols = [s for s in dict.fromkeys(data_fetcher.bist100_symbols) if s != BENCHMARK_SYMBOL]
+        cutoff = pd.Timestamp(datetime.now() - max_age)
+        pending = [s for s in symbols if force or pd.isna(fetched_at.get(s)) or fetched_at[s] < cutoff]
+        if not pending:
+            return []
+
+        def safe_fetch(symbol: str) -> Any:
+            try:
+                return fetch(symbol)
+            except Exception:
+                return None
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = dict(zip(pending, executor.map(safe_fetch, pending)))
+
+        results = {symbol: result for symbol, result in results.items() if result is not None}
+        if not results:
+            return []
+
+        merge(results)
+        return list(results)
+
+    except Exception as e:
+        st.error(f"{label} güncelleme hatası: {str(e)}")
+        return []
+
+
+@st.cache_resource
+def get_market_store() -> MarketDataStore:
+    """Uygulama genelinde paylaşılan panel deposunu döndürür"""
+    return MarketDataStore()
@@ -0,0 +1,133 @@
+import pandas as pd
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Union
+import streamlit as st
+
+
+def _simulate_chunk(daily_returns: np.ndarray, method: str, mu: float, sigma: float,
+                    horizon: int, size: int, seed: np.random.SeedSequence) -> Dict[str, np.ndarray]:
+    """Bir yol grubunu üretip vade sonu getirisi ve maksimum düşüşe indirger"""
+    rng = np.random.default_rng(seed)
+
+    if method == 'bootstrap':
+        paths = daily_returns[rng.integers(0, len(daily_returns), size=(size, horizon))]
+    else:
+        # Log getiriler normal dağılımlı varsayılır
+        paths = np.expm1(rng.normal(mu, sigma, size=(size, horizon)))
+
+    wealth = np.cumprod(1 + paths, axis=1)
+    peak = np.maximum(np.maximum.accumulate(wealth, axis=1), 1.0)
+
+    return {
+        'terminal': wealth[:, -1] - 1,
+        'max_drawdown': (wealth / peak - 1).min(axis=1),
+    }
+
+
+def _simulate_chunk_args(args: tuple) -> Dict[str, np.ndarray]:
+    return _simulate_chunk(*args)
+
+
+class MonteCarloSimulator:
+    """Tek hisse ya da portföy için parçalı Monte Carlo VaR / CVaR motoru
+
+    Yollar sabit boyutlu NumPy parçaları halinde üretilir ve her parça hemen
+    vade sonu getirisi ile maksimum düşüşe indirgenir; bellekte aynı anda
+    yalnızca bir parçanın yolları tutulur. Her parçanın kendi tohumu
+    olduğundan sonuçlar seri ve paralel çalıştırmada aynıdır.
+    """
+
+    def __init__(self, returns: Union[pd.Series, pd.DataFrame], weights: Optional[Union[Dict, pd.Series]] = None,
+                 method: str = 'bootstrap', horizon: int = 21, n_paths: int = 100_000,
+                 chunk_size: int = 10_000, seed: Optional[int] = None):
+        if method not in ('bootstrap', 'parametric'):
+            raise ValueError("method 'bootstrap' ya da 'parametric' olmalıdır")
+
+        self.method = method
+        self.horizon = horizon
+        self.n_paths = n_paths
+        self.chunk_size = chunk_size
+        self.seed = seed
+        self.daily_returns = self._portfolio_returns(returns, weights)
+
+    @staticmethod
+    def _portfolio_returns(returns: Union[pd.Series, pd.DataFrame],
+                           weights: Optional[Union[Dict, pd.Series]]) -> np.ndarray:
+        """Günlük portföy getirisini (sabit ağırlık, günlük dengelenmiş) hesaplar"""
+        if isinstance(returns, pd.Series):
+            return returns.dropna().to_numpy(dtype=np.float64)
+
+        if weights is None:
+            weights = pd.Series(1.0 / returns.shape[1], index=returns.columns)
+        weights = pd.Series(weights, dtype=float)
+        weights = weights / weights.sum()
+
+        # Ortak geçmiş: ağırlıklı tüm varlıkların işlem gördüğü günler
+        aligned = returns[weights.index].dropna()
+        return aligned.to_numpy(dtype=np.float64) @ weights.to_numpy()
+
+    def _chunks(self) -> List[tuple]:
+        """Parça argümanlarını (her biri kendi tohumuyla) üretir"""
+        sizes = [self.chunk_size] * (self.n_paths // self.chunk_size)
+        if self.n_paths % self.chunk_size:
+            sizes.append(self.n_paths % self.chunk_size)
+
+        seeds = np.random.SeedSequence(self.seed).spawn(len(sizes))
+        log_returns = np.log1p(self.daily_returns)
+        mu, sigma = float(log_returns.mean()), float(log_returns.std(ddof=1))
+
+        return [(self.daily_returns, self.method, mu, sigma, self.horizon, size, seed)
+                for size, seed in zip(sizes, seeds)]
+
+    def run(self, confidence_levels: tuple = (0.95, 0.99), n_jobs: Optional[int] = 1,
+            keep_distribution: bool = False) -> Dict:
+        """Simülasyonu çalıştırır; VaR, CVaR ve düşüş dağılımını döndürür
+
+        n_jobs=1 seri çalışır; None ya da >1 değerler süreç havuzunu kullanır.
+        Kayıplar pozitif yüzde olarak raporlanır.
+        """
+        try:
+            if len(self.daily_returns) < 2:
+                st.warning("Monte Carlo için yeterli getiri verisi yok")
+                return {}
+
+            chunks = self._chunks()
+            if n_jobs == 1:
+                results = [_simulate_chunk_args(args) for args in chunks]
+            else:
+                with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                    results = list(executor.map(_simulate_chunk_args, chunks))
+
+            terminal = np.concatenate([r['terminal'] for r in results])
+            max_drawdown = np.concatenate([r['max_drawdown'] for r in results])
+
+            summary = {
+                "Ufuk (Gün)": self.horizon,
+                "Yol Sayısı": len(terminal),
+                "Beklenen Getiri": terminal.mean() * 100,
+                "Zarar Olasılığı": (terminal < 0).mean() * 100,
+            }
+
+            sorted_terminal = np.sort(terminal)
+            for level in confidence_levels:
+                cutoff = max(int(np.floor((1 - level) * len(sorted_terminal))), 1)
+                var = -np.quantile(sorted_terminal, 1 - level)
+                cvar = -sorted_terminal[:cutoff].mean()
+                label = f"%{level * 100:g}"
+                summary[f"VaR {label}"] = var * 100
+                summary[f"CVaR {label}"] = cvar * 100
+
+            summary["Medyan Maks. Düşüş"] = np.median(max_drawdown) * 100
+            summary["Maks. Düşüş %95"] = np.quantile(max_drawdown, 0.05) * 100
+
+            result = {'summary': summary}
+            if keep_distribution:
+                result['terminal_returns'] = terminal
+                result['max_drawdowns'] = max_drawdown
+
+            return result
+
+        except Exception as e:
+            st.error(f"Monte Carlo simülasyon hatası: {str(e)}")
+            return {}
@@ -0,0 +1,243 @@
+import os
+import pickle
+import hashlib
+import itertools
+import pandas as pd
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+import streamlit as st
+
+from backtester import SignalBacktester, TRADING_DAYS
+
+# get_trading_signals içindeki sabit eşiklerin etrafında varsayılan arama uzayı
+DEFAULT_PARAM_GRID = {
+    'rsi_period': [7, 14, 21],
+    'rsi_levels': [(20, 80), (25, 75), (30, 70), (35, 65)],
+    'ma_pair': [(10, 30), (20, 50), (20, 100), (50, 200)],
+    'macd': [(8, 21, 5), (12, 26, 9), (19, 39, 9)],
+}
+
+# Süreç havuzundaki her işçinin kendi backtester'ı (indikatör önbelleği işçi başına tutulur)
+_WORKER_BACKTESTER = None
+
+
+def _init_worker(close: pd.DataFrame, commission: float, slippage: float, long_only: bool):
+    global _WORKER_BACKTESTER
+    _WORKER_BACKTESTER = SignalBacktester(close, commission=commission, slippage=slippage,
+                                          long_only=long_only)
+
+
+def _fold_metrics(portfolio_returns: np.ndarray, folds: List[Tuple[int, int, int, int]]) -> Dict[str, np.ndarray]:
+    """Günlük portföy getirilerinden her katman için eğitim/test metriklerini hesaplar"""
+    padded = np.concatenate([[0.0], portfolio_returns])
+    csum = np.cumsum(padded)
+    csum_sq = np.cumsum(padded * padded)
+    log_growth = np.concatenate([[0.0], np.cumsum(np.log1p(np.maximum(portfolio_returns, -0.999999)))])
+
+    def window_stats(starts: np.ndarray, stops: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        n = stops - starts
+        mean = (csum[stops] - csum[starts]) / n
+        variance = (csum_sq[stops] - csum_sq[starts]) / n - mean * mean
+        std = np.sqrt(np.maximum(variance * n / np.maximum(n - 1, 1), 0.0))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sharpe = np.where(std > 0, mean / std * np.sqrt(TRADING_DAYS), 0.0)
+        total_return = np.exp(log_growth[stops] - log_growth[starts]) - 1
+        return sharpe, total_return
+
+    fold_array = np.asarray(folds)
+    train_sharpe, train_return = window_stats(fold_array[:, 0], fold_array[:, 1])
+    test_sharpe, test_return = window_stats(fold_array[:, 2], fold_array[:, 3])
+
+    return {
+        'train_sharpe': train_sharpe,
+        'train_return': train_return,
+        'test_sharpe': test_sharpe,
+        'test_return': test_return,
+    }
+
+
+def _evaluate_chunk(combos: List[Dict], folds: List[Tuple[int, int, int, int]]) -> List[Tuple[str, Dict]]:
+    """Bir parametre grubunu tüm katmanlar için değerlendirir (işçi sürecinde çalışır)"""
+    backtester = _WORKER_BACKTESTER
+    listed = ~np.isnan(backtester._close_values)
+    active = np.maximum(listed.sum(axis=1), 1)
+    results = []
+
+    for combo in combos:
+        states = backtester.rule_states(**combo)
+        held = backtester.positions(backtester.combine(states))
+        strategy_returns = backtester.strategy_returns(held)
+        portfolio_returns = np.where(listed, strategy_returns, 0.0).sum(axis=1) / active
+        results.append((combo_key(combo), _fold_metrics(portfolio_returns, folds)))
+
+    return results
+
+
+def combo_key(combo: Dict) -> str:
+    """Parametre kombinasyonu için sabit anahtar üretir"""
+    return repr(sorted(combo.items()))
+
+
+def is_valid_combo(combo: Dict) -> bool:
+    """Anlamsız kombinasyonları eler (kısa MA >= uzun MA gibi)"""
+    oversold, overbought = combo['rsi_levels']
+    short_ma, long_ma = combo['ma_pair']
+    fast, slow, _ = combo['macd']
+    return oversold < overbought and short_ma < long_ma and fast < slow
+
+
+class WalkForwardOptimizer:
+    """Sinyal kuralı eşikleri için kayan pencereli (walk-forward) parametre araması
+
+    Her kombinasyonun strateji getirisi tüm geçmiş üzerinde bir kez
+    hesaplanır ve bütün katmanlar bu seriden dilimlenir; böylece indikatör
+    ara sonuçları hem kombinasyonlar hem katmanlar arasında paylaşılır.
+    Kombinasyon grupları süreç havuzunda paralel çalışır ve tamamlanan
+    sonuçlar kontrol noktası dosyasına yazılarak yarıda kalan arama sürdürülebilir.
+    """
+
+    def __init__(self, close: pd.DataFrame, param_grid: Optional[Dict] = None,
+                 train_bars: int = 504, test_bars: int = 126, commission: float = 0.001,
+                 slippage: float = 0.0005, long_only: bool = True,
+                 checkpoint_path: Optional[str] = None):
+        if isinstance(close, pd.Series):
+            close = close.to_frame(name=close.name or "Close")
+
+        self.close = close
+        self.param_grid = param_grid or DEFAULT_PARAM_GRID
+        self.train_bars = train_bars
+        self.test_bars = test_bars
+        self.commission = commission
+        self.slippage = slippage
+        self.long_only = long_only
+        self.checkpoint_path = checkpoint_path
+        self.results = {}
+
+    def folds(self) -> List[Tuple[int, int, int, int]]:
+        """(eğitim başı, eğitim sonu, test başı, test sonu) satır aralıklarını üretir"""
+        folds = []
+        start = 0
+        total = len(self.close)
+        while start + self.train_bars + self.test_bars <= total:
+            train_end = start + self.train_bars
+            folds.append((start, train_end, train_end, train_end + self.test_bars))
+            start += self.test_bars
+        return folds
+
+    def candidates(self, search: str = 'grid', n_iter: int = 50, seed: Optional[int] = None) -> List[Dict]:
+        """Izgara ya da rastgele aramaya göre parametre kombinasyonlarını üretir"""
+        names = list(self.param_grid)
+        combos = [dict(zip(names, values)) for values in itertools.product(*self.param_grid.values())]
+        combos = [combo for combo in combos if is_valid_combo(combo)]
+
+        if search == 'random' and n_iter < len(combos):
+            rng = np.random.default_rng(seed)
+            chosen = np.sort(rng.choice(len(combos), size=n_iter, replace=False))
+            combos = [combos[i] for i in chosen]
+
+        return combos
+
+    # --- Kontrol noktası ---
+
+    def _signature(self, folds: List[Tuple[int, int, int, int]]) -> str:
+        """Veri ve ayarlar değişince eski kontrol noktasını geçersiz kılan imza"""
+        payload = repr((list(self.close.columns), str(self.close.index[0]), str(self.close.index[-1]),
+                        folds, self.commission, self.slippage, self.long_only))
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def _load_checkpoint(self, signature: str) -> Dict:
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return {}
+
+        with open(self.checkpoint_path, 'rb') as f:
+            checkpoint = pickle.load(f)
+
+        return checkpoint['results'] if checkpoint.get('signature') == signature else {}
+
+    def _save_checkpoint(self, signature: str):
+        if not self.checkpoint_path:
+            return
+
+        temp_path = self.checkpoint_path + ".tmp"
+        with open(temp_path, 'wb') as f:
+            pickle.dump({'signature': signature, 'results': self.results}, f)
+        os.replace(temp_path, self.checkpoint_path)
+
+    # --- Arama ---
+
+    def run(self, search: str = 'grid', n_iter: int = 50, seed: Optional[int] = None,
+            n_jobs: Optional[int] = None, chunk_size: int = 8) -> Dict:
+        """Aramayı çalıştırır ve katman bazında seçilen parametreleri döndürür"""
+        try:
+            folds = self.folds()
+            if not folds:
+                st.warning("Walk-forward için yeterli veri yok")
+                return {}
+
+            signature = self._signature(folds)
+            self.results = self._load_checkpoint(signature)
+
+            combos = self.candidates(search, n_iter, seed)
+            combo_by_key = {combo_key(combo): combo for combo in combos}
+            pending = [combo for key, combo in combo_by_key.items() if key not in self.results]
+            # Aynı indikatör parametrelerini paylaşan kombinasyonlar aynı grupta kalır
+            chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+
+            if chunks:
+                init_args = (self.close, self.commission, self.slippage, self.long_only)
+                if n_jobs == 1:
+                    _init_worker(*init_args)
+                    for chunk in chunks:
+                        self.results.update(_evaluate_chunk(chunk, folds))
+                        self._save_checkpoint(signature)
+                else:
+                    with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker,
+                                             initargs=init_args) as executor:
+                        futures = [executor.submit(_evaluate_chunk, chunk, folds) for chunk in chunks]
+                        for future in as_completed(futures):
+                            self.results.update(future.result())
+                            self._save_checkpoint(signature)
+
+            return self._summarize(combo_by_key, folds)
+
+        except Exception as e:
+            st.error(f"Parametre optimizasyonu hatası: {str(e)}")
+            return {}
+
+    def _summarize(self, combo_by_key: Dict[str, Dict], folds: List[Tuple[int, int, int, int]]) -> Dict:
+        """Her katmanda eğitimde en iyi kombinasyonu seçip test sonucunu raporlar"""
+        keys = [key for key in combo_by_key if key in self.results]
+        train_sharpe = np.array([self.results[key]['train_sharpe'] for key in keys])
+        test_sharpe = np.array([self.results[key]['test_sharpe'] for key in keys])
+        test_return = np.array([self.results[key]['test_return'] for key in keys])
+
+        best = np.argmax(np.where(np.isfinite(train_sharpe), train_sharpe, -np.inf), axis=0)
+        fold_positions = np.arange(len(folds))
+        index = self.close.index
+
+        fold_table = pd.DataFrame({
+            'Eğitim Başı': [index[f[0]] for f in folds],
+            'Eğitim Sonu': [index[f[1] - 1] for f in folds],
+            'Test Başı': [index[f[2]] for f in folds],
+            'Test Sonu': [index[f[3] - 1] for f in folds],
+            'Parametreler': [combo_by_key[keys[b]] for b in best],
+            'Eğitim Sharpe': train_sharpe[best, fold_positions],
+            'Test Sharpe': test_sharpe[best, fold_positions],
+            'Test Getirisi': test_return[best, fold_positions] * 100,
+        })
+
+        combo_table = pd.DataFrame({
+            'Parametreler': [combo_by_key[key] for key in keys],
+            'Ort. Eğitim Sharpe': np.nanmean(train_sharpe, axis=1),
+            'Ort. Test Sharpe': np.nanmean(test_sharpe, axis=1),
+            'Seçilme Sayısı': np.bincount(best, minlength=len(keys)),
+        }).sort_values('Ort. Test Sharpe', ascending=False, ignore_index=True)
+
+        out_of_sample = np.prod(1 + test_return[best, fold_positions]) - 1
+
+        return {
+            'folds': fold_table,
+            'combos': combo_table,
+            'out_of_sample_return': out_of_sample * 100,
+        }
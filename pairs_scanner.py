@@ -0,0 +1,199 @@
+import pandas as pd
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import streamlit as st
+
+from correlation_engine import CorrelationEngine
+from data_fetcher import DataFetcher
+from market_store import BENCHMARK_SYMBOL
+
+# Engle-Granger (iki değişken, sabitli) kritik değerleri, MacKinnon (2010)
+EG_CRITICAL_VALUES = {0.01: -3.90, 0.05: -3.34, 0.10: -3.04}
+
+# Sektörü bilinmeyen semboller için DataFetcher'ın yedek etiketi
+UNKNOWN_SECTOR = "Diğer"
+
+# Süreç havuzundaki her işçinin log fiyat matrisi
+_WORKER_LOG_PRICES = None
+
+
+def _init_worker(log_prices: np.ndarray):
+    global _WORKER_LOG_PRICES
+    _WORKER_LOG_PRICES = log_prices
+
+
+def _masked_ols(x: np.ndarray, y: np.ndarray, mask: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """Sütun bazında y = a + b·x regresyonu (yalnızca maskeli satırlar); a, b, n döndürür"""
+    n = mask.sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_x = np.where(mask, x, 0.0).sum(axis=0) / n
+        mean_y = np.where(mask, y, 0.0).sum(axis=0) / n
+        dx = np.where(mask, x - mean_x, 0.0)
+        dy = np.where(mask, y - mean_y, 0.0)
+        beta = (dx * dy).sum(axis=0) / (dx * dx).sum(axis=0)
+    return mean_y - beta * mean_x, beta, n
+
+
+def test_pairs(log_prices: np.ndarray, first: np.ndarray, second: np.ndarray,
+               min_periods: int = 120) -> Dict[str, np.ndarray]:
+    """Çift grubu için hedge oranı, Dickey-Fuller t istatistiği, yarı ömür ve son z-skoru
+
+    Her çift bir sütundur; eksik günler çift bazında dışlanır. Spread
+    log(P2) - a - b·log(P1) olarak tanımlanır ve Δs_t = c + γ·s_{t-1} + e
+    regresyonundaki γ'nın t istatistiği Engle-Granger kritik değerleriyle karşılaştırılır.
+    """
+    x, y = log_prices[:, first], log_prices[:, second]
+    valid = ~np.isnan(x) & ~np.isnan(y)
+
+    alpha, beta, n = _masked_ols(x, y, valid)
+    spread = np.where(valid, y - alpha - beta * x, np.nan)
+
+    # Dickey-Fuller: ardışık geçerli günler üzerinden
+    lagged, current = spread[:-1], spread[1:]
+    df_mask = ~np.isnan(lagged) & ~np.isnan(current)
+    delta = current - lagged
+    intercept, gamma, df_n = _masked_ols(lagged, delta, df_mask)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        residual = np.where(df_mask, delta - intercept - gamma * lagged, 0.0)
+        sigma2 = (residual * residual).sum(axis=0) / (df_n - 2)
+        lag_mean = np.where(df_mask, lagged, 0.0).sum(axis=0) / df_n
+        sxx = (np.where(df_mask, lagged - lag_mean, 0.0) ** 2).sum(axis=0)
+        t_stat = gamma / np.sqrt(sigma2 / sxx)
+        half_life = np.where(gamma < 0, -np.log(2) / np.log1p(gamma), np.nan)
+
+        spread_mean = np.where(valid, spread, 0.0).sum(axis=0) / n
+        spread_std = np.sqrt(np.where(valid, (spread - spread_mean) ** 2, 0.0).sum(axis=0) / (n - 1))
+        last_valid = len(spread) - 1 - np.argmax(valid[::-1], axis=0)
+        last_spread = spread[last_valid, np.arange(spread.shape[1])]
+        z_score = (last_spread - spread_mean) / spread_std
+
+    enough = n >= min_periods
+    nan_unless = lambda values: np.where(enough, values, np.nan)
+    return {
+        'alpha': nan_unless(alpha),
+        'beta': nan_unless(beta),
+        't_stat': nan_unless(t_stat),
+        'half_life': nan_unless(half_life),
+        'z_score': nan_unless(z_score),
+        'observations': n,
+    }
+
+
+def _test_chunk(first: np.ndarray, second: np.ndarray, min_periods: int) -> Dict[str, np.ndarray]:
+    """Bir çift grubunu işçi sürecinde test eder"""
+    return test_pairs(_WORKER_LOG_PRICES, first, second, min_periods)
+
+
+class PairsScanner:
+    """Saklanan kapanış paneli üzerinde eşbütünleşik çift taraması
+
+    Aday çiftler önce sektöre, sonra getiri korelasyonuna göre budanır;
+    kalan çiftler sütun grupları halinde NumPy ile toplu test edilir ve
+    gruplar isteğe bağlı olarak süreç havuzuna dağıtılır.
+    """
+
+    def __init__(self, close: pd.DataFrame, sectors: Optional[Dict[str, str]] = None,
+                 lookback: int = 252, min_correlation: float = 0.7, same_sector: bool = True,
+                 data_fetcher: Optional[DataFetcher] = None):
+        close = close.drop(columns=[BENCHMARK_SYMBOL], errors='ignore').tail(lookback)
+        # Pencerede yeterli verisi olmayan semboller baştan elenir
+        close = close.loc[:, close.notna().sum() >= lookback // 2]
+
+        self.close = close
+        if sectors is None:
+            # SectorIndexEngine ile aynı kaynak: DataFetcher şirket bilgileri
+            companies = (data_fetcher or DataFetcher()).get_bist100_companies()
+            sectors = {c['symbol']: c['sector'] for c in companies}
+        self.sectors = sectors
+        self.lookback = lookback
+        self.min_correlation = min_correlation
+        self.same_sector = same_sector
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self._log_prices = np.log(close.to_numpy(dtype=np.float64))
+
+    def candidate_pairs(self) -> pd.DataFrame:
+        """Sektör ve korelasyon filtresinden geçen çiftleri döndürür"""
+        symbols = list(self.close.columns)
+        returns = self.close.pct_change(fill_method=None)
+        corr = CorrelationEngine(returns).correlation_matrix(
+            window=self.lookback, symbols=symbols, min_periods=self.lookback // 2).to_numpy()
+
+        first, second = np.triu_indices(len(symbols), k=1)
+        keep = corr[first, second] >= self.min_correlation
+        if self.same_sector:
+            # Sektörü bilinmeyenler ortak "Diğer" grubunda eşleşmez; ön filtre yalnızca gerçek sektörlerde çalışır
+            sector = np.array([self.sectors.get(s, UNKNOWN_SECTOR) for s in symbols], dtype=object)
+            keep &= (sector[first] == sector[second]) & (sector[first] != UNKNOWN_SECTOR)
+
+        first, second = first[keep], second[keep]
+        names = np.asarray(symbols, dtype=object)
+        return pd.DataFrame({
+            'first': first,
+            'second': second,
+            'Sembol 1': names[first],
+            'Sembol 2': names[second],
+            'Sektör': [self.sectors.get(s, UNKNOWN_SECTOR) for s in names[first]],
+            'Korelasyon': corr[first, second],
+        })
+
+    def scan(self, significance: float = 0.05, n_jobs: Optional[int] = 1,
+             chunk_size: int = 2000, min_periods: Optional[int] = None) -> pd.DataFrame:
+        """Aday çiftleri test eder; eşbütünleşik olanları |z| büyükten küçüğe döndürür
+
+        significance yalnızca EG_CRITICAL_VALUES anahtarlarından biri olabilir.
+        """
+        if significance not in EG_CRITICAL_VALUES:
+            supported = ", ".join(str(level) for level in EG_CRITICAL_VALUES)
+            raise ValueError(f"Desteklenmeyen anlamlılık düzeyi: {significance} (desteklenen: {supported})")
+
+        try:
+            candidates = self.candidate_pairs()
+            if candidates.empty:
+                return pd.DataFrame()
+
+            min_periods = min_periods or self.lookback // 2
+            first, second = candidates['first'].to_numpy(), candidates['second'].to_numpy()
+            chunks = [(first[i:i + chunk_size], second[i:i + chunk_size])
+                      for i in range(0, len(first), chunk_size)]
+
+            if n_jobs == 1 or len(chunks) == 1:
+                results = [test_pairs(self._log_prices, a, b, min_periods) for a, b in chunks]
+            else:
+                with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker,
+                                         initargs=(self._log_prices,)) as executor:
+                    futures = [executor.submit(_test_chunk, a, b, min_periods) for a, b in chunks]
+                    results = [future.result() for future in futures]
+
+            stats = {key: np.concatenate([r[key] for r in results]) for key in results[0]}
+            table = candidates.drop(columns=['first', 'second']).assign(
+                **{
+                    'Hedge Oranı': stats['beta'],
+                    'ADF t': stats['t_stat'],
+                    'Yarı Ömür': stats['half_life'],
+                    'Spread Z': stats['z_score'],
+                    'Gözlem': stats['observations'],
+                }
+            )
+            table['Eşbütünleşik'] = table['ADF t'] < EG_CRITICAL_VALUES[significance]
+            table = table[table['Eşbütünleşik']]
+            return table.reindex(table['Spread Z'].abs().sort_values(ascending=False).index).reset_index(drop=True)
+
+        except Exception as e:
+            st.error(f"Çift taraması hatası: {str(e)}")
+            return pd.DataFrame()
+
+    def spread_zscores(self, pairs: pd.DataFrame, window: int = 60) -> pd.DataFrame:
+        """Seçilen çiftler için kayan z-skoru serileri (tarih × 'S1/S2') — izleme için"""
+        symbols = list(self.close.columns)
+        first = np.array([symbols.index(s) for s in pairs['Sembol 1']], dtype=np.int64)
+        second = np.array([symbols.index(s) for s in pairs['Sembol 2']], dtype=np.int64)
+
+        x, y = self._log_prices[:, first], self._log_prices[:, second]
+        spread = y - pairs['Hedge Oranı'].to_numpy() * x
+        spread = pd.DataFrame(spread, index=self.close.index,
+                              columns=[f"{a}/{b}" for a, b in zip(pairs['Sembol 1'], pairs['Sembol 2'])])
+
+        rolling = spread.rolling(window, min_periods=window // 2)
+        return (spread - rolling.mean()) / rolling.std()
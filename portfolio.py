@@ -0,0 +1,165 @@
+import pandas as pd
+import numpy as np
+from typing import Dict, Optional, Union
+import streamlit as st
+
+from utils import calculate_performance_metrics
+
+TRADING_DAYS = 252
+REBALANCE_FREQUENCIES = {"Haftalık": "W", "Aylık": "M", "Çeyreklik": "Q", "Yıllık": "Y"}
+
+
+class PortfolioSimulator:
+    """Hizalanmış fiyat paneli üzerinde çok varlıklı portföy simülasyonu
+
+    Yeniden dengeleme arasındaki her gün, dönem başından itibaren kümülatif
+    büyüme oranlarıyla matris olarak hesaplanır; dönemler arası zincirleme
+    yalnızca dönem çarpanlarının kümülatif çarpımıdır. Günlük Python döngüsü
+    yoktur; eşik bazlı dengelemede döngü yalnızca dengeleme olayları üzerindedir.
+    """
+
+    def __init__(self, close: pd.DataFrame, weights: Union[Dict, pd.Series, pd.DataFrame],
+                 rebalance: Optional[str] = "M", threshold: Optional[float] = None,
+                 commission: float = 0.001, slippage: float = 0.0005,
+                 cash_weight: float = 0.0, cash_rate: float = 0.0, initial_capital: float = 100_000):
+        self.close = close
+        self.rebalance = rebalance
+        self.threshold = threshold
+        self.cost_rate = commission + slippage
+        self.cash_weight = cash_weight
+        self.cash_rate = cash_rate
+        self.initial_capital = initial_capital
+
+        # Hedef ağırlıklar: sabit (Series/dict) ya da zamana bağlı (tarih × sembol)
+        if isinstance(weights, dict):
+            weights = pd.Series(weights, dtype=float)
+        if isinstance(weights, pd.Series):
+            weights = pd.DataFrame(np.tile(weights.to_numpy(dtype=float), (len(close), 1)),
+                                   index=close.index, columns=weights.index)
+        self.target_weights = weights.reindex(index=close.index, columns=close.columns).ffill().fillna(0.0)
+
+        prices = close.to_numpy(dtype=np.float64)
+        self._listed = ~np.isnan(prices)
+        filled = close.ffill().bfill().to_numpy(dtype=np.float64)
+        # Kümülatif büyüme: işlem görmeyen günlerde fiyat sabit kabul edilir
+        self._growth = filled / filled[0]
+        self._cash_growth = (1 + cash_rate) ** (np.arange(len(close)) / TRADING_DAYS)
+
+    # --- Dengeleme tarihleri ---
+
+    def _periodic_rebalance_points(self) -> np.ndarray:
+        """Her dönemin ilk işlem gününün satır indekslerini döndürür"""
+        index = self.close.index
+        if self.rebalance is None:
+            return np.array([0])
+
+        if getattr(index, 'tz', None) is not None:
+            index = index.tz_localize(None)
+        periods = index.to_period(self.rebalance)
+        starts = np.flatnonzero(periods[1:] != periods[:-1]) + 1
+        return np.concatenate([[0], starts])
+
+    def _weights_at(self, row: int) -> np.ndarray:
+        """Dengeleme günündeki uygulanabilir hedef ağırlıklar (işlem görmeyenler hariç)"""
+        target = self.target_weights.to_numpy()[row] * self._listed[row]
+        total = target.sum()
+        invested = 1.0 - self.cash_weight
+        return target / total * invested if total > 0 else np.zeros_like(target)
+
+    def _threshold_rebalance_points(self, periodic: np.ndarray) -> np.ndarray:
+        """Sapma eşiğini aşan ilk günleri dengeleme olayı olarak ekler"""
+        total = len(self.close)
+        points = [0]
+        periodic_set = periodic[periodic > 0]
+
+        while True:
+            start = points[-1]
+            weights = self._weights_at(start)
+            cash = 1.0 - weights.sum()
+
+            relative = self._growth[start:] / self._growth[start]
+            cash_relative = self._cash_growth[start:] / self._cash_growth[start]
+            asset_values = relative * weights
+            drifted = asset_values / (asset_values.sum(axis=1) + cash * cash_relative)[:, None]
+
+            breach = np.flatnonzero(np.abs(drifted - weights).max(axis=1) > self.threshold)
+            breach = breach[breach > 0]
+            next_breach = start + breach[0] if len(breach) else total
+            later_periodic = periodic_set[periodic_set > start]
+            next_periodic = later_periodic[0] if len(later_periodic) else total
+
+            next_point = min(next_breach, next_periodic)
+            if next_point >= total:
+                break
+            points.append(int(next_point))
+
+        return np.asarray(points)
+
+    # --- Simülasyon ---
+
+    def run(self) -> Dict:
+        """Simülasyonu çalıştırır; değer serisi, günlük ağırlıklar ve dengeleme kayıtlarını döndürür"""
+        try:
+            points = self._periodic_rebalance_points()
+            if self.threshold is not None:
+                periodic = points if self.rebalance is not None else np.array([0])
+                points = self._threshold_rebalance_points(periodic)
+
+            total = len(self.close)
+            segment = np.searchsorted(points, np.arange(total), side='right') - 1
+            segment_start = points[segment]
+
+            # Dengeleme günlerindeki hedef ağırlıklar (K × N) ve nakit payları
+            target = np.vstack([self._weights_at(p) for p in points])
+            cash = 1.0 - target.sum(axis=1)
+
+            # Dönem başına göre göreli büyüme (T × N) ve dönem içi değer çarpanı
+            relative = self._growth / self._growth[segment_start]
+            cash_relative = self._cash_growth / self._cash_growth[segment_start]
+            asset_values = relative * target[segment]
+            segment_multiplier = asset_values.sum(axis=1) + cash[segment] * cash_relative
+            drifted = asset_values / segment_multiplier[:, None]
+
+            # Dengeleme günlerinde: önceki dönemden kaymış ağırlıklar ve devir oranı
+            end_multiplier, pre_rebalance = self._segment_ends(points, target, cash)
+            turnover = np.abs(target - pre_rebalance).sum(axis=1)
+            cost_factor = 1 - self.cost_rate * turnover
+
+            # Dönem başı değerleri: önceki dönem çarpanları ve maliyetlerin kümülatif çarpımı
+            start_value = self.initial_capital * np.cumprod(np.concatenate([[1.0], end_multiplier])) * \
+                np.cumprod(cost_factor)
+
+            value = start_value[segment] * segment_multiplier
+
+            index, columns = self.close.index, self.close.columns
+            value_series = pd.Series(value, index=index, name='Portföy Değeri')
+            rebalances = pd.DataFrame({
+                'Tarih': index[points],
+                'Devir Oranı': turnover * 100,
+                'Maliyet': start_value / cost_factor * (1 - cost_factor),
+            })
+
+            return {
+                'value': value_series,
+                'weights': pd.DataFrame(drifted, index=index, columns=columns),
+                'rebalances': rebalances,
+                'metrics': calculate_performance_metrics(value_series.to_frame('Close')),
+            }
+
+        except Exception as e:
+            st.error(f"Portföy simülasyonu hatası: {str(e)}")
+            return {}
+
+    def _segment_ends(self, points: np.ndarray, target: np.ndarray, cash: np.ndarray) -> tuple:
+        """Her dönemin bir sonraki dengeleme gününe kadarki değer çarpanı ve kaymış ağırlıkları"""
+        starts, ends = points[:-1], points[1:]
+        relative = self._growth[ends] / self._growth[starts]
+        cash_relative = self._cash_growth[ends] / self._cash_growth[starts]
+
+        asset_values = relative * target[:-1]
+        multiplier = asset_values.sum(axis=1) + cash[:-1] * cash_relative
+
+        # İlk dengelemede portföy tamamen nakittir
+        pre_rebalance = np.zeros_like(target)
+        pre_rebalance[1:] = asset_values / multiplier[:, None]
+        return multiplier, pre_rebalance
@@ -0,0 +1,86 @@
+import pandas as pd
+import numpy as np
+from typing import Dict, Optional
+import streamlit as st
+
+from market_store import get_market_store, BENCHMARK_SYMBOL
+from backtester import forward_fill
+
+# Dönem etiketi -> bar sayısı (1 hafta, 1/3/6/12 ay)
+RS_HORIZONS = {"1H": 5, "1A": 21, "3A": 63, "6A": 126, "12A": 252}
+
+
+def calculate_relative_strength(close: pd.DataFrame, benchmark: pd.Series,
+                                horizons: Optional[Dict[str, int]] = None) -> pd.DataFrame:
+    """Tüm semboller için çok dönemli getiri, endekse göre fazla getiri ve yüzdelik sıra
+
+    Son bar ve her dönem başlangıcındaki (taşınmış) kapanışlar tek bir satır
+    seçimiyle alınır; getiriler sembol × dönem matrisi olarak hesaplanır.
+    Yüzdelik sıra fazla getiriye göredir (100 en güçlü). 'RS Skoru'
+    mevcut dönemlerin yüzdelik sıralarının ortalamasıdır.
+    """
+    horizons = horizons or RS_HORIZONS
+    if close.empty:
+        return pd.DataFrame()
+
+    try:
+        benchmark = benchmark.reindex(close.index)
+        prices = forward_fill(close.to_numpy(dtype=np.float64), np.nan)
+        bench = forward_fill(benchmark.to_numpy(dtype=np.float64)[:, None], np.nan)[:, 0]
+
+        lags = np.array(list(horizons.values()))
+        rows = len(prices) - 1 - lags
+        available = rows >= 0
+        rows = np.where(available, rows, 0)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Sembol × dönem getirileri
+            returns = prices[-1][:, None] / prices[rows].T - 1
+            bench_returns = bench[-1] / bench[rows] - 1
+        returns[:, ~available] = np.nan
+        bench_returns[~available] = np.nan
+        excess = returns - bench_returns[None, :]
+
+        labels = list(horizons)
+        excess_frame = pd.DataFrame(excess * 100, index=close.columns, columns=labels)
+        ranks = excess_frame.rank(pct=True) * 100
+
+        result = pd.concat({
+            'Getiri': pd.DataFrame(returns * 100, index=close.columns, columns=labels),
+            'Fazla Getiri': excess_frame,
+            'Yüzdelik': ranks,
+        }, axis=1)
+        result.columns = [f"{kind} {label}" for kind, label in result.columns]
+        result['RS Skoru'] = ranks.mean(axis=1)
+
+        return result.sort_values('RS Skoru', ascending=False)
+
+    except Exception as e:
+        st.error(f"Göreceli güç hesaplama hatası: {str(e)}")
+        return pd.DataFrame()
+
+
+@st.cache_data(show_spinner=False)
+def get_relative_strength(last_date: str) -> pd.DataFrame:
+    """Mağazadaki panel için göreceli güç tablosu; işlem günü başına bir kez hesaplanır
+
+    last_date yalnızca önbellek anahtarıdır (MarketDataStore.last_date).
+    """
+    store = get_market_store()
+    symbols = [s for s in store.symbols if s != BENCHMARK_SYMBOL]
+    close = store.get_panel('Close', symbols)
+    benchmark = store.get_panel('Close', [BENCHMARK_SYMBOL])
+    if close.empty or benchmark.empty:
+        return pd.DataFrame()
+
+    return calculate_relative_strength(close, benchmark[BENCHMARK_SYMBOL])
+
+
+def leaders_and_laggards(table: pd.DataFrame, horizon: str = "3A", count: int = 10) -> tuple:
+    """Seçilen döneme göre en güçlü ve en zayıf sembolleri döndürür"""
+    column = f"Fazla Getiri {horizon}"
+    if table.empty or column not in table.columns:
+        return pd.DataFrame(), pd.DataFrame()
+
+    ranked = table.dropna(subset=[column]).sort_values(column, ascending=False)
+    return ranked.head(count), ranked.tail(count).iloc[::-1]
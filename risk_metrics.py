@@ -0,0 +1,211 @@
+import pandas as pd
+import numpy as np
+from typing import Dict, Optional, Union
+import streamlit as st
+
+from backtester import forward_fill, TRADING_DAYS
+
+ROLLING_METRICS = ['Getiri', 'Volatilite', 'Sharpe', 'Sortino', 'Maks. Düşüş', 'Düşüş Süresi', 'Ülser Endeksi']
+
+
+def window_max_drop(values: np.ndarray, window: int) -> np.ndarray:
+    """Her satırda son 'window' değer içindeki en büyük düşüşü (tepe - dip) döndürür
+
+    van Herk / Gil-Werman blok yöntemi: dizi pencere boyunda bloklara bölünür,
+    her blokta ileri (önek) ve geri (sonek) birikimli özetler çıkarılır; her
+    pencere en fazla iki bloğa yayıldığından sonek ile önek birleşimi yeterlidir.
+    Süre pencere uzunluğundan bağımsız olarak O(n)'dir. Girdi NaN içermemelidir.
+    """
+    total, width = values.shape
+    blocks = -(-total // window)
+    padded = np.empty((blocks * window, width), dtype=np.float64)
+    padded[:total] = values
+    padded[total:] = values[-1]
+    cube = padded.reshape(blocks, window, width)
+
+    # Önek: blok başından t'ye kadar en yüksek, en düşük ve en büyük düşüş
+    prefix_max = np.maximum.accumulate(cube, axis=1)
+    prefix_min = np.minimum.accumulate(cube, axis=1)
+    prefix_drop = np.maximum.accumulate(prefix_max - cube, axis=1)
+
+    # Sonek: s'den blok sonuna kadar en yüksek ve en büyük düşüş
+    reversed_cube = cube[:, ::-1]
+    suffix_max = np.maximum.accumulate(reversed_cube, axis=1)[:, ::-1]
+    suffix_min = np.minimum.accumulate(reversed_cube, axis=1)[:, ::-1]
+    suffix_drop = np.maximum.accumulate((cube - suffix_min)[:, ::-1], axis=1)[:, ::-1]
+
+    prefix_max, prefix_min, prefix_drop = (a.reshape(-1, width)[:total] for a in (prefix_max, prefix_min, prefix_drop))
+    suffix_max, suffix_drop = (a.reshape(-1, width) for a in (suffix_max, suffix_drop))
+
+    ends = np.arange(total)
+    starts = np.maximum(ends - window + 1, 0)
+    # Pencere blok başında başlıyorsa tek blok içindedir
+    single_block = (starts % window == 0)[:, None]
+
+    combined = np.maximum(np.maximum(suffix_drop[starts], prefix_drop),
+                          suffix_max[starts] - prefix_min)
+    return np.where(single_block, prefix_drop, combined)
+
+
+def window_peak_position(values: np.ndarray, window: int) -> np.ndarray:
+    """Her satırda son 'window' değer içindeki en büyük değerin (eşitlikte en yeni) satır konumu
+
+    window_max_drop ile aynı blok yöntemi: önek ve sonek birikimli en
+    büyükleri konumlarıyla birlikte taşınır. Süre O(n)'dir; NaN yerine -inf
+    verilmelidir.
+    """
+    total, width = values.shape
+    blocks = -(-total // window)
+    padded = np.full((blocks * window, width), -np.inf)
+    padded[:total] = values
+    cube = padded.reshape(blocks, window, width)
+    position = np.arange(blocks * window).reshape(blocks, window, 1)
+
+    # Önek: en büyüğe eşit son konum (eşitlikte sonraki konum kazanır)
+    prefix_max = np.maximum.accumulate(cube, axis=1)
+    prefix_pos = np.maximum.accumulate(np.where(cube >= prefix_max, position, -1), axis=1)
+
+    # Sonek: geriye taramada en büyüğü ilk kez (kesin olarak) aşan konum, yani en büyüğün son konumu
+    reversed_cube = cube[:, ::-1]
+    suffix_max = np.maximum.accumulate(reversed_cube, axis=1)
+    previous_max = np.concatenate([np.full((blocks, 1, width), -np.inf), suffix_max[:, :-1]], axis=1)
+    step = np.arange(window).reshape(1, window, 1)
+    last_new = np.maximum.accumulate(np.where((reversed_cube > previous_max) | (step == 0), step, -1), axis=1)
+    block_end = (np.arange(blocks) * window + window - 1).reshape(blocks, 1, 1)
+    suffix_pos = (block_end - last_new)[:, ::-1]
+    suffix_max = suffix_max[:, ::-1]
+
+    prefix_max, prefix_pos = (a.reshape(-1, width)[:total] for a in (prefix_max, prefix_pos))
+    suffix_max, suffix_pos = (a.reshape(-1, width) for a in (suffix_max, suffix_pos))
+
+    ends = np.arange(total)
+    starts = np.maximum(ends - window + 1, 0)
+    single_block = (starts % window == 0)[:, None]
+
+    combined = np.where(prefix_max >= suffix_max[starts], prefix_pos, suffix_pos[starts])
+    return np.where(single_block, prefix_pos, combined)
+
+
+class RollingRiskMetrics:
+    """calculate_performance_metrics çıktılarının kayan pencereli (tarih × sembol) karşılıkları
+
+    Tüm metrikler aynı pencereyi kullanır: 'window' getiri, yani window + 1
+    fiyat. Sharpe, calculate_performance_metrics gibi yıllıklandırılmış
+    (bileşik) pencere getirisinin yıllık volatiliteye oranıdır; Sortino aynı
+    payı yıllık aşağı yönlü sapmaya böler.
+
+    Volatilite ve sapmalar kümülatif toplamlardan; maksimum düşüş ve düşüş
+    süresindeki tepe konumu blok yöntemiyle; ülser endeksindeki pencere tepesi
+    pandas'ın monoton kuyruk tabanlı rolling max'ı ile hesaplanır. Tüm
+    metrikler geçmiş uzunluğunda doğrusaldır ve pencere boyundan bağımsızdır.
+    """
+
+    def __init__(self, close: Union[pd.Series, pd.DataFrame], window: int = 63,
+                 min_periods: Optional[int] = None):
+        if isinstance(close, pd.Series):
+            close = close.to_frame(name=close.name or "Close")
+
+        self.close = close
+        self.window = window
+        self.min_periods = min_periods or window
+        self._metrics = None
+
+    @staticmethod
+    def _padded_cumsum(values: np.ndarray) -> np.ndarray:
+        result = np.zeros((values.shape[0] + 1, values.shape[1]), dtype=np.float64)
+        np.cumsum(values, axis=0, out=result[1:])
+        return result
+
+    def _window_sum(self, values: np.ndarray, span: Optional[int] = None) -> np.ndarray:
+        cumulative = self._padded_cumsum(values)
+        ends = np.arange(1, len(values) + 1)
+        starts = np.maximum(ends - (span or self.window), 0)
+        return cumulative[ends] - cumulative[starts]
+
+    def compute(self) -> Dict[str, pd.DataFrame]:
+        """Tüm metrikleri hesaplar; metrik adı -> tarih × sembol tablosu"""
+        if self._metrics is not None:
+            return self._metrics
+
+        try:
+            prices = self.close.to_numpy(dtype=np.float64)
+            filled = forward_fill(prices, np.nan)
+
+            # Günlük getiriler (işlem görmeyen günler hariç)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                returns = np.full_like(prices, np.nan)
+                returns[1:] = prices[1:] / filled[:-1] - 1
+            has_return = ~np.isnan(returns)
+            safe_returns = np.where(has_return, returns, 0.0)
+
+            count = self._window_sum(has_return.astype(np.float64))
+            total = self._window_sum(safe_returns)
+            total_sq = self._window_sum(safe_returns * safe_returns)
+            downside_sq = self._window_sum(np.minimum(safe_returns, 0.0) ** 2)
+            enough = count >= self.min_periods
+            span = self.window + 1
+
+            # Pencere getirisi: pencere başındaki (taşınmış) fiyata göre; kısa pencerelerde ilk fiyat
+            first_fill = forward_fill(filled[::-1], np.nan)[::-1]
+            anchored = np.where(np.isnan(filled), first_fill, filled)
+            base_rows = np.maximum(np.arange(len(filled)) - self.window, 0)
+            days = (self.close.index - self.close.index[base_rows]).days.to_numpy(dtype=np.float64)[:, None]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                window_return = filled / anchored[base_rows] - 1
+                annual_return = np.where(days > 0, (1 + window_return) ** (365 / days) - 1, np.nan)
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                mean = total / count
+                variance = (total_sq - count * mean * mean) / (count - 1)
+                volatility = np.sqrt(np.maximum(variance, 0.0)) * np.sqrt(TRADING_DAYS)
+                downside = np.sqrt(downside_sq / count) * np.sqrt(TRADING_DAYS)
+                sharpe = np.where(volatility > 0, annual_return / volatility, 0.0)
+                sortino = np.where(downside > 0, annual_return / downside, 0.0)
+
+            # Pencere içi maksimum düşüş: log fiyatta tepe - dip
+            log_price = np.nan_to_num(np.log(anchored), nan=0.0)
+            max_drawdown = np.expm1(-window_max_drop(log_price, span))
+
+            # Düşüş süresi: pencere içindeki (son) tepeden bu yana geçen bar sayısı
+            peak = window_peak_position(np.where(np.isnan(filled), -np.inf, filled), span)
+            duration = (np.arange(len(filled))[:, None] - peak).astype(np.float64)
+            duration[np.isnan(filled)] = np.nan
+
+            # Ülser endeksi: pencere tepesine göre yüzde düşüşlerin karesel ortalaması
+            window_peak = pd.DataFrame(filled).rolling(span, min_periods=1).max().to_numpy()
+            priced = ~np.isnan(filled)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                drawdown_pct = np.where(priced, (filled / window_peak - 1) * 100, 0.0)
+                ulcer = np.sqrt(self._window_sum(drawdown_pct * drawdown_pct, span) /
+                                self._window_sum(priced.astype(np.float64), span))
+
+            values = {
+                'Getiri': window_return * 100,
+                'Volatilite': volatility * 100,
+                'Sharpe': sharpe,
+                'Sortino': sortino,
+                'Maks. Düşüş': max_drawdown * 100,
+                'Düşüş Süresi': duration,
+                'Ülser Endeksi': ulcer,
+            }
+
+            index, columns = self.close.index, self.close.columns
+            self._metrics = {
+                name: pd.DataFrame(np.where(enough, value, np.nan), index=index, columns=columns)
+                for name, value in values.items()
+            }
+            return self._metrics
+
+        except Exception as e:
+            st.error(f"Kayan risk metrik hesaplama hatası: {str(e)}")
+            return {}
+
+    def for_symbol(self, symbol: str) -> pd.DataFrame:
+        """Tek sembol için tarih × metrik tablosu (grafikler için)"""
+        metrics = self.compute()
+        return pd.DataFrame({name: frame[symbol] for name, frame in metrics.items()})
+
+    def latest(self) -> pd.DataFrame:
+        """Son bar için sembol × metrik tablosu (tarayıcı için)"""
+        metrics = self.compute()
+        return pd.DataFrame({name: frame.iloc[-1] for name, frame in metrics.items()})
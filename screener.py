@@ -0,0 +1,197 @@
+import os
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional
+import streamlit as st
+
+from market_store import MarketDataStore, BENCHMARK_SYMBOL, get_market_store
+from technical_analysis import TechnicalAnalysis
+from utils import get_panel_trend_analysis
+from candlestick_patterns import CandlestickScanner
+
+# Hazır tarama koşulları (DataFrame.query ifadeleri)
+PRESET_SCREENS = {
+    "Aşırı Satım + Yükseliş Trendi": "RSI < 30 and MA20 > MA50",
+    "Aşırı Satım + Hacim Patlaması": "RSI < 30 and MA20 > MA50 and Volume > 2 * Volume_MA",
+    "Aşırı Alım": "RSI > 70",
+    "MACD Pozitif": "MACD > Signal",
+    "Bollinger Alt Bant Altında": "Close < BB_Lower",
+    "Güçlü Trend (ADX > 25)": "ADX > 25 and Plus_DI > Minus_DI",
+    "Genel Sinyal Al": "Overall_Signal == 'Al'",
+    "Güçlü Yükseliş Trendi": "Trend_Strength == 3",
+    "Yutan Boğa Formasyonu": "Pattern_Bullish_Engulfing",
+    "Çekiç + Aşırı Satım": "Pattern_Hammer and RSI < 35",
+}
+
+# get_panel_trend_analysis anahtarları -> snapshot sütunları
+TREND_COLUMNS = {
+    "trend": "Trend",
+    "strength": "Trend_Strength",
+    "price_change_20d": "Change_20d",
+    "current_vs_short_ma": "Close_vs_Short_MA",
+    "current_vs_long_ma": "Close_vs_Long_MA",
+    "short_vs_long_ma": "Short_vs_Long_MA",
+}
+
+
+class IndicatorSnapshot:
+    """Her sembol için son bar indikatör değerlerini tutan materyalize tablo
+
+    Tablo diskte saklanır ve yalnızca son barı değişen semboller için
+    yeniden hesaplanır; tarama sorguları bu tablodan okunur.
+    """
+
+    def __init__(self, store: MarketDataStore, lookback: int = 400):
+        self.store = store
+        self.lookback = lookback
+        self.path = os.path.join(store.cache_dir, "indicator_snapshot.pkl")
+        self.table = self._load()
+
+    def _load(self) -> pd.DataFrame:
+        """Diskteki snapshot'ı okur; okunamayan dosya boş tablo sayılır (sonraki yenilemede yeniden yazılır)"""
+        if not os.path.exists(self.path):
+            return pd.DataFrame()
+        try:
+            return pd.read_pickle(self.path)
+        except Exception:
+            return pd.DataFrame()
+
+    def _stale_symbols(self, symbols: List[str]) -> List[str]:
+        """Son barı snapshot'takinden farklı olan sembolleri bulur"""
+        close = self.store.get_panel('Close', symbols)
+        if close.empty:
+            return []
+
+        # Her sembolün son geçerli bar tarihi ve kapanışı tek geçişte bulunur
+        valid = close.notna().to_numpy()
+        last_pos = len(close) - 1 - np.argmax(valid[::-1], axis=0)
+        has_data = valid.any(axis=0)
+        last_dates = pd.Series(close.index[last_pos], index=close.columns).where(has_data)
+        last_close = pd.Series(close.to_numpy()[last_pos, np.arange(close.shape[1])], index=close.columns)
+
+        # Sonradan eklenen sütunları taşımayan eski snapshot'lar tamamen yeniden hesaplanır
+        if self.table.empty or not {"Trend", "Volatility", "Patterns"} <= set(self.table.columns):
+            return [s for s in symbols if pd.notna(last_dates.get(s))]
+
+        known_dates = self.table['Date'].reindex(symbols)
+        known_close = self.table['Close'].reindex(symbols)
+        stale = (known_dates != last_dates) | ~np.isclose(known_close, last_close, equal_nan=True)
+
+        return [s for s in symbols if stale.get(s, False) and pd.notna(last_dates.get(s))]
+
+    def _compute_row(self, symbol: str) -> Optional[Dict]:
+        """Tek bir sembol için son bar kaydını üretir"""
+        data = self.store.get_ohlcv(symbol)
+        if data is None or data.empty:
+            return None
+
+        analysis = TechnicalAnalysis(data.tail(self.lookback))
+        row = {
+            'Date': data.index[-1],
+            'Open': float(data['Open'].iloc[-1]),
+            'High': float(data['High'].iloc[-1]),
+            'Low': float(data['Low'].iloc[-1]),
+            'Close': float(data['Close'].iloc[-1]),
+            'Volume': float(data['Volume'].iloc[-1]),
+            'Change_Pct': float(data['Close'].pct_change().iloc[-1] * 100) if len(data) > 1 else np.nan,
+            # create_alert_system ile aynı: 20 günlük günlük getiri standart sapması (%)
+            'Volatility': float(data['Close'].pct_change().rolling(window=20).std().iloc[-1] * 100)
+            if len(data) >= 21 else np.nan,
+        }
+        row.update(analysis.get_latest_values())
+        row.update(analysis.get_trading_signals())
+        return row
+
+    def refresh(self, symbols: Optional[List[str]] = None, force: bool = False,
+                raise_errors: bool = False) -> List[str]:
+        """Snapshot'ı artımlı günceller ve yeniden hesaplanan sembolleri döndürür
+
+        Depo kilidi altında çalışır; panel yenilemesiyle aynı anda yürümez.
+        raise_errors=True iken hata st.error yerine çağırana iletilir.
+        """
+        try:
+            with self.store.lock:
+                return self._refresh(symbols, force)
+
+        except Exception as e:
+            if raise_errors:
+                raise
+            st.error(f"Snapshot güncelleme hatası: {str(e)}")
+            return []
+
+    def _refresh(self, symbols: Optional[List[str]], force: bool) -> List[str]:
+        if symbols is None:
+            symbols = [s for s in self.store.symbols if s != BENCHMARK_SYMBOL]
+
+        stale = symbols if force else self._stale_symbols(symbols)
+        rows = {}
+        for symbol in stale:
+            row = self._compute_row(symbol)
+            if row is not None:
+                rows[symbol] = row
+
+        if rows:
+            updates = pd.DataFrame.from_dict(rows, orient='index')
+            # Trend sınıfları güncellenen semboller için tek panel çağrısıyla hesaplanır
+            close = self.store.get_panel('Close', list(rows)).tail(self.lookback)
+            trends = get_panel_trend_analysis(close).rename(columns=TREND_COLUMNS)
+            # Mum formasyonları da aynı şekilde tek panel taramasıyla eklenir
+            patterns = CandlestickScanner.from_store(self.store, list(rows)).latest()
+            updates = updates.join(trends).join(patterns)
+            table = self.table.drop(index=updates.index, errors='ignore')
+            table = pd.concat([table, updates]).sort_index() if not table.empty else updates.sort_index()
+
+            temp_path = self.path + ".tmp"
+            table.to_pickle(temp_path)
+            os.replace(temp_path, self.path)
+            self.table = table
+
+        return list(rows)
+
+    def trend_map(self) -> pd.DataFrame:
+        """Piyasa geneli trend tablosunu snapshot'tan okur"""
+        columns = [c for c in TREND_COLUMNS.values() if c in self.table.columns]
+        if not columns:
+            return pd.DataFrame(columns=list(TREND_COLUMNS.values()))
+        return self.table[columns].sort_values("Trend_Strength", ascending=False)
+
+
+class Screener:
+    """Snapshot tablosu üzerinde evren taraması yapan sınıf"""
+
+    def __init__(self, snapshot: pd.DataFrame):
+        self.snapshot = snapshot
+
+    def screen(self, condition: str, columns: Optional[List[str]] = None,
+               sort_by: Optional[str] = None, ascending: bool = True) -> pd.DataFrame:
+        """Koşul ifadesine uyan sembolleri döndürür
+
+        Koşul DataFrame.query sözdizimindedir, örn.
+        "RSI < 30 and MA20 > MA50 and Volume > 2 * Volume_MA".
+        """
+        if self.snapshot.empty:
+            return self.snapshot
+
+        try:
+            result = self.snapshot.query(condition)
+        except Exception as e:
+            st.error(f"Tarama koşulu hatası: {str(e)}")
+            return pd.DataFrame()
+
+        if sort_by is not None and sort_by in result.columns:
+            result = result.sort_values(sort_by, ascending=ascending)
+
+        if columns is not None:
+            result = result[[c for c in columns if c in result.columns]]
+
+        return result
+
+    def screen_preset(self, name: str, **kwargs) -> pd.DataFrame:
+        """Hazır tarama koşullarından birini çalıştırır"""
+        return self.screen(PRESET_SCREENS[name], **kwargs)
+
+
+@st.cache_resource
+def get_indicator_snapshot() -> IndicatorSnapshot:
+    """Sayfa ve uyarı zamanlayıcısı arasında paylaşılan snapshot"""
+    return IndicatorSnapshot(get_market_store())
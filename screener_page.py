@@ -0,0 +1,160 @@
+import streamlit as st
+import pandas as pd
+from market_store import get_market_store
+from screener import IndicatorSnapshot, Screener, PRESET_SCREENS, get_indicator_snapshot
+from relative_strength import RS_HORIZONS, get_relative_strength, leaders_and_laggards
+from sector_index import get_sector_indices
+from fundamentals_table import get_fundamentals_table
+from alerts import ALERT_TYPES, get_alert_engine, get_alert_scheduler
+
+def show_screener_page():
+    """Evren tarayıcı sayfası"""
+    st.title("🔎 Hisse Tarayıcı")
+    st.markdown("---")
+    
+    store = get_market_store()
+    snapshot = get_indicator_snapshot()
+    
+    # Veri durumu ve yenileme
+    info_col, button_col = st.columns([3, 1])
+    with info_col:
+        last_refresh = store.meta.get('last_refresh', 'Hiç')
+        st.caption(f"Son güncelleme: {last_refresh} · Snapshot: {len(snapshot.table)} hisse")
+    
+    with button_col:
+        if st.button("🔄 Evreni Güncelle"):
+            with st.spinner("Panel verileri güncelleniyor..."):
+                store.refresh()
+            with st.spinner("İndikatör snapshot'ı güncelleniyor..."):
+                updated = snapshot.refresh()
+            st.success(f"✅ {len(updated)} hisse yeniden hesaplandı")
+    
+    if snapshot.table.empty:
+        st.info("Snapshot boş. Taramaya başlamak için evreni güncelleyin.")
+        return
+    
+    # Tarama koşulu
+    preset = st.selectbox("Hazır Tarama", ["Özel"] + list(PRESET_SCREENS.keys()))
+    default_condition = PRESET_SCREENS.get(preset, "RSI < 30 and MA20 > MA50 and Volume > 2 * Volume_MA")
+    condition = st.text_input("Koşul (ör. RSI < 30 and MA20 > MA50)", default_condition)
+    
+    screener = Screener(snapshot.table)
+    result = screener.screen(
+        condition,
+        columns=['Date', 'Close', 'Change_Pct', 'RSI', 'MA20', 'MA50', 'MACD', 'Volume', 'Volume_MA', 'Trend', 'Patterns', 'Overall_Signal'],
+        sort_by='RSI'
+    )
+    
+    st.subheader(f"📋 Sonuçlar ({len(result)} hisse)")
+    if result.empty:
+        st.info("Koşula uyan hisse bulunamadı.")
+    else:
+        st.dataframe(result.round(2), use_container_width=True)
+    
+    # Piyasa geneli trend dağılımı (snapshot'tan okunur)
+    trend_map = snapshot.trend_map()
+    if not trend_map.empty:
+        st.subheader("🧭 Piyasa Trend Haritası")
+        st.bar_chart(trend_map['Trend'].value_counts())
+        with st.expander("Hisse bazında trendler"):
+            st.dataframe(trend_map.round(2), use_container_width=True)
+
+    show_sector_indices(store)
+    show_relative_strength(store)
+    show_alert_rules(snapshot)
+
+def show_sector_indices(store):
+    """Eşit ve piyasa değeri ağırlıklı sektör endeksleri"""
+    if store.last_date is None:
+        return
+    
+    indices = get_sector_indices(str(store.last_date.date()), get_fundamentals_table().last_updated)
+    if indices['summary_equal_weight'].empty:
+        return
+    
+    st.subheader("🏭 Sektör Endeksleri")
+    weighting = st.radio("Ağırlıklandırma", ['equal_weight', 'cap_weight'], horizontal=True,
+                         format_func=lambda w: "Eşit Ağırlıklı" if w == 'equal_weight' else "Piyasa Değeri Ağırlıklı")
+    levels = indices[f'levels_{weighting}'].dropna(axis=1, how='all')
+    if levels.empty:
+        st.info("Piyasa değeri ağırlıklı endeks için hisse adetleri gerekli. "
+                "Temel veri tablosunu ana sayfadaki sektör karşılaştırmasından güncelleyin.")
+        return
+    
+    st.dataframe(indices[f'summary_{weighting}'].round(2), use_container_width=True)
+    st.line_chart(levels)
+
+def show_relative_strength(store):
+    """XU100'e göre göreceli güç liderleri ve geride kalanlar"""
+    if store.last_date is None:
+        return
+    
+    table = get_relative_strength(str(store.last_date.date()))
+    if table.empty:
+        return
+    
+    st.subheader("💪 Göreceli Güç (XU100'e göre)")
+    horizon = st.radio("Dönem", list(RS_HORIZONS.keys()), index=2, horizontal=True)
+    leaders, laggards = leaders_and_laggards(table, horizon)
+    columns = [f"Getiri {horizon}", f"Fazla Getiri {horizon}", f"Yüzdelik {horizon}", "RS Skoru"]
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("**🚀 Liderler**")
+        st.dataframe(leaders[columns].round(2), use_container_width=True)
+    with col2:
+        st.markdown("**🐢 Geride Kalanlar**")
+        st.dataframe(laggards[columns].round(2), use_container_width=True)
+
+def show_alert_rules(snapshot: IndicatorSnapshot):
+    """Uyarı kuralları ve tetiklenen uyarılar bölümü"""
+    engine = get_alert_engine()
+    
+    st.subheader("🔔 Uyarı Kuralları")
+    with st.expander("Yeni kural ekle"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            symbol = st.selectbox("Hisse", list(snapshot.table.index), key="alert_symbol")
+        with col2:
+            rule_type = st.selectbox("Tip", list(ALERT_TYPES.keys()),
+                                     format_func=lambda t: ALERT_TYPES[t][0], key="alert_type")
+        with col3:
+            value = st.number_input("Seviye / Kat", value=0.0, key="alert_value")
+        
+        field, other = 'Close', None
+        if rule_type in ('cross_above', 'cross_below'):
+            col1, col2 = st.columns(2)
+            with col1:
+                field = st.text_input("İndikatör", "MACD", key="alert_field")
+            with col2:
+                other = st.text_input("Kesilen sütun (boşsa seviye)", "Signal", key="alert_other") or None
+        
+        if st.button("➕ Kural Ekle"):
+            engine.add_rule(symbol, rule_type, value, field=field, other=other)
+            st.success("✅ Kural eklendi")
+    
+    if engine.rules.empty:
+        st.caption("Tanımlı uyarı kuralı yok.")
+        return
+    
+    # Kurallar varken arka plan değerlendiricisi çalışır
+    scheduler = get_alert_scheduler()
+    st.caption(f"{len(engine.rules)} kural · Son değerlendirme: {scheduler.last_run or 'Bekleniyor'}")
+    if scheduler.last_error:
+        st.warning(f"Arka plan değerlendirme hatası: {scheduler.last_error}")
+    st.dataframe(engine.rules[['Symbol', 'Type', 'Field', 'Other', 'Value', 'Last_Fired']],
+                 use_container_width=True)
+    
+    outbox = engine.outbox.read(limit=50)
+    if not outbox.empty:
+        st.markdown("**Son Uyarılar**")
+        for _, alert in outbox.iterrows():
+            if alert['type'] == 'danger':
+                st.error(alert['message'])
+            elif alert['type'] == 'warning':
+                st.warning(alert['message'])
+            else:
+                st.info(alert['message'])
+
+if __name__ == "__main__":
+    show_screener_page()
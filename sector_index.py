@@ -0,0 +1,224 @@
+import os
+import hashlib
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional
+import streamlit as st
+
+from market_store import MarketDataStore, BENCHMARK_SYMBOL, get_market_store
+from backtester import forward_fill
+from fundamentals_table import FundamentalsTable
+
+# Sektör özet tablosundaki dönemler (bar sayısı)
+SECTOR_HORIZONS = {"1G": 1, "1H": 5, "1A": 21, "3A": 63, "1Y": 252}
+BREADTH_MA_PERIOD = 50
+
+
+class SectorIndexEngine:
+    """Evren panelinden sektör endeksleri, getirileri ve genişlik serileri üreten sınıf
+
+    Sektör toplamları sembol × sektör üyelik matrisiyle tek matris çarpımında
+    alınır (sütun bazında groupby). Sonuçlar diskte saklanır; yeni barlar
+    geldiğinde yalnızca son kayıtlı tarihten (düzeltmeler için birkaç bar
+    örtüşmeli) sonrası hesaplanıp mevcut endeks seviyelerine zincirlenir.
+
+    Hisse adetleri verilmezse diskteki temel veri tablosunun
+    Shares_Outstanding sütunundan okunur (ağ çağrısı yapılmaz); adedi
+    bilinmeyen hisseler piyasa değeri ağırlıklı endekse girmez.
+    """
+
+    def __init__(self, store: MarketDataStore, sectors: Optional[Dict[str, str]] = None,
+                 shares: Optional[pd.Series] = None, base: float = 100.0):
+        self.store = store
+        self.base = base
+        if shares is None:
+            shares = self._stored_shares(store)
+        self.shares = shares
+        if sectors is None:
+            sectors = {c['symbol']: c['sector'] for c in store.data_fetcher.get_bist100_companies()}
+        self.sectors = sectors
+        self.path = os.path.join(store.cache_dir, "sector_indices.pkl")
+        self.state = pd.read_pickle(self.path) if os.path.exists(self.path) else {}
+
+    # --- Yardımcılar ---
+
+    @staticmethod
+    def _stored_shares(store: MarketDataStore) -> Optional[pd.Series]:
+        """Temel veri tablosundaki dolaşımdaki hisse adetleri (tablo boşsa None)"""
+        table = FundamentalsTable(store.cache_dir, store.data_fetcher).table
+        shares = table['Shares_Outstanding'].dropna() if 'Shares_Outstanding' in table.columns else pd.Series()
+        shares = shares[shares > 0]
+        return shares if not shares.empty else None
+
+    def _constituents(self) -> List[str]:
+        return [s for s in self.store.symbols if s != BENCHMARK_SYMBOL and s in self.sectors]
+
+    def _signature(self, symbols: List[str]) -> str:
+        """Üyelik ya da hisse adetleri değişince tam yeniden hesaplamayı tetikleyen imza"""
+        shares = None if self.shares is None else self.shares.reindex(symbols).round(0).tolist()
+        payload = repr(([(s, self.sectors[s]) for s in symbols], shares, self.base))
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def _membership(self, symbols: List[str]) -> tuple:
+        """Sembol × sektör birim matrisi ve sektör adları"""
+        codes, names = pd.factorize(pd.Series([self.sectors[s] for s in symbols]), sort=True)
+        membership = np.zeros((len(symbols), len(names)))
+        membership[np.arange(len(symbols)), codes] = 1.0
+        return membership, list(names)
+
+    def _compute(self, close: pd.DataFrame, start: int) -> Dict[str, pd.DataFrame]:
+        """close[start:] satırları için sektör getirileri ve genişlik değerlerini hesaplar
+
+        start'tan önceki satırlar yalnızca getiri ve hareketli ortalama bağlamı içindir.
+        """
+        symbols = list(close.columns)
+        membership, names = self._membership(symbols)
+        prices = close.to_numpy(dtype=np.float64)
+        filled = forward_fill(prices, np.nan)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = np.full_like(prices, np.nan)
+            returns[1:] = prices[1:] / filled[:-1] - 1
+        has_return = ~np.isnan(returns)
+        safe_returns = np.where(has_return, returns, 0.0)
+
+        # Eşit ağırlıklı: o gün getirisi olan üyelerin ortalaması
+        counts = has_return.astype(np.float64) @ membership
+        with np.errstate(divide='ignore', invalid='ignore'):
+            equal_weight = (safe_returns @ membership) / counts
+
+            # Piyasa değeri ağırlıklı: önceki kapanıştaki piyasa değerleriyle
+            if self.shares is not None:
+                shares = self.shares.reindex(symbols).to_numpy(dtype=np.float64)
+                previous_cap = np.zeros_like(prices)
+                previous_cap[1:] = np.nan_to_num(filled[:-1] * shares)
+                previous_cap = np.where(has_return, previous_cap, 0.0)
+                cap_weight = ((safe_returns * previous_cap) @ membership) / (previous_cap @ membership)
+            else:
+                cap_weight = np.full_like(equal_weight, np.nan)
+
+            # Genişlik: yükselen üye oranı ve MA50 üzerindeki üye oranı
+            advancing = ((returns > 0).astype(np.float64) @ membership) / counts * 100
+            ma = close.rolling(BREADTH_MA_PERIOD, min_periods=BREADTH_MA_PERIOD).mean().to_numpy()
+            has_ma = ~np.isnan(ma) & ~np.isnan(prices)
+            above_ma = ((has_ma & (prices > ma)).astype(np.float64) @ membership) / \
+                (has_ma.astype(np.float64) @ membership) * 100
+
+        index = close.index[start:]
+        frame = lambda values: pd.DataFrame(values[start:], index=index, columns=names)
+        return {
+            'equal_weight_returns': frame(equal_weight),
+            'cap_weight_returns': frame(cap_weight),
+            'advancing': frame(advancing),
+            'above_ma': frame(above_ma),
+            'constituents': frame(counts),
+        }
+
+    @staticmethod
+    def _chain(returns: pd.DataFrame, start_level: pd.Series) -> pd.DataFrame:
+        """Getirileri başlangıç seviyesinden endeks seviyesine zincirler"""
+        growth = (1 + returns.fillna(0.0)).cumprod()
+        return growth * start_level.reindex(returns.columns).to_numpy()
+
+    # --- Güncelleme ---
+
+    def update(self, overlap: int = 5, force: bool = False) -> bool:
+        """Sektör serilerini artımlı günceller; değişiklik olduysa True döndürür"""
+        try:
+            symbols = self._constituents()
+            close = self.store.get_panel('Close', symbols)
+            if close.empty:
+                return False
+
+            signature = self._signature(symbols)
+            stored_end = self.state.get('last_date')
+            full = force or self.state.get('signature') != signature or stored_end is None
+
+            if not full:
+                if stored_end == close.index[-1] and overlap == 0:
+                    return False
+                # Son kayıtlı tarihten 'overlap' bar öncesinden yeniden hesaplanır
+                start = max(int(close.index.searchsorted(stored_end, side='right')) - overlap, 1)
+                context = max(start - BREADTH_MA_PERIOD, 0)
+                new = self._compute(close.iloc[context:], start - context)
+                start_date = close.index[start]
+
+                previous = {key: frame[frame.index < start_date] for key, frame in self.state['series'].items()}
+                levels = {}
+                for kind in ('equal_weight', 'cap_weight'):
+                    old_levels = self.state['levels'][kind]
+                    old_levels = old_levels[old_levels.index < start_date]
+                    start_level = old_levels.iloc[-1] if not old_levels.empty else \
+                        pd.Series(self.base, index=new[f'{kind}_returns'].columns)
+                    levels[kind] = pd.concat([old_levels, self._chain(new[f'{kind}_returns'], start_level)])
+                series = {key: pd.concat([previous[key], frame]) for key, frame in new.items()}
+            else:
+                series = self._compute(close, 0)
+                levels = {}
+                for kind in ('equal_weight', 'cap_weight'):
+                    start_level = pd.Series(self.base, index=series[f'{kind}_returns'].columns)
+                    levels[kind] = self._chain(series[f'{kind}_returns'], start_level)
+
+            # Hisse adedi bilinen üyesi olmayan sektörler düz 100 yerine boş kalır
+            has_cap = series['cap_weight_returns'].notna().cummax()
+            levels['cap_weight'] = levels['cap_weight'].where(has_cap)
+
+            self.state = {
+                'signature': signature,
+                'last_date': close.index[-1],
+                'series': series,
+                'levels': levels,
+            }
+            temp_path = self.path + ".tmp"
+            pd.to_pickle(self.state, temp_path)
+            os.replace(temp_path, self.path)
+            return True
+
+        except Exception as e:
+            st.error(f"Sektör endeksi güncelleme hatası: {str(e)}")
+            return False
+
+    # --- Okuma ---
+
+    def index_levels(self, weighting: str = 'equal_weight') -> pd.DataFrame:
+        """Tarih × sektör endeks seviyeleri ('equal_weight' ya da 'cap_weight')"""
+        return self.state.get('levels', {}).get(weighting, pd.DataFrame())
+
+    def sector_returns(self, weighting: str = 'equal_weight') -> pd.DataFrame:
+        """Tarih × sektör günlük getirileri"""
+        return self.state.get('series', {}).get(f'{weighting}_returns', pd.DataFrame())
+
+    def breadth(self, measure: str = 'advancing') -> pd.DataFrame:
+        """Tarih × sektör genişlik yüzdesi ('advancing' ya da 'above_ma')"""
+        return self.state.get('series', {}).get(measure, pd.DataFrame())
+
+    def sector_summary(self, weighting: str = 'equal_weight') -> pd.DataFrame:
+        """Sektör bazında dönem getirileri ve güncel genişlik tablosu"""
+        levels = self.index_levels(weighting)
+        if levels.empty:
+            return pd.DataFrame()
+
+        summary = pd.DataFrame(index=levels.columns)
+        summary['Hisse Sayısı'] = self.breadth('constituents').iloc[-1]
+        for label, bars in SECTOR_HORIZONS.items():
+            if len(levels) > bars:
+                summary[f"Getiri {label}"] = (levels.iloc[-1] / levels.iloc[-1 - bars] - 1) * 100
+        summary['Yükselen %'] = self.breadth('advancing').iloc[-1]
+        summary['MA50 Üzeri %'] = self.breadth('above_ma').iloc[-1]
+        return summary
+
+
+@st.cache_data(show_spinner=False)
+def get_sector_indices(last_date: str, fundamentals_updated: str) -> Dict[str, pd.DataFrame]:
+    """Mağazadaki panel için sektör endeksi özetleri ve seviyeleri (iki ağırlıklandırma)
+
+    Argümanlar yalnızca önbellek anahtarıdır (MarketDataStore.last_date ve
+    FundamentalsTable.last_updated); hisse adetleri değişince yeniden hesaplanır.
+    """
+    engine = SectorIndexEngine(get_market_store())
+    engine.update()
+    result = {}
+    for weighting in ('equal_weight', 'cap_weight'):
+        result[f'summary_{weighting}'] = engine.sector_summary(weighting)
+        result[f'levels_{weighting}'] = engine.index_levels(weighting)
+    return result
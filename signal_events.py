@@ -0,0 +1,151 @@
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional, Union
+import streamlit as st
+
+from indicator_sweep import IndicatorSweep
+
+# Olay kodu -> (açıklama, sinyal yönü); yönler get_trading_signals ile uyumludur
+EVENT_TYPES = {
+    'MA_Cross_Up': ("MA20, MA50'yi yukarı kesti", "Al"),
+    'MA_Cross_Down': ("MA20, MA50'yi aşağı kesti", "Sat"),
+    'MACD_Cross_Up': ("MACD sinyal çizgisini yukarı kesti", "Al"),
+    'MACD_Cross_Down': ("MACD sinyal çizgisini aşağı kesti", "Sat"),
+    'RSI_Oversold': ("RSI aşırı satım bölgesine girdi", "Al"),
+    'RSI_Overbought': ("RSI aşırı alım bölgesine girdi", "Sat"),
+    'BB_Lower_Break': ("Fiyat alt Bollinger bandını kırdı", "Al"),
+    'BB_Upper_Break': ("Fiyat üst Bollinger bandını kırdı", "Sat"),
+}
+
+
+def crossings(a: np.ndarray, b: Union[np.ndarray, float]) -> Dict[str, np.ndarray]:
+    """a'nın b'yi yukarı/aşağı kestiği konumları (tarih × sembol) işaretler"""
+    b = np.broadcast_to(b, a.shape)
+    valid = ~np.isnan(a) & ~np.isnan(b)
+    above = (a > b) & valid
+    below = (a < b) & valid
+
+    both_valid = valid[1:] & valid[:-1]
+    up = np.zeros(a.shape, dtype=bool)
+    down = np.zeros(a.shape, dtype=bool)
+    up[1:] = above[1:] & ~above[:-1] & both_valid
+    down[1:] = below[1:] & ~below[:-1] & both_valid
+
+    return {'up': up, 'down': down}
+
+
+def panel_macd(close: pd.DataFrame, fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, np.ndarray]:
+    """Panel için MACD ve sinyal çizgisini hesaplar (TechnicalAnalysis.calculate_macd ile aynı tanım)
+
+    İlk 'slow' geçerli gözlemden önceki MACD değerleri oturmamış olduğu için NaN bırakılır.
+    """
+    macd_line = close.ewm(span=fast).mean() - close.ewm(span=slow).mean()
+    signal_line = macd_line.ewm(span=signal).mean()
+    settled = close.notna().cumsum().to_numpy() >= slow
+
+    return {
+        'MACD': np.where(settled, macd_line.to_numpy(), np.nan),
+        'Signal': signal_line.to_numpy()
+    }
+
+
+class SignalEventDetector:
+    """Tüm geçmiş ve evren paneli üzerinde sinyal olaylarını vektörel çıkaran sınıf"""
+
+    def __init__(self, close: Union[pd.Series, pd.DataFrame], ma_pair: tuple = (20, 50),
+                 macd: tuple = (12, 26, 9), rsi_period: int = 14, rsi_levels: tuple = (30, 70),
+                 bb_period: int = 20, bb_std: float = 2):
+        if isinstance(close, pd.Series):
+            close = close.to_frame(name=close.name or "Close")
+
+        self.close = close
+        self.ma_pair = ma_pair
+        self.macd = macd
+        self.rsi_period = rsi_period
+        self.rsi_levels = rsi_levels
+        self.bb_period = bb_period
+        self.bb_std = bb_std
+
+    def _event_masks(self) -> Dict[str, np.ndarray]:
+        """Her olay tipi için tarih × sembol boolean maskeleri üretir"""
+        close_values = self.close.to_numpy(dtype=np.float64)
+        sweep = IndicatorSweep(self.close)
+        masks = {}
+
+        # Hareketli ortalama kesişimleri
+        short_period, long_period = self.ma_pair
+        ma = sweep.moving_averages([short_period, long_period])
+        ma_cross = crossings(ma.to_frame(short_period).to_numpy(), ma.to_frame(long_period).to_numpy())
+        masks['MA_Cross_Up'], masks['MA_Cross_Down'] = ma_cross['up'], ma_cross['down']
+
+        # MACD kesişimleri
+        macd = panel_macd(self.close, *self.macd)
+        macd_cross = crossings(macd['MACD'], macd['Signal'])
+        masks['MACD_Cross_Up'], masks['MACD_Cross_Down'] = macd_cross['up'], macd_cross['down']
+
+        # RSI eşik geçişleri
+        oversold, overbought = self.rsi_levels
+        rsi = sweep.rsi([self.rsi_period]).to_frame(self.rsi_period).to_numpy()
+        masks['RSI_Oversold'] = crossings(rsi, oversold)['down']
+        masks['RSI_Overbought'] = crossings(rsi, overbought)['up']
+
+        # Bollinger bant kırılımları
+        bands = sweep.bollinger_bands([self.bb_period], std_dev=self.bb_std)
+        masks['BB_Lower_Break'] = crossings(close_values, bands['BB_Lower'].to_frame(self.bb_period).to_numpy())['down']
+        masks['BB_Upper_Break'] = crossings(close_values, bands['BB_Upper'].to_frame(self.bb_period).to_numpy())['up']
+
+        return masks
+
+    def detect(self, event_types: Optional[List[str]] = None,
+               start: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        """Olay tablosunu (Date, Symbol, Event, Signal, Close) döndürür"""
+        columns = ['Date', 'Symbol', 'Event', 'Signal', 'Close']
+        try:
+            masks = self._event_masks()
+            close_values = self.close.to_numpy(dtype=np.float64)
+            symbols = np.asarray(self.close.columns, dtype=object)
+            frames = []
+
+            for event, mask in masks.items():
+                if event_types is not None and event not in event_types:
+                    continue
+
+                rows, cols = np.nonzero(mask)
+                if len(rows) == 0:
+                    continue
+
+                frames.append(pd.DataFrame({
+                    'Date': self.close.index[rows],
+                    'Symbol': symbols[cols],
+                    'Event': event,
+                    'Signal': EVENT_TYPES[event][1],
+                    'Close': close_values[rows, cols]
+                }))
+
+            if not frames:
+                return pd.DataFrame(columns=columns)
+
+            events = pd.concat(frames, ignore_index=True)
+            if start is not None:
+                events = events[events['Date'] >= start]
+
+            events['Event'] = events['Event'].astype('category')
+            events['Symbol'] = events['Symbol'].astype('category')
+            return events.sort_values(['Date', 'Symbol'], ignore_index=True)
+
+        except Exception as e:
+            st.error(f"Sinyal olayı tespit hatası: {str(e)}")
+            return pd.DataFrame(columns=columns)
+
+    @staticmethod
+    def event_counts(events: pd.DataFrame) -> pd.DataFrame:
+        """Olay tablosundan sembol × olay tipi sıklık tablosu üretir"""
+        if events.empty:
+            return pd.DataFrame()
+
+        return pd.crosstab(events['Symbol'].astype(str), events['Event'].astype(str))
+
+
+def describe_event(event: str) -> str:
+    """Olay kodunun Türkçe açıklamasını döndürür"""
+    return EVENT_TYPES.get(event, (event, ""))[0]
@@ -0,0 +1,156 @@
+import os
+import pandas as pd
+import numpy as np
+import yfinance as yf
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import streamlit as st
+
+from data_fetcher import DataFetcher
+from market_store import CACHE_DIR, refresh_stale, save_pickle
+
+# Tablo tipi -> yfinance Ticker özniteliği (yıllık)
+STATEMENT_TYPES = {'income': 'financials', 'balance': 'balance_sheet', 'cashflow': 'cashflow'}
+
+# Kanonik kalem -> yfinance etiketleri (öncelik sırasıyla; eski ve yeni etiketler)
+LINE_ITEM_ALIASES = {
+    'Revenue': ['Total Revenue', 'Operating Revenue'],
+    'Gross_Profit': ['Gross Profit'],
+    'Operating_Income': ['Operating Income', 'EBIT'],
+    'EBITDA': ['EBITDA', 'Normalized EBITDA'],
+    'Net_Income': ['Net Income', 'Net Income Common Stockholders'],
+    'Total_Assets': ['Total Assets'],
+    'Total_Liabilities': ['Total Liabilities Net Minority Interest', 'Total Liab'],
+    'Equity': ['Stockholders Equity', 'Total Stockholder Equity', 'Common Stock Equity'],
+    'Current_Assets': ['Current Assets', 'Total Current Assets'],
+    'Current_Liabilities': ['Current Liabilities', 'Total Current Liabilities'],
+    'Total_Debt': ['Total Debt'],
+    'Cash': ['Cash And Cash Equivalents', 'Cash'],
+    'Operating_Cashflow': ['Operating Cash Flow', 'Total Cash From Operating Activities'],
+    'Capex': ['Capital Expenditure', 'Capital Expenditures'],
+    'Free_Cashflow': ['Free Cash Flow'],
+}
+
+LONG_COLUMNS = ['Symbol', 'Statement', 'Period', 'Item', 'Value']
+
+
+def normalize_statement(symbol: str, statement: str, frame: pd.DataFrame) -> pd.DataFrame:
+    """yfinance tablosunu (kalem × dönem) uzun biçime çevirir: Symbol, Statement, Period, Item, Value"""
+    if frame is None or frame.empty:
+        return pd.DataFrame(columns=LONG_COLUMNS)
+
+    long = frame.rename_axis(index='Item', columns='Period').stack().rename('Value').reset_index()
+    long['Value'] = pd.to_numeric(long['Value'], errors='coerce')
+    long['Period'] = pd.to_datetime(long['Period'])
+    long['Symbol'] = symbol
+    long['Statement'] = statement
+    return long.dropna(subset=['Value'])[LONG_COLUMNS]
+
+
+def fetch_statements(symbol: str) -> pd.DataFrame:
+    """Bir sembolün yıllık gelir, bilanço ve nakit akış tablolarını uzun biçimde çeker"""
+    ticker = yf.Ticker(symbol)
+    frames = [normalize_statement(symbol, statement, getattr(ticker, attribute))
+              for statement, attribute in STATEMENT_TYPES.items()]
+    return pd.concat(frames, ignore_index=True)
+
+
+class StatementStore:
+    """Mali tabloları (sembol, dönem, kalem, değer) uzun biçimde yerel olarak saklayan sınıf
+
+    Oranlar tüm semboller ve yıllar için tek pivot üzerinden hesaplanır;
+    trend ve akran analizleri tabloları yeniden indirmez.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, data_fetcher: Optional[DataFetcher] = None):
+        self.data_fetcher = data_fetcher or DataFetcher()
+        self.path = os.path.join(cache_dir or CACHE_DIR, "statements.pkl")
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        state = pd.read_pickle(self.path) if os.path.exists(self.path) else {}
+        self.statements = state.get('statements', pd.DataFrame(columns=LONG_COLUMNS))
+        self.fetched = state.get('fetched', {})
+
+    def refresh(self, symbols: Optional[List[str]] = None, max_workers: int = 8,
+                max_age_days: float = 7, force: bool = False) -> List[str]:
+        """Süresi dolan sembollerin tablolarını eşzamanlı çeker; güncellenenleri döndürür"""
+        return refresh_stale("Mali tablo deposu", fetch_statements, self._merge, self.fetched,
+                             self.data_fetcher, symbols, timedelta(days=max_age_days), force, max_workers)
+
+    def _merge(self, fetched: Dict[str, pd.DataFrame]):
+        """Yeni tablolar aynı sembolün eski satırlarının yerine geçer"""
+        kept = self.statements[~self.statements['Symbol'].isin(list(fetched))]
+        statements = pd.concat([kept.astype({'Symbol': object, 'Statement': object, 'Item': object})]
+                               + list(fetched.values()), ignore_index=True)
+        for column in ('Symbol', 'Statement', 'Item'):
+            statements[column] = statements[column].astype('category')
+        statements['Period'] = pd.to_datetime(statements['Period'])
+        statements['Value'] = statements['Value'].astype(np.float64)
+        self.statements = statements
+
+        now = datetime.now()
+        self.fetched.update({symbol: now for symbol in fetched})
+        save_pickle({'statements': self.statements, 'fetched': self.fetched}, self.path)
+
+    def line_items(self, symbols: Optional[List[str]] = None) -> pd.DataFrame:
+        """Kanonik kalemlerin (sembol, dönem) × kalem geniş tablosu"""
+        statements = self.statements
+        if symbols is not None:
+            statements = statements[statements['Symbol'].isin(symbols)]
+        if statements.empty:
+            return pd.DataFrame(columns=list(LINE_ITEM_ALIASES))
+
+        # Etiket -> (kanonik kalem, öncelik); her (sembol, dönem, kalem) için en öncelikli etiket seçilir
+        alias_table = pd.DataFrame(
+            [(label, canonical, priority) for canonical, labels in LINE_ITEM_ALIASES.items()
+             for priority, label in enumerate(labels)],
+            columns=['Item', 'Canonical', 'Priority'])
+
+        matched = statements.astype({'Symbol': object, 'Item': object}).merge(alias_table, on='Item', how='inner')
+        matched = matched.sort_values('Priority').drop_duplicates(['Symbol', 'Period', 'Canonical'])
+        wide = matched.pivot_table(index=['Symbol', 'Period'], columns='Canonical', values='Value',
+                                   aggfunc='first', observed=True)
+        return wide.reindex(columns=list(LINE_ITEM_ALIASES)).sort_index()
+
+    def ratios(self, symbols: Optional[List[str]] = None) -> pd.DataFrame:
+        """Tüm semboller ve yıllar için mali oranlar ((sembol, dönem) indeksli, yüzdeler % cinsinden)"""
+        items = self.line_items(symbols)
+        if items.empty:
+            return pd.DataFrame()
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            free_cashflow = items['Free_Cashflow'].fillna(items['Operating_Cashflow'] + items['Capex'])
+            ratios = pd.DataFrame({
+                'Brüt Kar Marjı': items['Gross_Profit'] / items['Revenue'] * 100,
+                'Faaliyet Kar Marjı': items['Operating_Income'] / items['Revenue'] * 100,
+                'EBITDA Marjı': items['EBITDA'] / items['Revenue'] * 100,
+                'Net Kar Marjı': items['Net_Income'] / items['Revenue'] * 100,
+                'ROA': items['Net_Income'] / items['Total_Assets'] * 100,
+                'ROE': items['Net_Income'] / items['Equity'] * 100,
+                'Borç/Özkaynak': items['Total_Debt'] / items['Equity'],
+                'Yükümlülük/Varlık': items['Total_Liabilities'] / items['Total_Assets'] * 100,
+                'Cari Oran': items['Current_Assets'] / items['Current_Liabilities'],
+                'Nakit/Borç': items['Cash'] / items['Total_Debt'],
+                'SNA Marjı': free_cashflow / items['Revenue'] * 100,
+            }, index=items.index)
+
+            # Yıllık büyümeler: dönemler sembol içinde sıralı
+            # Negatif baz yıllarda işaretin korunması için mutlak değere bölünür
+            previous = items[['Revenue', 'Net_Income']].groupby(level='Symbol').shift(1)
+            growth = (items[['Revenue', 'Net_Income']] - previous) / previous.abs() * 100
+            ratios['Gelir Büyümesi'] = growth['Revenue']
+            ratios['Net Kar Büyümesi'] = growth['Net_Income']
+
+        return ratios.replace([np.inf, -np.inf], np.nan)
+
+    def latest_ratios(self, symbols: Optional[List[str]] = None) -> pd.DataFrame:
+        """Her sembolün en son dönem oranları (akran karşılaştırması için)"""
+        ratios = self.ratios(symbols)
+        if ratios.empty:
+            return ratios
+        return ratios.groupby(level='Symbol').tail(1).droplevel('Period')
+
+    def ratio_trend(self, symbol: str) -> pd.DataFrame:
+        """Tek sembol için dönem × oran tablosu"""
+        ratios = self.ratios([symbol])
+        return ratios.xs(symbol, level='Symbol') if not ratios.empty else ratios
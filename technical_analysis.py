@@ -1,14 +1,17 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, Optional
+from typing import Dict, Optional, Union
 import streamlit as st
 
+from signal_events import SignalEventDetector
+
 class TechnicalAnalysis:
     """Teknik analiz hesaplamaları için sınıf"""
     
     def __init__(self, data: pd.DataFrame):
         self.data = data.copy()
         self.indicators = {}
+        self.latest_values = None
     
     def calculate_moving_averages(self, periods: list = [5, 10, 20, 50, 100, 200]) -> Dict:
         """Hareketli ortalama hesaplar"""
@@ -106,7 +109,7 @@ class TechnicalAnalysis:
         typical_price = (self.data['High'] + self.data['Low'] + self.data['Close']) / 3
         sma_tp = typical_price.rolling(window=period).mean()
         mean_deviation = typical_price.rolling(window=period).apply(
-            lambda x: np.mean(np.abs(x - np.mean(x)))
+            lambda x: np.mean(np.abs(x - np.mean(x))), raw=True
         )
         
         cci = (typical_price - sma_tp) / (0.015 * mean_deviation)
@@ -118,15 +121,167 @@ class TechnicalAnalysis:
         if len(self.data) < period:
             return None
         
-        high_low = self.data['High'] - self.data['Low']
-        high_close_prev = np.abs(self.data['High'] - self.data['Close'].shift(1))
-        low_close_prev = np.abs(self.data['Low'] - self.data['Close'].shift(1))
-        
-        true_range = pd.concat([high_low, high_close_prev, low_close_prev], axis=1).max(axis=1)
+        true_range = self._true_range()
         atr = true_range.rolling(window=period).mean()
         
         return atr
     
+    def _true_range(self) -> pd.Series:
+        """True Range serisini hesaplar"""
+        high = self.data['High'].to_numpy(dtype=float)
+        low = self.data['Low'].to_numpy(dtype=float)
+        prev_close = self.data['Close'].shift(1).to_numpy(dtype=float)
+        
+        # İlk barda önceki kapanış yok; NaN'lar yok sayılarak en büyüğü alınır
+        true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+        return pd.Series(true_range, index=self.data.index)
+    
+    @staticmethod
+    def _wilder_smooth(series: pd.Series, period: int) -> pd.Series:
+        """Wilder yumuşatması (alpha = 1/periyot üstel ortalama)"""
+        return series.ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+    
+    def calculate_adx(self, period: int = 14) -> Dict:
+        """Wilder ADX ve yön göstergelerini (+DI / -DI) hesaplar"""
+        if len(self.data) < period * 2:
+            return {}
+        
+        up_move = self.data['High'].diff()
+        down_move = -self.data['Low'].diff()
+        
+        plus_dm = up_move.where((up_move > down_move) & (up_move > 0), 0.0)
+        minus_dm = down_move.where((down_move > up_move) & (down_move > 0), 0.0)
+        
+        atr = self._wilder_smooth(self._true_range(), period)
+        plus_di = 100 * self._wilder_smooth(plus_dm, period) / atr
+        minus_di = 100 * self._wilder_smooth(minus_dm, period) / atr
+        
+        di_sum = (plus_di + minus_di).replace(0, np.nan)
+        dx = 100 * (plus_di - minus_di).abs() / di_sum
+        adx = self._wilder_smooth(dx, period)
+        
+        return {
+            'ADX': adx,
+            'Plus_DI': plus_di,
+            'Minus_DI': minus_di
+        }
+    
+    def calculate_parabolic_sar(self, step: float = 0.02, max_step: float = 0.2) -> Optional[pd.Series]:
+        """Parabolic SAR hesaplar"""
+        if len(self.data) < 2:
+            return None
+        
+        # Özyineleme düz Python listeleri üzerinde döner; satır başına pandas erişimi yok
+        high = self.data['High'].to_numpy(dtype=float).tolist()
+        low = self.data['Low'].to_numpy(dtype=float).tolist()
+        n = len(high)
+        sar = [np.nan] * n
+        
+        is_long = high[1] >= high[0]
+        acceleration = step
+        extreme_point = high[0] if is_long else low[0]
+        current_sar = low[0] if is_long else high[0]
+        sar[0] = current_sar
+        
+        for i in range(1, n):
+            current_sar = current_sar + acceleration * (extreme_point - current_sar)
+            
+            if is_long:
+                # SAR önceki iki barın en düşüğünü geçemez
+                current_sar = min(current_sar, low[i - 1], low[i - 2] if i > 1 else low[i - 1])
+                if low[i] < current_sar:
+                    is_long = False
+                    current_sar = extreme_point
+                    extreme_point = low[i]
+                    acceleration = step
+                elif high[i] > extreme_point:
+                    extreme_point = high[i]
+                    acceleration = min(acceleration + step, max_step)
+            else:
+                current_sar = max(current_sar, high[i - 1], high[i - 2] if i > 1 else high[i - 1])
+                if high[i] > current_sar:
+                    is_long = True
+                    current_sar = extreme_point
+                    extreme_point = high[i]
+                    acceleration = step
+                elif low[i] < extreme_point:
+                    extreme_point = low[i]
+                    acceleration = min(acceleration + step, max_step)
+            
+            sar[i] = current_sar
+        
+        return pd.Series(sar, index=self.data.index)
+    
+    def calculate_supertrend(self, period: int = 10, multiplier: float = 3) -> Dict:
+        """SuperTrend ve trend yönünü hesaplar"""
+        if len(self.data) < period + 1:
+            return {}
+        
+        atr = self._wilder_smooth(self._true_range(), period)
+        hl2 = (self.data['High'] + self.data['Low']) / 2
+        
+        # Temel bantlar vektörel, nihai bantların özyinelemesi dizi döngüsünde
+        basic_upper = (hl2 + multiplier * atr).to_numpy(dtype=float).tolist()
+        basic_lower = (hl2 - multiplier * atr).to_numpy(dtype=float).tolist()
+        close = self.data['Close'].to_numpy(dtype=float).tolist()
+        n = len(close)
+        
+        supertrend = [np.nan] * n
+        direction = [np.nan] * n
+        final_upper = final_lower = np.nan
+        trend = 1
+        
+        for i in range(n):
+            upper, lower = basic_upper[i], basic_lower[i]
+            if upper != upper:  # NaN: ATR henüz oluşmadı
+                continue
+            
+            if final_upper != final_upper:
+                final_upper, final_lower = upper, lower
+            else:
+                prev_close = close[i - 1]
+                final_upper = upper if (upper < final_upper or prev_close > final_upper) else final_upper
+                final_lower = lower if (lower > final_lower or prev_close < final_lower) else final_lower
+            
+            if close[i] > final_upper:
+                trend = 1
+            elif close[i] < final_lower:
+                trend = -1
+            
+            supertrend[i] = final_lower if trend == 1 else final_upper
+            direction[i] = trend
+        
+        return {
+            'SuperTrend': pd.Series(supertrend, index=self.data.index),
+            'SuperTrend_Dir': pd.Series(direction, index=self.data.index)
+        }
+    
+    def calculate_ichimoku(self, tenkan: int = 9, kijun: int = 26, senkou: int = 52) -> Dict:
+        """Ichimoku bulutu bileşenlerini hesaplar
+
+        Chikou (gecikme) çizgisi kapanışın 'kijun' bar geriye kaydırılmış
+        halidir ve gelecekteki kapanışları içerir; bu yüzden indikatör
+        tablosuna ve son değerlere eklenmez, yalnızca çizim sırasında
+        Close.shift(-kijun) ile üretilmelidir.
+        """
+        if len(self.data) < kijun:
+            return {}
+        
+        high = self.data['High']
+        low = self.data['Low']
+        
+        tenkan_sen = (high.rolling(window=tenkan).max() + low.rolling(window=tenkan).min()) / 2
+        kijun_sen = (high.rolling(window=kijun).max() + low.rolling(window=kijun).min()) / 2
+        senkou_a = ((tenkan_sen + kijun_sen) / 2).shift(kijun)
+        senkou_b = ((high.rolling(window=senkou).max() + low.rolling(window=senkou).min()) / 2).shift(kijun)
+        
+        return {
+            'Ichimoku_Tenkan': tenkan_sen,
+            'Ichimoku_Kijun': kijun_sen,
+            'Ichimoku_Senkou_A': senkou_a,
+            'Ichimoku_Senkou_B': senkou_b
+        }
+    
     def calculate_volume_indicators(self) -> Dict:
         """Hacim bazlı indikatörler hesaplar"""
         volume_indicators = {}
@@ -137,23 +292,9 @@ class TechnicalAnalysis:
         
         # On Balance Volume (OBV)
         if len(self.data) > 1:
-            price_change = self.data['Close'].diff()
-            obv = []
-            obv_value = 0
-            
-            for i, change in enumerate(price_change):
-                if pd.isna(change):
-                    obv.append(obv_value)
-                elif change > 0:
-                    obv_value += self.data['Volume'].iloc[i]
-                    obv.append(obv_value)
-                elif change < 0:
-                    obv_value -= self.data['Volume'].iloc[i]
-                    obv.append(obv_value)
-                else:
-                    obv.append(obv_value)
-            
-            volume_indicators['OBV'] = pd.Series(obv, index=self.data.index)
+            # Fiyat değişiminin işareti ile hacmin kümülatif toplamı
+            direction = np.sign(self.data['Close'].diff()).fillna(0)
+            volume_indicators['OBV'] = (direction * self.data['Volume']).cumsum()
         
         return volume_indicators
     
@@ -176,8 +317,13 @@ class TechnicalAnalysis:
         
         return momentum_indicators
     
-    def calculate_all_indicators(self) -> Dict:
-        """Tüm teknik indikatörleri hesaplar"""
+    def calculate_all_indicators(self, as_frame: bool = False,
+                                 float32: bool = False) -> Union[Dict, pd.DataFrame]:
+        """Tüm teknik indikatörleri hesaplar
+
+        as_frame=True ile sonuçlar fiyat indeksini paylaşan tek bir sütunlu
+        DataFrame olarak döner; float32=True bellek kullanımını yarıya indirir.
+        """
         try:
             all_indicators = {}
             
@@ -217,6 +363,16 @@ class TechnicalAnalysis:
             if atr is not None:
                 all_indicators['ATR'] = atr
             
+            # Trend gücü ve dönüş indikatörleri
+            all_indicators.update(self.calculate_adx())
+            
+            psar = self.calculate_parabolic_sar()
+            if psar is not None:
+                all_indicators['PSAR'] = psar
+            
+            all_indicators.update(self.calculate_supertrend())
+            all_indicators.update(self.calculate_ichimoku())
+            
             # Hacim indikatörleri
             volume_indicators = self.calculate_volume_indicators()
             all_indicators.update(volume_indicators)
@@ -225,11 +381,50 @@ class TechnicalAnalysis:
             momentum_indicators = self.calculate_momentum_indicators()
             all_indicators.update(momentum_indicators)
             
+            self.indicators = all_indicators
+            
+            if as_frame:
+                frame = self._to_indicator_frame(all_indicators, float32)
+                self.latest_values = self._extract_latest_values(frame)
+                return frame
+            
+            self.latest_values = {
+                key: float(series.iloc[-1]) for key, series in all_indicators.items()
+                if len(series) > 0
+            }
             return all_indicators
             
         except Exception as e:
             st.error(f"Teknik analiz hesaplama hatası: {str(e)}")
+            return pd.DataFrame(index=self.data.index) if as_frame else {}
+    
+    def _to_indicator_frame(self, indicators: Dict, float32: bool = False) -> pd.DataFrame:
+        """İndikatör sözlüğünü tek bloklu, fiyat indeksli DataFrame'e çevirir"""
+        dtype = np.float32 if float32 else np.float64
+        columns = list(indicators.keys())
+        
+        # Tüm seriler aynı indeksi paylaştığı için tek bir 2B dizide toplanır
+        values = np.empty((len(self.data), len(columns)), dtype=dtype)
+        for i, column in enumerate(columns):
+            values[:, i] = indicators[column].to_numpy(dtype=dtype, na_value=np.nan)
+        
+        return pd.DataFrame(values, index=self.data.index, columns=columns, copy=False)
+    
+    @staticmethod
+    def _extract_latest_values(frame: pd.DataFrame) -> Dict:
+        """Son satırdaki indikatör değerlerini sözlük olarak çıkarır"""
+        if frame.empty:
             return {}
+        
+        latest_row = frame.to_numpy()[-1]
+        return {column: float(value) for column, value in zip(frame.columns, latest_row)}
+    
+    def get_latest_values(self) -> Dict:
+        """Son bar için indikatör değerlerini döndürür (gerekirse bir kez hesaplar)"""
+        if self.latest_values is None:
+            self.calculate_all_indicators()
+        
+        return self.latest_values or {}
     
     def get_trading_signals(self) -> Dict:
         """Al/Sat sinyalleri üretir"""
@@ -241,20 +436,20 @@ class TechnicalAnalysis:
         }
         
         try:
-            indicators = self.calculate_all_indicators()
+            latest = self.get_latest_values()
             
             # RSI sinyalleri
-            if 'RSI' in indicators:
-                latest_rsi = indicators['RSI'].iloc[-1]
+            if 'RSI' in latest:
+                latest_rsi = latest['RSI']
                 if latest_rsi < 30:
                     signals["RSI_Signal"] = "Al"
                 elif latest_rsi > 70:
                     signals["RSI_Signal"] = "Sat"
             
             # MACD sinyalleri
-            if 'MACD' in indicators and 'Signal' in indicators:
-                latest_macd = indicators['MACD'].iloc[-1]
-                latest_signal = indicators['Signal'].iloc[-1]
+            if 'MACD' in latest and 'Signal' in latest:
+                latest_macd = latest['MACD']
+                latest_signal = latest['Signal']
                 
                 if latest_macd > latest_signal:
                     signals["MACD_Signal"] = "Al"
@@ -262,9 +457,9 @@ class TechnicalAnalysis:
                     signals["MACD_Signal"] = "Sat"
             
             # MA sinyalleri
-            if 'MA20' in indicators and 'MA50' in indicators:
-                ma20 = indicators['MA20'].iloc[-1]
-                ma50 = indicators['MA50'].iloc[-1]
+            if 'MA20' in latest and 'MA50' in latest:
+                ma20 = latest['MA20']
+                ma50 = latest['MA50']
                 
                 if ma20 > ma50:
                     signals["MA_Signal"] = "Al"
@@ -284,3 +479,9 @@ class TechnicalAnalysis:
             st.error(f"Sinyal hesaplama hatası: {str(e)}")
         
         return signals
+    
+    def get_signal_events(self, start: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        """Tüm geçmişteki kesişim ve eşik olaylarını tablo olarak döndürür"""
+        detector = SignalEventDetector(self.data['Close'])
+        events = detector.detect(start=start)
+        return events.drop(columns=['Symbol'])
@@ -1,6 +1,7 @@
 import locale
 from datetime import datetime, timedelta
 import pandas as pd
+import numpy as np
 from typing import Union, Optional
 import streamlit as st
 
@@ -141,6 +142,79 @@ def calculate_performance_metrics(data: pd.DataFrame) -> dict:
         st.error(f"Performans metrik hesaplama hatası: {str(e)}")
         return {}
 
+def calculate_panel_performance_metrics(close: pd.DataFrame) -> pd.DataFrame:
+    """Tarih × sembol kapanış paneli için performans metriklerini tek seferde hesaplar
+
+    calculate_performance_metrics ile aynı tanımlar kullanılır; her sembol kendi
+    ilk ve son geçerli kapanışı arasında değerlendirilir. Sonuç sembol indeksli,
+    aynı Türkçe metrik adlarını taşıyan bir tablodur.
+    """
+    columns = ["Toplam Getiri", "Yıllık Getiri", "Yıllık Volatilite", "Sharpe Oranı",
+               "Maksimum Düşüş", "Kazanma Oranı", "En İyi Gün", "En Kötü Gün"]
+    if close.empty or len(close) < 2:
+        return pd.DataFrame(columns=columns)
+
+    try:
+        prices = close.to_numpy(dtype=np.float64)
+        listed = ~np.isnan(prices)
+        rows = np.arange(len(prices))[:, None]
+
+        # İşlem görmeyen günlerde son kapanış taşınır (pct_change ile aynı davranış)
+        last_valid = np.maximum.accumulate(np.where(listed, rows, -1), axis=0)
+        filled = np.take_along_axis(prices, np.maximum(last_valid, 0), axis=0)
+        filled[last_valid < 0] = np.nan
+
+        # Günlük getiriler; yalnızca o gün kapanışı olan satırlar sayılır
+        with np.errstate(divide='ignore', invalid='ignore'):
+            daily_returns = np.full_like(prices, np.nan)
+            daily_returns[1:] = prices[1:] / filled[:-1] - 1
+        has_return = ~np.isnan(daily_returns)
+        count = has_return.sum(axis=0)
+        safe_returns = np.where(has_return, daily_returns, 0.0)
+
+        # İlk ve son geçerli gözlemler
+        first_pos = np.argmax(listed, axis=0)
+        last_pos = len(prices) - 1 - np.argmax(listed[::-1], axis=0)
+        symbols = np.arange(prices.shape[1])
+        first_price = prices[first_pos, symbols]
+        last_price = prices[last_pos, symbols]
+        days = (close.index[last_pos] - close.index[first_pos]).days.to_numpy()
+
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            total_return = last_price / first_price - 1
+            annual_return = np.where(days > 0, (1 + total_return) ** (365 / days) - 1, np.nan)
+
+            # Volatilite (yıllık, ddof=1)
+            mean = safe_returns.sum(axis=0) / count
+            squared = np.where(has_return, (daily_returns - mean) ** 2, 0.0).sum(axis=0)
+            annual_volatility = np.sqrt(squared / (count - 1)) * (252 ** 0.5)
+            sharpe_ratio = np.where(annual_volatility > 0, annual_return / annual_volatility, 0.0)
+
+            # Maksimum düşüş: taşınmış fiyatın kümülatif tepesine göre
+            running_max = np.fmax.accumulate(filled, axis=0)
+            max_drawdown = np.fmin.reduce(filled / running_max - 1, axis=0)
+
+            win_rate = np.where(count > 0, (daily_returns > 0).sum(axis=0) / count, 0.0)
+
+        metrics = pd.DataFrame({
+            "Toplam Getiri": total_return * 100,
+            "Yıllık Getiri": annual_return * 100,
+            "Yıllık Volatilite": annual_volatility * 100,
+            "Sharpe Oranı": sharpe_ratio,
+            "Maksimum Düşüş": max_drawdown * 100,
+            "Kazanma Oranı": win_rate * 100,
+            "En İyi Gün": np.fmax.reduce(daily_returns, axis=0) * 100,
+            "En Kötü Gün": np.fmin.reduce(daily_returns, axis=0) * 100
+        }, index=close.columns)
+
+        # En az iki gözlemi olmayan semboller boş bırakılır
+        metrics[listed.sum(axis=0) < 2] = np.nan
+        return metrics
+
+    except Exception as e:
+        st.error(f"Panel performans metrik hesaplama hatası: {str(e)}")
+        return pd.DataFrame(columns=columns)
+
 def get_risk_level(volatility: float, beta: Optional[float] = None) -> str:
     """Risk seviyesi belirler"""
     risk_levels = {
@@ -214,6 +288,65 @@ def get_trend_analysis(data: pd.DataFrame, short_period: int = 10, long_period:
         st.error(f"Trend analizi hatası: {str(e)}")
         return {"trend": "Hata", "strength": 0}
 
+def get_panel_trend_analysis(close: pd.DataFrame, short_period: int = 10, long_period: int = 50) -> pd.DataFrame:
+    """Tarih × sembol kapanış paneli için get_trend_analysis sınıflandırmasını tek seferde yapar
+
+    Her sembolün son long_period geçerli kapanışı sağa hizalı bir matrise
+    toplanır; sınıflar np.select ile get_trend_analysis'teki sırayla atanır.
+    Sonuç sembol indeksli ve get_trend_analysis ile aynı anahtarları taşıyan bir tablodur.
+    """
+    columns = ["trend", "strength", "price_change_20d", "current_vs_short_ma",
+               "current_vs_long_ma", "short_vs_long_ma"]
+    if close.empty:
+        return pd.DataFrame(columns=columns)
+
+    try:
+        prices = close.to_numpy(dtype=np.float64)
+        valid = ~np.isnan(prices)
+        counts = valid.sum(axis=0)
+
+        # Sondan sıra: 0 son geçerli kapanış
+        rank_from_end = counts[None, :] - np.cumsum(valid, axis=0)
+        keep = valid & (rank_from_end < long_period)
+        rows, cols = np.nonzero(keep)
+        window = np.full((close.shape[1], long_period), np.nan)
+        window[cols, long_period - 1 - rank_from_end[rows, cols]] = prices[rows, cols]
+
+        current = window[:, -1]
+        short_ma = window[:, -short_period:].mean(axis=1)
+        long_ma = window.mean(axis=1)
+        enough = counts >= long_period
+
+        conditions = [
+            (current > short_ma) & (short_ma > long_ma),
+            (current > short_ma) & (short_ma > long_ma),
+            short_ma > long_ma,
+            (current < short_ma) & (short_ma < long_ma),
+            (current < short_ma) & (short_ma < long_ma),
+            short_ma < long_ma,
+        ]
+        trend = np.select(conditions, ["Güçlü Yükseliş", "Yükseliş", "Zayıf Yükseliş",
+                                       "Güçlü Düşüş", "Düşüş", "Zayıf Düşüş"], "Yatay")
+        strength = np.select(conditions, [3, 2, 1, -3, -2, -1], 0)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            price_change_20d = (current / window[:, -20] - 1) * 100 if long_period >= 20 else np.zeros(len(current))
+            result = pd.DataFrame({
+                "trend": np.where(enough, trend, "Yetersiz Veri"),
+                "strength": np.where(enough, strength, 0),
+                "price_change_20d": price_change_20d,
+                "current_vs_short_ma": (current / short_ma - 1) * 100,
+                "current_vs_long_ma": (current / long_ma - 1) * 100,
+                "short_vs_long_ma": (short_ma / long_ma - 1) * 100
+            }, index=close.columns)
+
+        result.loc[~enough, columns[2:]] = np.nan
+        return result
+
+    except Exception as e:
+        st.error(f"Panel trend analizi hatası: {str(e)}")
+        return pd.DataFrame(columns=columns)
+
 def get_market_session_info() -> dict:
     """Piyasa seansı bilgilerini döndürür"""
     now = datetime.now()